@@ -0,0 +1,19 @@
+"""
+Utilidades compartidas por los benchmarks.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lenguaje.almacen_lexico import AlmacenLexico
+from lenguaje.analizador import Analizador
+from lenguaje.categorias import ClasificadorCategorias
+from lenguaje.diccionario import Diccionario
+
+
+def analizador_sin_cache():
+    """Léxico vacío y sin caché: se mide el cálculo, no la LRU."""
+    return Analizador(Diccionario(almacen=AlmacenLexico({'palabras': {}})),
+                      ClasificadorCategorias(), tamano_cache=0)
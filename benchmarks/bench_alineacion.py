@@ -0,0 +1,66 @@
+"""
+Benchmark: similitud de Levenshtein por caracteres sobre la oración entera
+frente a Analizador.alinear_tokens (distancia de edición por palabras).
+
+Uso:
+    python benchmarks/bench_alineacion.py [--oraciones N]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _comun import analizador_sin_cache
+
+
+def palabra_aleatoria():
+    return ''.join(random.choices(string.ascii_lowercase, k=random.randint(2, 9)))
+
+
+def respuesta_con_fallos(palabras):
+    """La oración con dos palabras intercambiadas y una errata."""
+    palabras = list(palabras)
+    i, j = random.sample(range(len(palabras)), 2)
+    palabras[i], palabras[j] = palabras[j], palabras[i]
+    k = random.randrange(len(palabras))
+    palabras[k] = palabras[k][:-1] + 'x'
+    return ' '.join(palabras)
+
+
+def medir(funcion, pares, repeticiones=3):
+    """Milisegundos por oración (mejor de varias repeticiones)."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for a, b in pares:
+            funcion(a, b)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor / len(pares) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--oraciones', type=int, default=200)
+    args = parser.parse_args()
+    random.seed(0)
+
+    analizador = analizador_sin_cache()
+    print(f"{'palabras por oración':<22}{'caracteres (ms)':>17}{'palabras (ms)':>15}{'x':>8}")
+    for longitud in (6, 12, 20, 35):
+        pares = []
+        for _ in range(args.oraciones):
+            palabras = [palabra_aleatoria() for _ in range(longitud)]
+            pares.append((respuesta_con_fallos(palabras), ' '.join(palabras)))
+        t_caracteres = medir(analizador.similitud, pares)
+        t_palabras = medir(analizador.alinear_tokens, pares)
+        print(f"{longitud:<22}{t_caracteres:>17.3f}{t_palabras:>15.3f}"
+              f"{t_caracteres / t_palabras:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: memoria y latencia de obtener_vecinos del grafo como dict de sets
+(palabra -> {palabras}) y como adyacencia CSR sobre ids enteros (con tipos
+y pesos; también el muestreo ponderado).
+
+Uso:
+    python benchmarks/bench_grafo_csr.py [ruta_json] [--consultas N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lenguaje.almacen_lexico import AlmacenLexico
+from lenguaje.grafo_palabras import Grafo
+
+
+def bytes_dict_sets(grafo):
+    """Memoria del dict de sets (sin las cadenas, compartidas con el léxico)."""
+    return sys.getsizeof(grafo) + sum(sys.getsizeof(v) for v in grafo.values())
+
+
+def bytes_csr(grafo):
+    """Memoria de la CSR más la tabla de nodos (tupla y dict palabra -> id)."""
+    return grafo.adyacencia.bytes() + sys.getsizeof(grafo.nodos) + sys.getsizeof(grafo.ids)
+
+
+def vecinos_dict_sets(grafo, palabra, max_vecinos=10):
+    """obtener_vecinos original sobre el dict de sets."""
+    if palabra not in grafo:
+        return []
+    vecinos = list(grafo[palabra])
+    random.shuffle(vecinos)
+    return vecinos[:max_vecinos]
+
+
+def medir(funcion, palabras):
+    """Microsegundos por consulta (mejor de 3 repeticiones)."""
+    mejor = float('inf')
+    for _ in range(3):
+        inicio = time.perf_counter()
+        for palabra in palabras:
+            funcion(palabra)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor / len(palabras) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('ruta_json', nargs='?', default=os.path.join('data', 'a_p.json'))
+    parser.add_argument('--consultas', type=int, default=20000)
+    args = parser.parse_args()
+
+    almacen = AlmacenLexico.desde_json(args.ruta_json)
+    almacen.indices
+    grafo = Grafo(almacen=almacen)
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        grafo.construir(usar_guardado=False)
+        t_construir = time.perf_counter() - inicio
+    # La representación anterior, con las mismas aristas
+    dict_sets = {palabra: set(vecinos) for palabra, vecinos in grafo.grafo.items()}
+    print(f"Grafo: {len(grafo.nodos)} nodos, {grafo.adyacencia.num_aristas()} aristas "
+          f"(construido en {t_construir * 1000:.0f} ms)")
+
+    palabras = random.choices(grafo.nodos, k=args.consultas)
+    # Las palabras con más vecinos son las que más cuestan (menos consultas)
+    hubs = sorted(grafo.nodos, key=lambda p: -grafo.adyacencia.grado(grafo.ids[p]))[:50]
+    hubs = random.choices(hubs, k=max(1, args.consultas // 100))
+
+    filas = [
+        ('memoria (MB)', bytes_dict_sets(dict_sets) / 2**20, bytes_csr(grafo) / 2**20, '.1f'),
+        ('obtener_vecinos (µs)',
+         medir(lambda p: vecinos_dict_sets(dict_sets, p), palabras),
+         medir(grafo.obtener_vecinos, palabras), '.2f'),
+        ('obtener_vecinos hubs (µs)',
+         medir(lambda p: vecinos_dict_sets(dict_sets, p), hubs),
+         medir(grafo.obtener_vecinos, hubs), '.2f'),
+        # Ponderado (tablas alias) frente al muestreo sin pesos del dict de sets
+        ('ponderado hubs (µs)',
+         medir(lambda p: vecinos_dict_sets(dict_sets, p), hubs),
+         medir(lambda p: grafo.obtener_vecinos(p, ponderado=True), hubs), '.2f'),
+    ]
+    print(f"{'medida':<28}{'dict de sets':>14}{'CSR':>10}{'x':>8}")
+    for nombre, antes, despues, formato in filas:
+        print(f"{nombre:<28}{antes:>14{formato}}{despues:>10{formato}}{antes / despues:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
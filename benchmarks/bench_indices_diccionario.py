@@ -0,0 +1,74 @@
+"""
+Benchmark: coste por reto de las consultas del Diccionario antes (recorrido
+lineal de todo el léxico) y después (índices invertidos del almacén).
+
+Uso:
+    python benchmarks/bench_indices_diccionario.py [ruta_json] [--retos N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lenguaje.almacen_lexico import AlmacenLexico
+from lenguaje.diccionario import Diccionario
+from retos.tarjetas import RetoTarjetas
+from retos.oraciones import RetoCompletarOracion
+
+
+class DiccionarioEscaneo(Diccionario):
+    """Diccionario con las consultas originales: recorren todo el léxico."""
+
+    def palabras_por_categoria(self, categoria):
+        return [w for w, info in self.iterar_palabras()
+                if categoria in (info.get('categorias') or [])]
+
+    def buscar_por_tema(self, tema):
+        return [w for w, info in self.iterar_palabras()
+                if tema in (info.get('temas') or [])]
+
+
+def medir(diccionario, palabras, num_retos):
+    """Segundos medios por reto de tarjetas y por opciones de completar oración."""
+    inicio = time.perf_counter()
+    for palabra in palabras[:num_retos]:
+        RetoTarjetas(palabra, diccionario).generar()
+    t_tarjetas = (time.perf_counter() - inicio) / num_retos
+
+    inicio = time.perf_counter()
+    for palabra in palabras[:num_retos]:
+        reto = RetoCompletarOracion(palabra, None, diccionario, None)
+        reto._generar_opciones()
+    t_opciones = (time.perf_counter() - inicio) / num_retos
+    return t_tarjetas, t_opciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('ruta_json', nargs='?', default=os.path.join('data', 'a_p.json'))
+    parser.add_argument('--retos', type=int, default=20)
+    args = parser.parse_args()
+
+    almacen = AlmacenLexico.desde_json(args.ruta_json)
+    inicio = time.perf_counter()
+    almacen.indices
+    print(f"Léxico: {len(almacen)} palabras (índices listos en "
+          f"{(time.perf_counter() - inicio) * 1000:.1f} ms)")
+
+    palabras = random.sample(list(almacen.palabras), min(args.retos, len(almacen)))
+    num_retos = len(palabras)
+    antes = medir(DiccionarioEscaneo(almacen=almacen), palabras, num_retos)
+    despues = medir(Diccionario(almacen=almacen), palabras, num_retos)
+
+    print(f"{'reto':<32}{'antes (ms)':>12}{'después (ms)':>14}{'x':>8}")
+    for nombre, a, d in zip(('RetoTarjetas.generar', 'RetoCompletarOracion opciones'),
+                            antes, despues):
+        print(f"{nombre:<32}{a * 1000:>12.3f}{d * 1000:>14.3f}{a / d:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Microbenchmark: distancia de Levenshtein completa frente a la acotada por el
+umbral de verificar_respuesta_exacta (banda diagonal + salida temprana).
+
+Uso:
+    python benchmarks/bench_levenshtein.py [--pares N] [--umbral U]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _comun import analizador_sin_cache
+
+
+def palabra_aleatoria(minimo, maximo):
+    return ''.join(random.choices(string.ascii_lowercase, k=random.randint(minimo, maximo)))
+
+
+def con_errata(palabra):
+    """Copia de la palabra con un carácter cambiado (respuesta casi correcta)."""
+    i = random.randrange(len(palabra))
+    return palabra[:i] + random.choice(string.ascii_lowercase) + palabra[i + 1:]
+
+
+def generar_pares(n):
+    """Mezcla de los casos reales: erratas, respuestas distintas y frases."""
+    pares = {}
+    palabras = [palabra_aleatoria(4, 12) for _ in range(n)]
+    pares['errata'] = [(con_errata(p), p) for p in palabras]
+    pares['distinta'] = [(palabra_aleatoria(4, 12), p) for p in palabras]
+    pares['longitud muy distinta'] = [(p[:2], p + p) for p in palabras]
+    frases = [' '.join(palabra_aleatoria(3, 8) for _ in range(8)) for _ in range(n // 10 or 1)]
+    pares['frase con errata'] = [(con_errata(f), f) for f in frases]
+    return pares
+
+
+def medir(funcion, pares, repeticiones=3):
+    """Microsegundos por par (mejor de varias repeticiones)."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for a, b in pares:
+            funcion(a, b)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor / len(pares) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pares', type=int, default=5000)
+    parser.add_argument('--umbral', type=float, default=0.85)
+    args = parser.parse_args()
+    random.seed(0)
+
+    analizador = analizador_sin_cache()
+    umbral = args.umbral
+
+    def completa(a, b):
+        return analizador.similitud(a, b) >= umbral
+
+    def acotada(a, b):
+        return analizador.es_similar(a, b, umbral)
+
+    print(f"{'caso':<24}{'completa (us)':>15}{'acotada (us)':>14}{'x':>8}")
+    for caso, pares in generar_pares(args.pares).items():
+        assert all(completa(a, b) == acotada(a, b) for a, b in pares)
+        t_completa = medir(completa, pares)
+        t_acotada = medir(acotada, pares)
+        print(f"{caso:<24}{t_completa:>15.2f}{t_acotada:>14.2f}{t_completa / t_acotada:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
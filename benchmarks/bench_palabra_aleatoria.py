@@ -0,0 +1,87 @@
+"""
+Benchmark: llamadas por segundo de Grafo.obtener_palabra_aleatoria
+construyendo la lista en cada llamada (antes) y eligiendo de las tuplas
+preparadas al construir el grafo (después).
+
+Uso:
+    python benchmarks/bench_palabra_aleatoria.py [ruta_json] [--llamadas N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lenguaje.almacen_lexico import AlmacenLexico
+from lenguaje.grafo_palabras import Grafo
+
+
+class GrafoListas(Grafo):
+    """Grafo con la obtener_palabra_aleatoria original: arma la lista cada vez."""
+
+    def obtener_palabra_aleatoria(self, categoria=None, dominio=None):
+        if categoria and dominio:
+            palabras = self.obtener_palabras_categoria(categoria, dominio)
+        elif categoria:
+            palabras = self.obtener_palabras_categoria(categoria)
+        elif dominio:
+            if dominio in self.palabras_por_dominio:
+                todas = []
+                for cat in ['sustantivo', 'verbo', 'adjetivo']:
+                    todas.extend(self.palabras_por_dominio[dominio][cat])
+                palabras = list(set(todas))
+            else:
+                palabras = []
+        else:
+            # ids es un dict palabra -> id, como lo era el grafo original
+            palabras = list(self.ids.keys())
+        if not palabras:
+            return None
+        return random.choice(palabras)
+
+
+def llamadas_por_segundo(grafo, filtros, llamadas):
+    """Llamadas por segundo con los filtros dados (mejor de 3 repeticiones)."""
+    mejor = float('inf')
+    for _ in range(3):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            grafo.obtener_palabra_aleatoria(**filtros)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return llamadas / mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('ruta_json', nargs='?', default=os.path.join('data', 'a_p.json'))
+    parser.add_argument('--llamadas', type=int, default=200)
+    args = parser.parse_args()
+
+    almacen = AlmacenLexico.desde_json(args.ruta_json)
+    with contextlib.redirect_stdout(io.StringIO()):
+        antes, despues = GrafoListas(almacen=almacen), Grafo(almacen=almacen)
+        antes.construir()
+        despues.construir()
+    print(f"Grafo: {len(despues.nodos)} palabras")
+
+    casos = [
+        ('sin filtros', {}),
+        ('categoría', {'categoria': 'verbo'}),
+        ('dominio', {'dominio': 'education'}),
+        ('categoría y dominio', {'categoria': 'sustantivo', 'dominio': 'health'}),
+    ]
+    print(f"{'filtro':<24}{'antes (llam/s)':>16}{'después (llam/s)':>18}{'x':>8}")
+    for nombre, filtros in casos:
+        a = llamadas_por_segundo(antes, filtros, args.llamadas)
+        # Las llamadas baratas necesitan más repeticiones para medirse bien
+        d = llamadas_por_segundo(despues, filtros, args.llamadas * 100)
+        print(f"{nombre:<24}{a:>16,.0f}{d:>18,.0f}{d / a:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: una similitud por par (bucle en Python) frente a
+Analizador.similitud_lote (todas las distancias en una pasada con numpy).
+
+Uso:
+    python benchmarks/bench_similitud_lote.py [--repeticiones N]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lenguaje import analizador as modulo_analizador
+from _comun import analizador_sin_cache
+
+
+def palabra_aleatoria():
+    return ''.join(random.choices(string.ascii_lowercase, k=random.randint(4, 12)))
+
+
+def mejor_por_pares(analizador, respuesta, candidatos):
+    """Lo que se hacía antes: una similitud por candidato."""
+    return max(((c, analizador.similitud(respuesta, c)) for c in candidatos),
+            key=lambda par: par[1])
+
+
+def medir(funcion, repeticiones):
+    """Milisegundos por llamada (mejor de tres tandas)."""
+    mejor = float('inf')
+    for _ in range(3):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor / repeticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+    random.seed(0)
+
+    analizador = analizador_sin_cache()
+    print(f"numpy: {'sí' if modulo_analizador.np is not None else 'no (par a par)'}")
+    print(f"{'candidatos':<34}{'por pares (ms)':>16}{'lote (ms)':>12}{'x':>8}")
+    for nombre, n in (('sinónimos de una palabra', 12), ('muchos sinónimos', 48),
+                    ('examen', 200), ('examen largo', 1000)):
+        candidatos = [palabra_aleatoria() for _ in range(n)]
+        respuesta = candidatos[-1][::-1]
+        esperado = mejor_por_pares(analizador, respuesta, candidatos)[1]
+        assert abs(analizador.similitud_lote(respuesta, candidatos)[1] - esperado) < 1e-9
+        t_pares = medir(lambda: mejor_por_pares(analizador, respuesta, candidatos),
+                        args.repeticiones)
+        t_lote = medir(lambda: analizador.similitud_lote(respuesta, candidatos),
+                       args.repeticiones)
+        print(f"{nombre + f' ({n})':<34}{t_pares:>16.3f}{t_lote:>12.3f}{t_pares / t_lote:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
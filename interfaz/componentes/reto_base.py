@@ -6,6 +6,7 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                             QPushButton, QFrame, QProgressBar, QSizePolicy)
 from PyQt6.QtGui import QFont, QIcon, QPixmap
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QPropertyAnimation, QEasingCurve
+import html
 import time
 
 
@@ -311,6 +312,10 @@ class RetoWidgetBase(QWidget):
         """)
         resultado_layout.addWidget(mensaje_label)
         
+        # Palabras de la respuesta resaltadas según la alineación
+        if resultado.get('tokens'):
+            resultado_layout.addWidget(self._crear_label_tokens(resultado['tokens']))
+        
         # Puntos obtenidos
         if 'puntaje' in resultado:
             puntos_label = QLabel(f"Puntos: {resultado['puntaje']}")
@@ -327,6 +332,36 @@ class RetoWidgetBase(QWidget):
         # Animación de entrada
         self._animar_resultado(resultado_widget)
     
+    # Colores por estado de cada palabra alineada
+    COLORES_TOKENS = {
+        'correcta': '#10B981',
+        'aproximada': '#F59E0B',
+        'incorrecta': '#EF4444',
+        'sobra': '#EF4444',
+        'falta': '#9CA3AF',
+    }
+    
+    def _crear_label_tokens(self, tokens):
+        """
+        Label con las palabras de la respuesta coloreadas por estado
+        (las que faltan se muestran como huecos).
+        
+        :param tokens: lista de {'esperada', 'respuesta', 'estado'} de Analizador.alinear_tokens
+        """
+        partes = []
+        for token in tokens:
+            color = self.COLORES_TOKENS.get(token['estado'], '#1F2937')
+            texto = token['respuesta'] if token['respuesta'] is not None else '___'
+            tachado = 'line-through' if token['estado'] == 'sobra' else 'none'
+            partes.append(f'<span style="color: {color}; text-decoration: {tachado};">'
+                          f'{html.escape(texto)}</span>')
+        label = QLabel(' '.join(partes))
+        label.setTextFormat(Qt.TextFormat.RichText)
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        label.setWordWrap(True)
+        label.setStyleSheet("font-size: 15px;")
+        return label
+    
     def _animar_resultado(self, widget):
         """Animación para mostrar el resultado."""
         animacion = QPropertyAnimation(widget, b"windowOpacity")
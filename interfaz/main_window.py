@@ -3,7 +3,8 @@ Ventana principal de la aplicación.
 """
 
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QPushButton, QLabel, QStackedWidget, QFrame, QMessageBox)
+                            QPushButton, QLabel, QStackedWidget, QFrame, QMessageBox,
+                            QProgressDialog, QApplication)
 from PyQt6.QtGui import QIcon, QFont, QPalette, QColor
 from PyQt6.QtCore import Qt, QSize, pyqtSignal
 import os
@@ -161,8 +162,12 @@ class MainWindow(QMainWindow):
         # Verificar que los componentes del sistema estén cargados
         if not hasattr(self, 'generador_retos'):
             # Cargar componentes del sistema (similar a cli.py)
+            from lenguaje.cargador_incremental import CargaCancelada
             try:
                 self._cargar_componentes_sistema()
+            except CargaCancelada:
+                # El usuario abandonó la carga: se queda en la página actual
+                return
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"No se pudo cargar el sistema: {e}")
                 return
@@ -197,14 +202,24 @@ class MainWindow(QMainWindow):
         if not os.path.exists(ruta_json):
             raise FileNotFoundError(f"No se encuentra el archivo: {ruta_json}")
         
-        diccionario = Diccionario(ruta_json)
+        # Un único almacén léxico para diccionario y grafo. Si el léxico está
+        # fragmentado (main.py --fragmentar-lexico) solo se cargan los dominios
+        # de los temas favoritos; si no, se carga entero en streaming con barra
+        # de progreso cancelable
+        from lenguaje.lexico_fragmentado import AlmacenFragmentado, ruta_fragmentos
+        if os.path.isdir(ruta_fragmentos(ruta_json)):
+            temas = self.perfil.preferencias.get('temas_favoritos') if self.perfil else None
+            almacen = AlmacenFragmentado.abrir_compartido(ruta_json, temas or None)
+        else:
+            almacen = self._cargar_almacen(ruta_json)
+        diccionario = Diccionario(almacen=almacen)
         
         # Inicializar analizador
         clasificador = ClasificadorCategorias()
         analizador = Analizador(diccionario, clasificador)
         
         # Construir grafo
-        grafo = Grafo(ruta_json)
+        grafo = Grafo(almacen=almacen)
         grafo.construir()
         
         # Generador de oraciones
@@ -222,6 +237,31 @@ class MainWindow(QMainWindow):
             motor_srs=motor_srs
         )
     
+    def _cargar_almacen(self, ruta_json):
+        """Carga el léxico mostrando el progreso; Cancelar detiene la carga."""
+        from lenguaje.almacen_lexico import AlmacenLexico
+        from lenguaje.cargador_incremental import CargadorIncremental
+        
+        dialogo = QProgressDialog("Cargando diccionario...", "Cancelar", 0, 100, self)
+        dialogo.setWindowTitle("LINGUALEARN")
+        dialogo.setWindowModality(Qt.WindowModality.WindowModal)
+        dialogo.setMinimumDuration(500)
+        
+        def al_progresar(progreso):
+            dialogo.setValue(int(progreso['porcentaje']))
+            dialogo.setLabelText(
+                f"Cargando diccionario... {progreso['entradas']:,} palabras "
+                f"({progreso['entradas_por_segundo']:,.0f}/s)")
+            QApplication.processEvents()
+            if dialogo.wasCanceled():
+                cargador.cancelar()
+        
+        cargador = CargadorIncremental(ruta_json, al_progresar)
+        try:
+            return AlmacenLexico.compartido(ruta_json, cargador=cargador)
+        finally:
+            dialogo.close()
+    
     def _on_sesion_completada(self, resultados):
         """Maneja la finalización de una sesión."""
         # Mostrar mensaje de éxito
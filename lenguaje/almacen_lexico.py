@@ -0,0 +1,551 @@
+"""
+Almacén léxico compartido: el JSON de palabras se carga una sola vez y
+lo usan Diccionario, Grafo, GeneradorGramatical y Analizador.
+"""
+
+import gc
+import os
+import sys
+import time
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+
+from .snapshot_lexico import (ruta_snapshot, ruta_derivada, firma_archivo,
+    escribir_snapshot, leer_json_lexico, leer_snapshot, sin_recolector)
+from .lexico_mmap import LexicoMmap, EXTENSION as EXTENSION_MMAP
+from .niveles import IndiceNiveles, nivel_a_numero
+from .inflexiones import POSICION, flexionar, flexiones_de_entrada, formas_de_entrada
+from .cargador_incremental import CargadorIncremental
+from .proyeccion import ProyeccionCampos
+from .normalizacion import ClavesRespuesta, normalizar
+from .entrada_compacta import (EntradaCompacta, compactar, reporte_memoria,
+    estado_simbolos, adoptar_simbolos)
+
+EXTENSION_INDICES = '.indices'
+
+class AlmacenLexico:
+    """
+    Almacén de solo lectura con el contenido de a_p.json.
+    - `palabras` es una vista inmutable del objeto { "word": { ... } }
+    - `data` conserva la forma { "palabras": {...}, ... } del JSON original
+    - `indices` guarda índices derivados (tuplas inmutables) que se calculan
+    una vez (al primer uso) y viajan dentro de la instantánea binaria
+    - las entradas cargadas desde archivo son EntradaCompacta (se leen como dict)
+    `palabras` puede ser también un LexicoMmap (ver desde_mmap), en cuyo caso
+    las entradas se decodifican solo cuando se consultan.
+    Los almacenes cargados desde archivo se registran por ruta (y proyección),
+    así dos componentes que piden el mismo JSON comparten una única copia.
+    """
+
+    _compartidos: Dict[tuple, 'AlmacenLexico'] = {}
+    # Los derivados del léxico completo (índice difuso, fonético, grafo) que
+    # se construyen en memoria se guardan junto al léxico
+    persistir_indices = True
+
+    def __init__(self, data: dict, path_json: str = None, indices: dict = None,
+                proyeccion: ProyeccionCampos = None):
+        """
+        :param data: objeto ya cargado con la clave 'palabras'
+        :param path_json: ruta de origen (solo informativa)
+        :param indices: índices ya calculados (p. ej. leídos de la instantánea)
+        :param proyeccion: proyección con la que se cargaron las entradas
+        """
+        self.path = path_json
+        self.proyeccion = proyeccion
+        palabras = data.get('palabras', {})
+        self.palabras = MappingProxyType(palabras) if isinstance(palabras, dict) else palabras
+        self.data = MappingProxyType({**data, 'palabras': self.palabras})
+        self._indices = indices
+        self._indice_difuso = None
+        self._indice_fonetico = None
+        self._claves_respuesta = {}
+        self._firma = None
+
+    @property
+    def indices(self) -> dict:
+        """
+        Índices derivados; se calculan la primera vez que se piden. Con un
+        léxico mapeado se leen del archivo .indices junto al .lexico (o se
+        construyen, decodificando todas las entradas, y se guardan).
+        """
+        if self._indices is None:
+            if isinstance(self.palabras, LexicoMmap) and self.path:
+                self._indices = self._cargar_indices_mmap()
+            else:
+                self._indices = self._construir_indices()
+        return self._indices
+
+    def _cargar_indices_mmap(self) -> dict:
+        """
+        Índices de un léxico mapeado: no viajan en ninguna instantánea, así
+        que se guardan aparte (a_p.lexico -> a_p.lexico.indices) firmados con
+        el .lexico para no decodificar el léxico entero en cada arranque.
+        """
+        ruta = ruta_derivada(self.path, EXTENSION_INDICES)
+        indices = leer_snapshot(ruta, self.path, self.firma_origen)
+        if indices is None:
+            indices = self._construir_indices()
+            if self.persistir_indices:
+                try:
+                    escribir_snapshot(ruta, self.firma_origen, indices)
+                except OSError as e:
+                    print(f"No se pudieron escribir los índices del léxico: {e}")
+        return indices
+
+    @property
+    def firma_origen(self) -> Optional[tuple]:
+        """
+        Firma (tamaño, mtime, hash) del archivo de origen tal como se cargó;
+        se calcula una vez y la reutilizan la instantánea y los derivados
+        (índices difuso y fonético, grafo). None si no hay archivo.
+        """
+        if self._firma is None and self.path:
+            self._firma = firma_archivo(self.path)
+        return self._firma
+
+    @property
+    def indice_difuso(self):
+        """
+        IndiceDifuso sobre las claves del léxico (sugerencias "¿quisiste decir?").
+        Se lee del archivo .difuso junto al léxico o se construye y se guarda.
+        """
+        if self._indice_difuso is None:
+            from .indice_difuso import IndiceDifuso, ruta_indice_difuso
+            self._indice_difuso = self._cargar_indice(
+                IndiceDifuso, ruta_indice_difuso, 'difuso')
+        return self._indice_difuso
+
+    @property
+    def indice_fonetico(self):
+        """
+        IndiceFonetico (código estilo Metaphone -> palabras) del léxico.
+        Se lee del archivo .fonetico junto al léxico o se construye y se guarda.
+        """
+        if self._indice_fonetico is None:
+            from .indice_fonetico import IndiceFonetico, ruta_indice_fonetico
+            self._indice_fonetico = self._cargar_indice(
+                IndiceFonetico, ruta_indice_fonetico, 'fonético')
+        return self._indice_fonetico
+
+    def _cargar_indice(self, clase, ruta_indice, nombre: str):
+        """
+        Lee un índice derivado de las claves (difuso, fonético) de su archivo
+        junto al léxico o lo construye y, si persistir_indices, lo guarda.
+
+        :param clase: clase del índice (construir / cargar / guardar)
+        :param ruta_indice: función que da la ruta del índice a partir del léxico
+        :param nombre: nombre para los mensajes de error
+        """
+        if not self.path:
+            return clase.construir(self.palabras)
+        ruta = ruta_indice(self.path)
+        indice = clase.cargar(ruta, self.path, self.firma_origen)
+        if indice is None:
+            indice = clase.construir(self.palabras)
+            if self.persistir_indices:
+                try:
+                    indice.guardar(ruta, self.path, self.firma_origen)
+                except OSError as e:
+                    print(f"No se pudo escribir el índice {nombre}: {e}")
+        return indice
+
+    def _preparar_indices_derivados(self):
+        """
+        Construye y guarda los índices difuso y fonético en el paso de
+        compilación, para que la aplicación solo tenga que leerlos. Al cargar
+        no se construyen: en léxicos grandes tardan decenas de segundos y
+        ocupan memoria aunque nunca se pida una sugerencia, así que se
+        construyen (o se leen) la primera vez que se usan.
+        """
+        self.indice_difuso
+        self.indice_fonetico
+
+    @classmethod
+    def desde_json(cls, path: str, usar_snapshot: bool = True,
+                cargador: CargadorIncremental = None,
+                proyeccion: ProyeccionCampos = None) -> 'AlmacenLexico':
+        """
+        Carga un almacén nuevo (sin pasar por el registro).
+        Si existe una instantánea válida junto al JSON se usa; si no, se parsea
+        el JSON y se (re)escribe la instantánea. Los índices difuso y fonético
+        se leen o se construyen al primer uso (ver _preparar_indices_derivados).
+
+        :param path: Dirección de json
+        :param usar_snapshot: False fuerza el parseo del JSON sin instantánea
+        :param cargador: CargadorIncremental para leer el JSON en streaming con
+        progreso y cancelación (los índices se construyen durante la lectura)
+        :param proyeccion: campos que se conservan de cada entrada; la carga es
+        en streaming para no tener nunca el léxico completo en memoria (los
+        índices se calculan sobre las entradas completas)
+        :raises CargaCancelada: si se cancela la carga en streaming
+        """
+        variante = proyeccion.firma() if proyeccion is not None else None
+        if usar_snapshot:
+            contenido = leer_snapshot(ruta_snapshot(path, variante), path)
+            if contenido is not None:
+                data, indices, simbolos = contenido
+                adoptar_simbolos(simbolos, data['palabras'].values())
+                # El léxico vive lo que el proceso: fuera de las pasadas del
+                # recolector (ver sin_recolector)
+                gc.freeze()
+                return cls(data, path, indices, proyeccion)
+        if proyeccion is not None and cargador is None:
+            cargador = CargadorIncremental(path)
+        if cargador is not None:
+            transformar = compactar if usar_snapshot else None
+            if proyeccion is not None:
+                transformar = _componer(proyeccion.aplicar, transformar)
+            constructor = ConstructorIndices()
+            with sin_recolector(permanente=usar_snapshot):
+                data = cargador.cargar(al_entrar=constructor.agregar, transformar=transformar)
+                almacen = cls(data, path, constructor.resultado(), proyeccion)
+        else:
+            data = leer_json_lexico(path)
+            if not usar_snapshot:
+                return cls(data, path)
+            with sin_recolector():
+                almacen = cls(_compactar(data), path)
+        if usar_snapshot:
+            try:
+                almacen.guardar_snapshot()
+            except OSError as e:
+                print(f"No se pudo escribir la instantánea del léxico: {e}")
+        return almacen
+
+    @classmethod
+    def desde_mmap(cls, path: str, tamano_cache: int = 1024) -> 'AlmacenLexico':
+        """
+        Abre un léxico .lexico (ver compilar_lexico_mmap) sin decodificar entradas.
+
+        :param path: archivo .lexico
+        :param tamano_cache: entradas decodificadas que conserva la LRU
+        """
+        lexico = LexicoMmap(path, tamano_cache)
+        return cls({**lexico.metadatos, 'palabras': lexico}, path)
+
+    @classmethod
+    def compilar(cls, path: str) -> str:
+        """
+        Paso de compilación: parsea el JSON, compacta sus entradas, calcula los
+        índices y escribe la instantánea (y los índices difuso y fonético)
+        junto al archivo de origen.
+
+        :param path: Dirección de json
+        :return: ruta de la instantánea generada
+        """
+        data = leer_json_lexico(path)
+        with sin_recolector(permanente=False):
+            almacen = cls(_compactar(data), path)
+            destino = almacen.guardar_snapshot()
+            almacen._preparar_indices_derivados()
+        return destino
+
+    @classmethod
+    def compartido(cls, path: str, cargador: CargadorIncremental = None,
+                proyeccion: ProyeccionCampos = None) -> 'AlmacenLexico':
+        """
+        Devuelve el almacén registrado para la ruta, cargándolo la primera vez.
+        Las rutas .lexico se abren mapeadas en memoria (desde_mmap).
+
+        :param path: Dirección de json o de léxico mapeado
+        :param cargador: CargadorIncremental para una carga con progreso/cancelación
+        :param proyeccion: campos que se conservan (cada proyección es un almacén aparte)
+        """
+        clave = (os.path.abspath(path), proyeccion.firma() if proyeccion else None)
+        almacen = cls._compartidos.get(clave)
+        if almacen is None:
+            if path.endswith(EXTENSION_MMAP):
+                almacen = cls.desde_mmap(path)
+            else:
+                almacen = cls.desde_json(path, cargador=cargador, proyeccion=proyeccion)
+            cls._compartidos[clave] = almacen
+        return almacen
+
+    @classmethod
+    def liberar(cls, path: str = None):
+        """
+        Olvida el almacén registrado para una ruta (o todos si no se indica).
+        Las instancias que ya lo usan lo conservan.
+        """
+        if path is None:
+            cls._compartidos.clear()
+        else:
+            ruta = os.path.abspath(path)
+            for clave in [c for c in cls._compartidos if c[0] == ruta]:
+                del cls._compartidos[clave]
+
+    def guardar_snapshot(self) -> str:
+        """
+        Escribe la instantánea (datos, índices y tablas de símbolos) firmada
+        con el JSON de origen.
+
+        :return: ruta de la instantánea
+        """
+        if not self.path:
+            raise ValueError("El almacén no tiene JSON de origen")
+        destino = ruta_snapshot(self.path,
+            self.proyeccion.firma() if self.proyeccion is not None else None)
+        data = {**self.data, 'palabras': dict(self.palabras)}
+        escribir_snapshot(destino, self.firma_origen,
+            (data, self.indices, estado_simbolos()))
+        return destino
+
+    def reporte_proyeccion(self) -> Dict[str, int]:
+        """
+        Bytes descartados por campo durante la carga proyectada (vacío si no
+        hubo proyección o si el almacén salió de una instantánea).
+        """
+        return self.proyeccion.reporte() if self.proyeccion is not None else {}
+
+    def reporte_memoria(self) -> dict:
+        """Bytes que ocupan las entradas en memoria (total y por palabra)."""
+        return reporte_memoria(self.palabras)
+
+    def _construir_indices(self) -> dict:
+        """Recorre el léxico completo con ConstructorIndices."""
+        constructor = ConstructorIndices()
+        for palabra, info in self.palabras.items():
+            constructor.agregar(palabra, info)
+        return constructor.resultado()
+
+    def claves_respuesta(self, palabra: str) -> ClavesRespuesta:
+        """
+        Respuestas normalizadas aceptadas para la palabra (ella, sus sinónimos
+        y sus traducciones). Se calculan la primera vez y quedan guardadas.
+        Una forma flexionada que no está en el léxico toma las traducciones
+        de su lema ("studies" -> "estudiar").
+        """
+        clave = palabra.lower()
+        claves = self._claves_respuesta.get(clave)
+        if claves is None:
+            info = self.obtener(clave)
+            if info is None:
+                lema = self.obtener_lema(clave)
+                info = {'traducciones': lema.get('traducciones')} if lema else None
+            claves = ClavesRespuesta.de_entrada(clave, info)
+            self._claves_respuesta[clave] = claves
+        return claves
+
+    def flexion(self, palabra: str, clave: str) -> str:
+        """
+        Forma de la palabra ('base', 'third', 'past', 'participle', 'ing' o
+        'plural') en O(1) con la tabla 'flexiones'. Las palabras que no están
+        en la tabla (o sin esa forma) se flexionan con inflexiones.flexionar.
+        """
+        if clave == 'base':
+            return palabra
+        palabra = palabra.lower()
+        tabla = self.indices['flexiones'].get(palabra)
+        if tabla is not None:
+            forma = tabla[POSICION[clave]]
+            if forma:
+                return forma
+        return flexionar(palabra, clave)
+
+    def palabras_por_traduccion(self, traduccion: str) -> Tuple[str, ...]:
+        """
+        Palabras en inglés con esa traducción al español, en O(1) con el
+        índice 'traduccion' (sin importar tildes, mayúsculas ni signos).
+        """
+        if not traduccion:
+            return ()
+        return self.indices['traduccion'].get(normalizar(traduccion), ())
+
+    def lemas(self, forma: str) -> Tuple[str, ...]:
+        """
+        Lemas de los que la palabra es forma flexionada ('studies' -> ('study',)),
+        en O(1) con el índice 'lema'. Vacío si no es forma de ninguna entrada.
+        """
+        if not forma:
+            return ()
+        return self.indices['lema'].get(forma.lower(), ())
+
+    def obtener_lema(self, palabra: str) -> Optional[dict]:
+        """
+        Entrada de la palabra o, si no está en el léxico y es una forma
+        flexionada, la de su primer lema.
+        """
+        info = self.obtener(palabra)
+        if info is None:
+            for lema in self.lemas(palabra):
+                info = self.obtener(lema)
+                if info is not None:
+                    break
+        return info
+
+    def obtener(self, palabra: str) -> Optional[dict]:
+        """Devuelve la entrada de una palabra (en minúsculas) o None."""
+        if not palabra:
+            return None
+        return self.palabras.get(palabra.lower())
+
+    def __contains__(self, palabra) -> bool:
+        return palabra in self.palabras
+
+    def __len__(self) -> int:
+        return len(self.palabras)
+
+class ConstructorIndices:
+    """
+    Construye los índices invertidos del léxico entrada a entrada (sirve
+    igual para un recorrido completo que para una carga en streaming).
+    Índices resultantes, en el orden de aparición de las palabras:
+    - 'categoria': categoria -> tupla de palabras
+    - 'dominio_categoria': (dominio, categoria) -> tupla de palabras
+    (las palabras sin semántica cuentan como dominio 'general')
+    - 'tema': tema -> tupla de palabras
+    - 'nivel': IndiceNiveles con CEFR y numéricos en la escala 0..100
+    - 'flexiones': palabra -> tupla de formas en el orden de
+    inflexiones.CLAVES (None donde no aplica), solo verbos y sustantivos
+    - 'lema': forma flexionada -> tupla de lemas ('studies' -> ('study',)),
+    con las `formas` de cada entrada, las irregulares y las regulares que falten
+    - 'traduccion': traducción al español normalizada (sin tildes ni
+    mayúsculas) -> tupla de palabras en inglés ('arbol' -> ('tree',))
+    """
+
+    def __init__(self):
+        self.por_categoria = {}
+        self.por_dominio_categoria = {}
+        self.por_tema = {}
+        self.por_nivel = []
+        self.por_forma = {}
+        self.flexiones = {}
+        self.por_traduccion = {}
+
+    def agregar(self, palabra: str, info: dict):
+        """Indexa una entrada."""
+        if isinstance(info, EntradaCompacta):
+            # Sin reconstruir listas ni dicts de la entrada
+            categorias, temas, dominio = info.categorias, info.temas, info.dominio
+        else:
+            categorias = info.get('categorias') or []
+            temas = info.get('temas') or []
+            dominio = info.get('semantica', {}).get('dominio', 'general')
+        for cat in categorias:
+            self.por_categoria.setdefault(cat, []).append(palabra)
+            self.por_dominio_categoria.setdefault((dominio, cat), []).append(palabra)
+        for tema in temas:
+            self.por_tema.setdefault(tema, []).append(palabra)
+        nivel = nivel_a_numero(info.get('nivel'))
+        if nivel is not None:
+            self.por_nivel.append((nivel, palabra))
+        flexiones = flexiones_de_entrada(palabra, info)
+        if flexiones is not None:
+            self.flexiones[palabra] = tuple(sys.intern(f) if f else None for f in flexiones)
+        for forma in formas_de_entrada(palabra, info, flexiones or ()):
+            self.por_forma.setdefault(forma, []).append(palabra)
+        for traduccion in (info.get('traducciones') or {}).get('es') or ():
+            palabras = self.por_traduccion.setdefault(normalizar(traduccion), [])
+            # Dos traducciones que se normalizan igual ("él" / "el") cuentan una vez
+            if not palabras or palabras[-1] != palabra:
+                palabras.append(palabra)
+
+    def resultado(self) -> dict:
+        """Índices congelados (tuplas inmutables)."""
+        return {
+            'categoria': {k: tuple(v) for k, v in self.por_categoria.items()},
+            'dominio_categoria': {k: tuple(v) for k, v in self.por_dominio_categoria.items()},
+            'tema': {k: tuple(v) for k, v in self.por_tema.items()},
+            'nivel': IndiceNiveles.construir(self.por_nivel),
+            'flexiones': self.flexiones,
+            'lema': {sys.intern(k): tuple(v) for k, v in self.por_forma.items()},
+            'traduccion': {sys.intern(k): tuple(v) for k, v in self.por_traduccion.items() if k},
+        }
+
+def fusionar_indices(indices: dict, nuevos: dict) -> dict:
+    """
+    Índices de dos conjuntos de palabras disjuntos a partir de los de cada
+    uno (ConstructorIndices.resultado()), sin volver a recorrer entradas:
+    las palabras de `nuevos` quedan detrás, como si se hubieran agregado después.
+
+    :param indices: índices ya calculados
+    :param nuevos: índices de las palabras añadidas
+    """
+    resultado = {}
+    for nombre, tabla in indices.items():
+        otra = nuevos[nombre]
+        if nombre == 'nivel':
+            resultado[nombre] = tabla.fusionar(otra)
+        elif nombre == 'flexiones':
+            resultado[nombre] = {**tabla, **otra}
+        else:
+            combinada = dict(tabla)
+            for clave, palabras in otra.items():
+                combinada[clave] = combinada.get(clave, ()) + palabras
+            resultado[nombre] = combinada
+    return resultado
+
+def _componer(primero, segundo):
+    """Función que aplica primero y luego segundo (si hay segundo)."""
+    if segundo is None:
+        return primero
+    return lambda valor: segundo(primero(valor))
+
+def _compactar(data: dict) -> dict:
+    """Metadatos con cadenas internadas y entradas como EntradaCompacta."""
+    resultado = {k: _internar(v) for k, v in data.items() if k != 'palabras'}
+    resultado['palabras'] = {sys.intern(p): compactar(info)
+        for p, info in data['palabras'].items()}
+    return resultado
+
+def _internar(obj):
+    """
+    Interna recursivamente las cadenas del JSON ('sustantivo', 'education',
+    nombres de temas...) para que cada valor repetido exista una sola vez,
+    tanto en memoria como dentro de la instantánea.
+    """
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    if isinstance(obj, dict):
+        return {sys.intern(k): _internar(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_internar(v) for v in obj]
+    return obj
+
+def comparar_tiempos_carga(path: str) -> dict:
+    """
+    Informe de tiempos: parseo del JSON frente a lectura de la instantánea.
+    Compila la instantánea si no es válida.
+
+    :param path: Dirección de json
+    :return: diccionario con segundos de cada fase y la aceleración obtenida
+    """
+    inicio = time.perf_counter()
+    AlmacenLexico.desde_json(path, usar_snapshot=False)
+    t_json = time.perf_counter() - inicio
+
+    t_compilar = 0.0
+    if leer_snapshot(ruta_snapshot(path), path) is None:
+        inicio = time.perf_counter()
+        AlmacenLexico.compilar(path)
+        t_compilar = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    AlmacenLexico.desde_json(path)
+    t_snapshot = time.perf_counter() - inicio
+
+    return {
+        'json_s': t_json,
+        'compilar_s': t_compilar,
+        'snapshot_s': t_snapshot,
+        'aceleracion': t_json / t_snapshot if t_snapshot else float('inf'),
+        'bytes_json': os.path.getsize(path),
+        'bytes_snapshot': os.path.getsize(ruta_snapshot(path)),
+    }
+
+def comparar_memoria(path: str) -> dict:
+    """
+    Informe de memoria: entradas como dicts del JSON frente a EntradaCompacta.
+
+    :param path: Dirección de json
+    :return: bytes por palabra de cada forma y la reducción obtenida
+    """
+    dicts = AlmacenLexico.desde_json(path, usar_snapshot=False).reporte_memoria()
+    compactas = AlmacenLexico(_compactar(leer_json_lexico(path)), path).reporte_memoria()
+    return {
+        'palabras': dicts['palabras'],
+        'bytes_por_palabra_dict': dicts['bytes_por_palabra'],
+        'bytes_por_palabra_compacta': compactas['bytes_por_palabra'],
+        'reduccion': (dicts['bytes_totales'] / compactas['bytes_totales']
+            if compactas['bytes_totales'] else float('inf')),
+    }
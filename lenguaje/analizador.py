@@ -2,8 +2,25 @@
 Docstring for lenguaje.analizador
 """
 
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .cache_lru import CacheLRU
 from .categorias import ClasificadorCategorias
 from .diccionario import Diccionario
+from .indice_fonetico import clave_fonetica
+from .inflexiones import flexionar
+from .normalizacion import ClavesRespuesta, normalizar
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él las distancias se calculan par a par
+    np = None
+
+# Por debajo de este número de candidatos el coste fijo de numpy no compensa
+MIN_CANDIDATOS_LOTE = 8
+
+# Coste de casar dos palabras parecidas (no iguales) al alinear oraciones
+COSTE_APROXIMADA = 0.25
 
 class Analizador:
     """
@@ -15,9 +32,25 @@ class Analizador:
     Se pretende que sea dependiente de Diccionario y ClasificadorCategorias.
     """
 
-    def __init__(self, diccionario: Diccionario, clasificador: ClasificadorCategorias):
+    def __init__(self, diccionario: Diccionario, clasificador: ClasificadorCategorias,
+                tamano_cache: int = 4096):
+        """
+        :param tamano_cache: pares (respuesta, solución) cuyas similitudes se
+            recuerdan (LRU); 0 la desactiva
+        """
         self.dic = diccionario
         self.cat = clasificador
+        self.almacen = diccionario.almacen
+        self.cache = CacheLRU(tamano_cache) if tamano_cache > 0 else None
+
+    def estadisticas_cache(self) -> dict:
+        """Aciertos/fallos/expulsiones de la LRU de similitudes ({} si no hay)."""
+        return self.cache.estadisticas() if self.cache is not None else {}
+
+    @staticmethod
+    def _clave_par(a: str, b: str, *resto) -> tuple:
+        """Clave de caché independiente del orden (la distancia es simétrica)."""
+        return (a, b, *resto) if a <= b else (b, a, *resto)
 
     # ---------- coincidencia aproximada de strings ----------
     @staticmethod
@@ -44,69 +77,362 @@ class Analizador:
             prev = cur
         return prev[-1]
 
+    @staticmethod
+    def distancia_levenshtein_acotada(a: str, b: str, maximo: int) -> int:
+        """
+        Distancia de Levenshtein si es <= maximo; si no, devuelve maximo + 1.
+        Solo rellena la banda diagonal |i - j| <= maximo, corta en cuanto una
+        fila entera supera el máximo y no calcula nada cuando la diferencia de
+        longitudes ya lo supera.
+        """
+        fuera = maximo + 1
+        if maximo < 0:
+            return fuera
+        a = a.lower()
+        b = b.lower()
+        if a == b:
+            return 0
+        if abs(len(a) - len(b)) > maximo:
+            return fuera
+        # El prefijo y el sufijo comunes no cambian la distancia
+        inicio = 0
+        limite = min(len(a), len(b))
+        while inicio < limite and a[inicio] == b[inicio]:
+            inicio += 1
+        fin_a, fin_b = len(a), len(b)
+        while fin_a > inicio and fin_b > inicio and a[fin_a - 1] == b[fin_b - 1]:
+            fin_a -= 1
+            fin_b -= 1
+        a = a[inicio:fin_a]
+        b = b[inicio:fin_b]
+        if not a or not b:
+            return len(a) or len(b)
+
+        n = len(b)
+        prev = [j if j <= maximo else fuera for j in range(n + 1)]
+        for i, ca in enumerate(a, start=1):
+            desde = max(1, i - maximo)
+            hasta = min(n, i + maximo)
+            cur = [fuera] * (n + 1)
+            if i <= maximo:
+                cur[0] = i
+            minimo_fila = cur[0]
+            for j in range(desde, hasta + 1):
+                valor = prev[j-1] if ca == b[j-1] else prev[j-1] + 1
+                if prev[j] + 1 < valor:
+                    valor = prev[j] + 1
+                if cur[j-1] + 1 < valor:
+                    valor = cur[j-1] + 1
+                if valor > fuera:
+                    valor = fuera
+                cur[j] = valor
+                if valor < minimo_fila:
+                    minimo_fila = valor
+            if minimo_fila > maximo:
+                return fuera
+            prev = cur
+        return prev[n]
+
     def similitud(self, a: str, b: str) -> float:
         """
         Devuelve similitud normalizada 0..1 basada en Levenshtein.
         """
         if not a or not b:
             return 0.0
+        if self.cache is not None:
+            return self.cache.obtener(self._clave_par(a, b), lambda: self._similitud(a, b))
+        return self._similitud(a, b)
+
+    def _similitud(self, a: str, b: str) -> float:
         d = self.distancia_levenshtein(a, b)
         maxlen = max(len(a), len(b))
         return 1 - d / maxlen
 
+    @staticmethod
+    def distancias_lote(respuesta: str, candidatos: Sequence[str]) -> List[int]:
+        """
+        Distancia de Levenshtein de la respuesta a cada candidato.
+        Con numpy se calculan todas en una pasada: la tabla es
+        (candidatos x longitud máxima), cada carácter de la respuesta es una
+        fila vectorizada y la inserción (que depende de la columna anterior)
+        se resuelve con un mínimo acumulado.
+        """
+        if np is None or len(candidatos) < MIN_CANDIDATOS_LOTE:
+            return [Analizador.distancia_levenshtein(respuesta, c) for c in candidatos]
+        candidatos = [c.lower() for c in candidatos]
+        n = len(candidatos)
+        longitudes = np.fromiter((len(c) for c in candidatos), dtype=np.int64, count=n)
+        m = int(longitudes.max())
+        # -1 de relleno: nunca coincide con un carácter
+        codigos = np.full((n, m), -1, dtype=np.int64)
+        for k, c in enumerate(candidatos):
+            codigos[k, :len(c)] = [ord(x) for x in c]
+        columnas = np.arange(m + 1)
+        prev = np.broadcast_to(columnas, (n, m + 1)).copy()
+        for i, ca in enumerate(respuesta.lower(), start=1):
+            # Sustitución y borrado para todas las columnas a la vez
+            base = np.minimum(prev[:, :-1] + (codigos != ord(ca)), prev[:, 1:] + 1)
+            # Inserción: cur[j] = j + min(i, min_{t<=j}(base[t] - t))
+            x = np.empty_like(prev)
+            x[:, 0] = i
+            x[:, 1:] = base - columnas[1:]
+            prev = np.minimum.accumulate(x, axis=1) + columnas
+        return prev[np.arange(n), longitudes].tolist()
+
+    def similitud_lote(self, respuesta: str, candidatos: Sequence[str]) -> Tuple[Optional[str], float]:
+        """
+        Candidato más parecido a la respuesta y su similitud (misma escala que
+        similitud()), con todas las distancias calculadas en un solo lote.
+
+        :return: (mejor candidato, similitud) o (None, 0.0) si no hay candidatos
+        """
+        candidatos = [c for c in candidatos if c]
+        if not respuesta or not candidatos:
+            return None, 0.0
+        mejor, puntuacion = None, -1.0
+        for c, d in zip(candidatos, self.distancias_lote(respuesta, candidatos)):
+            s = 1 - d / max(len(respuesta), len(c))
+            if s > puntuacion:
+                mejor, puntuacion = c, s
+        return mejor, puntuacion
+
+    def _alguno_similar(self, respuesta: str, candidatos: List[str], umbral: float) -> bool:
+        """similitud >= umbral con algún candidato (en lote si son muchos)."""
+        if np is not None and len(candidatos) >= MIN_CANDIDATOS_LOTE:
+            return self.similitud_lote(respuesta, candidatos)[1] >= umbral
+        return any(self.es_similar(respuesta, c, umbral) for c in candidatos)
+
+    def es_similar(self, a: str, b: str, umbral: float) -> bool:
+        """
+        Equivale a similitud(a, b) >= umbral, pero con la distancia acotada:
+        solo se calcula lo necesario para saber si se llega al umbral.
+        """
+        if not a or not b:
+            return 0.0 >= umbral
+        if self.cache is not None:
+            return self.cache.obtener(self._clave_par(a, b, umbral),
+                                      lambda: self._es_similar(a, b, umbral))
+        return self._es_similar(a, b, umbral)
+
+    def _es_similar(self, a: str, b: str, umbral: float) -> bool:
+        maxlen = max(len(a), len(b))
+        # Cota por exceso; la comparación final es la misma que en similitud
+        maximo = int((1 - umbral) * maxlen) + 1
+        d = self.distancia_levenshtein_acotada(a, b, maximo)
+        if d > maximo:
+            return False
+        return 1 - d / maxlen >= umbral
+
+    def claves_respuesta(self, palabra: str) -> ClavesRespuesta:
+        """Claves normalizadas de la palabra (guardadas en el almacén si lo hay)."""
+        if self.almacen is not None:
+            return self.almacen.claves_respuesta(palabra)
+        return ClavesRespuesta.de_entrada(palabra, self.dic.obtener_info(palabra))
+
     def verificar_respuesta_exacta(self, respuesta: str, solucion: str, umbral=0.85) -> bool:
         """
         Verifica si la respuesta del usuario coincide con la solución,
         usando similitud o coincidencia exacta y aceptando sinónimos.
+        La respuesta normalizada (sin mayúsculas, tildes ni signos) se busca
+        primero en las claves precalculadas de la solución; la distancia de
+        edición solo se calcula si no está.
         """
         if not respuesta:
             return False
-        if respuesta.strip().lower() == solucion.strip().lower():
+        respuesta = normalizar(respuesta)
+        claves = self.claves_respuesta(solucion).ingles
+        if respuesta in claves:
             return True
-        sim = self.similitud(respuesta.strip().lower(), solucion.strip().lower())
-        if sim >= umbral:
+        solucion = normalizar(solucion)
+        if self.es_similar(respuesta, solucion, umbral):
             return True
         # intentar sinónimos
-        info = self.dic.obtener_info(solucion)
-        if info:
-            sinonimos = info.get('sinonimos', [])
-            for s in sinonimos:
-                if respuesta.strip().lower() == s.strip().lower():
-                    return True
-                if self.similitud(respuesta.strip().lower(), s.strip().lower()) >= umbral:
-                    return True
-        return False
+        return self._alguno_similar(respuesta, [c for c in claves if c != solucion], umbral)
+
+    def verificar_traduccion(self, respuesta: str, palabra: str, idioma: str = 'es',
+                            umbral=0.85) -> bool:
+        """
+        Verifica una respuesta en otro idioma contra todas las traducciones de
+        la palabra ("arbol" vale para "árbol"), con la misma tolerancia.
+
+        :param respuesta: respuesta del usuario
+        :param palabra: palabra en inglés
+        :param idioma: idioma de la respuesta
+        """
+        if not respuesta:
+            return False
+        respuesta = normalizar(respuesta)
+        claves = self.claves_respuesta(palabra).traducciones.get(idioma, frozenset())
+        if respuesta in claves:
+            return True
+        return self._alguno_similar(respuesta, list(claves), umbral)
+
+    def mejor_coincidencia(self, respuesta: str, soluciones: Sequence[str],
+                        umbral=0.85) -> Optional[str]:
+        """
+        Solución (de varias posibles) a la que corresponde la respuesta, o None.
+        Primero compara con todas las soluciones en un lote y, si ninguna
+        llega al umbral, con todos sus sinónimos en otro lote.
+
+        :param respuesta: respuesta del usuario
+        :param soluciones: palabras aceptables (p. ej. las de un reto múltiple)
+        """
+        if not respuesta or not soluciones:
+            return None
+        respuesta = normalizar(respuesta)
+        normalizadas = {normalizar(s): s for s in soluciones}
+        if respuesta in normalizadas:
+            return normalizadas[respuesta]
+        mejor, puntuacion = self.similitud_lote(respuesta, list(normalizadas))
+        if mejor is not None and puntuacion >= umbral:
+            return normalizadas[mejor]
+        por_sinonimo = {}
+        for solucion in soluciones:
+            for s in self.claves_respuesta(solucion).ingles:
+                por_sinonimo.setdefault(s, solucion)
+        if respuesta in por_sinonimo:
+            return por_sinonimo[respuesta]
+        mejor, puntuacion = self.similitud_lote(respuesta, list(por_sinonimo))
+        if mejor is not None and puntuacion >= umbral:
+            return por_sinonimo[mejor]
+        return None
+
+    def sugerir(self, respuesta: str, k: int = 2, limite: int = 3) -> List[str]:
+        """
+        Palabras del léxico cercanas a una respuesta mal escrita ("¿quisiste
+        decir...?"), con los índices del almacén: no recorre el léxico.
+        Las que suenan igual (índice fonético, "nolege" -> "knowledge", a
+        cualquier distancia) y las del índice difuso (distancia de edición
+        <= k) van de la más a la menos cercana; a igual distancia, primero
+        la que suena igual.
+        Si la respuesta ya es una palabra del léxico no hay sugerencias.
+
+        :param respuesta: texto escrito por el usuario
+        :param k: distancia de edición máxima del índice difuso
+        :param limite: número máximo de sugerencias
+        """
+        if self.almacen is None or not respuesta:
+            return []
+        respuesta = respuesta.strip().lower()
+        # obtener() y no `in`: en un léxico fragmentado busca también lo no cargado
+        if not respuesta or self.almacen.obtener(respuesta) is not None:
+            return []
+        # (distancia, 0 si suena igual y 1 si viene del índice difuso, palabra)
+        foneticas = self.almacen.indice_fonetico.buscar(respuesta)
+        candidatos = [(distancia, 0, p) for p, distancia
+                      in zip(foneticas, self.distancias_lote(respuesta, foneticas))]
+        for p, distancia in self.almacen.indice_difuso.buscar(respuesta, k, limite):
+            candidatos.append((distancia, 1, p))
+        sugerencias = []
+        for _, _, p in sorted(candidatos):
+            if len(sugerencias) >= limite:
+                break
+            if p not in sugerencias:
+                sugerencias.append(p)
+        return sugerencias
+
+    def suena_como(self, respuesta: str, solucion: str) -> bool:
+        """
+        True si la respuesta tiene el mismo código fonético que la solución
+        ("fone" / "phone"): una falta de ortografía, no una palabra distinta.
+        """
+        codigo = clave_fonetica(respuesta)
+        return bool(codigo) and codigo == clave_fonetica(solucion)
+
+    # ---------- alineación por palabras ----------
+    @staticmethod
+    def _tokens(texto: str) -> List[Tuple[str, str]]:
+        """Palabras del texto como (original, normalizada), sin las que quedan vacías."""
+        pares = ((t, normalizar(t)) for t in texto.split())
+        return [(t, n) for t, n in pares if n]
+
+    def alinear_tokens(self, respuesta: str, objetivo: str, umbral_token: float = 0.8,
+                    equivalentes: Dict[str, FrozenSet[str]] = None) -> dict:
+        """
+        Compara dos oraciones palabra a palabra: distancia de edición sobre
+        palabras en la que sustituir, sobrar o faltar cuesta 1 y dos palabras
+        casan gratis si son iguales normalizadas o con coste COSTE_APROXIMADA
+        si son parecidas (es_similar con umbral_token). La tabla es de
+        palabras x palabras, no de caracteres x caracteres.
+
+        :param respuesta: oración del usuario
+        :param objetivo: oración esperada
+        :param umbral_token: similitud mínima para dar una palabra por aproximada
+        :param equivalentes: palabra normalizada del objetivo -> otras palabras
+            que valen igual en su lugar (p. ej. otras traducciones)
+        :return: {'similitud': 0..1, 'tokens': [{'esperada', 'respuesta', 'estado'}]}
+            con estado 'correcta', 'aproximada', 'incorrecta', 'falta' o 'sobra'
+        """
+        a = self._tokens(respuesta or '')
+        b = self._tokens(objetivo or '')
+        n, m = len(a), len(b)
+        # Coste de casar cada par (i, j), guardado para reconstruir el camino
+        casar = [[0.0] * m for _ in range(n)]
+        prev = [float(j) for j in range(m + 1)]
+        tabla = [prev]
+        for i in range(1, n + 1):
+            x = a[i - 1][1]
+            fila = casar[i - 1]
+            cur = [float(i)] + [0.0] * m
+            for j in range(1, m + 1):
+                y = b[j - 1][1]
+                if x == y or (equivalentes and x in equivalentes.get(y, ())):
+                    coste = 0.0
+                # Sin caché: los pares de palabras sueltas la llenarían y
+                # expulsarían los pares (respuesta, solución)
+                elif self._es_similar(x, y, umbral_token):
+                    coste = COSTE_APROXIMADA
+                else:
+                    coste = 1.0
+                fila[j - 1] = coste
+                cur[j] = min(prev[j - 1] + coste, prev[j] + 1, cur[j - 1] + 1)
+            tabla.append(cur)
+            prev = cur
+
+        # Reconstrucción desde la esquina (se prefiere casar antes que saltar)
+        tokens = []
+        i, j = n, m
+        while i or j:
+            if i and j and tabla[i][j] == tabla[i - 1][j - 1] + casar[i - 1][j - 1]:
+                coste = casar[i - 1][j - 1]
+                estado = ('correcta' if coste == 0 else
+                          'aproximada' if coste == COSTE_APROXIMADA else 'incorrecta')
+                tokens.append({'esperada': b[j - 1][0], 'respuesta': a[i - 1][0], 'estado': estado})
+                i, j = i - 1, j - 1
+            elif j and tabla[i][j] == tabla[i][j - 1] + 1:
+                tokens.append({'esperada': b[j - 1][0], 'respuesta': None, 'estado': 'falta'})
+                j -= 1
+            else:
+                tokens.append({'esperada': None, 'respuesta': a[i - 1][0], 'estado': 'sobra'})
+                i -= 1
+        tokens.reverse()
+        similitud = 1 - tabla[n][m] / max(n, m) if n and m else 0.0
+        return {'similitud': similitud, 'tokens': tokens}
 
     # ---------- formas simples ----------
+    def flexion(self, palabra: str, clave: str) -> str:
+        """
+        Forma de la palabra con la tabla de flexiones compartida del almacén
+        (la misma que usa GeneradorGramatical); sin almacén, con
+        inflexiones.flexionar y las `formas` de la entrada.
+
+        :param clave: 'base', 'third', 'past', 'participle', 'ing' o 'plural'
+        """
+        if self.almacen is not None:
+            return self.almacen.flexion(palabra, clave)
+        info = self.dic.obtener_info(palabra) or {}
+        return flexionar(palabra.lower(), clave, info.get('formas'))
+
     def obtener_plural(self, palabra: str):
         """
-        Devuelve forma plural si existe en diccionario.forms, sino intenta regla simple.
+        Devuelve forma plural si existe en diccionario.forms, sino la irregular
+        conocida o la regla simple (ver inflexiones).
         """
-        info = self.dic.obtener_info(palabra)
-        if not info:
+        if not self.dic.obtener_info(palabra):
             return None
-        formas = info.get('formas', {})
-        plural = formas.get('plural') or []
-        if plural:
-            return plural[0]
-        # regla simple: si termina en y -> ies, si termina en s->es, else +s
-        if palabra.endswith('y') and len(palabra) > 1 and palabra[-2] not in 'aeiou':
-            return palabra[:-1] + 'ies'
-        if palabra.endswith(('s','x','z','ch','sh')):
-            return palabra + 'es'
-        return palabra + 's'
+        return self.flexion(palabra, 'plural')
 
     def obtener_past(self, palabra: str):
-        info = self.dic.obtener_info(palabra)
-        if not info:
+        if not self.dic.obtener_info(palabra):
             return None
-        formas = info.get('formas', {})
-        past = formas.get('past') or []
-        if past:
-            return past[0]
-        # regla simple regular
-        if palabra.endswith('e'):
-            return palabra + 'd'
-        if palabra.endswith('y') and palabra[-2] not in 'aeiou':
-            return palabra[:-1] + 'ied'
-        return palabra + 'ed'
\ No newline at end of file
+        return self.flexion(palabra, 'past')
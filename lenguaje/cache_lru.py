@@ -0,0 +1,67 @@
+"""
+Caché LRU acotada con contadores de aciertos, fallos y expulsiones, para
+dimensionarla con tráfico real (functools.lru_cache no cuenta expulsiones).
+Es segura entre hilos: el servidor comparte un Analizador entre usuarios.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class CacheLRU:
+    """
+    Diccionario acotado que expulsa la entrada usada hace más tiempo.
+    """
+
+    def __init__(self, maximo: int = 4096):
+        """
+        :param maximo: número máximo de entradas (0 desactiva la caché)
+        """
+        self.maximo = maximo
+        self._datos = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def obtener(self, clave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """
+        Valor guardado para la clave o, si no está, calcular() (que se guarda).
+        El cálculo se hace fuera del cerrojo: dos hilos pueden calcular a la
+        vez el mismo valor, pero ninguno espera al otro.
+        """
+        with self._cerrojo:
+            try:
+                valor = self._datos[clave]
+            except KeyError:
+                self.fallos += 1
+            else:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return valor
+        valor = calcular()
+        if self.maximo > 0:
+            with self._cerrojo:
+                self._datos[clave] = valor
+                self._datos.move_to_end(clave)
+                while len(self._datos) > self.maximo:
+                    self._datos.popitem(last=False)
+                    self.expulsiones += 1
+        return valor
+
+    def limpiar(self):
+        """Vacía la caché y pone los contadores a cero."""
+        with self._cerrojo:
+            self._datos.clear()
+            self.aciertos = self.fallos = self.expulsiones = 0
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def estadisticas(self) -> dict:
+        """Aciertos, fallos, expulsiones, tasa de aciertos y ocupación."""
+        consultas = self.aciertos + self.fallos
+        return {'aciertos': self.aciertos, 'fallos': self.fallos,
+                'expulsiones': self.expulsiones,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'tamano': len(self._datos), 'maximo': self.maximo}
@@ -0,0 +1,193 @@
+"""
+Carga incremental del JSON del léxico: recorre el objeto "palabras" entrada
+por entrada, informa del progreso y se puede cancelar desde otro hilo o
+desde la interfaz (p. ej. el botón Cancelar de una barra de progreso).
+"""
+
+import codecs
+import json
+import os
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from .snapshot_lexico import comprobar_lexico
+
+_ESPACIOS = re.compile(r'[ \t\n\r]*')
+
+class CargaCancelada(Exception):
+    """Se lanza cuando se cancela una carga en curso."""
+
+class CargadorIncremental:
+    """
+    Lector en streaming de { "palabras": { "word": {...}, ... }, ... }.
+    - lee el archivo por bloques y decodifica cada entrada por separado
+    (json.JSONDecoder.raw_decode), sin tener todo el texto en memoria
+    - llama a al_progresar(dict) cada `intervalo` entradas y al terminar, con:
+    entradas, bytes_leidos, bytes_totales, porcentaje, entradas_por_segundo,
+    transcurrido_s
+    - cancelar() detiene la carga en la siguiente entrada (CargaCancelada)
+    """
+
+    def __init__(self, path: str, al_progresar: Callable[[dict], None] = None,
+                intervalo: int = 5000, tamano_bloque: int = 1 << 20):
+        """
+        :param path: Dirección del json
+        :param al_progresar: callback de progreso (opcional)
+        :param intervalo: entradas entre dos avisos de progreso
+        :param tamano_bloque: bytes leídos en cada lectura
+        """
+        self.path = path
+        self.al_progresar = al_progresar
+        self.intervalo = max(1, intervalo)
+        self.tamano_bloque = tamano_bloque
+        self._cancelado = threading.Event()
+        self._decoder = json.JSONDecoder()
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self._buf = ''
+        self._pos = 0
+        self._fin = False
+        self._leidos = 0
+        self._total = os.path.getsize(self.path)
+        self._entradas = 0
+        self._inicio = time.perf_counter()
+
+    def cancelar(self):
+        """Pide detener la carga (seguro desde otro hilo)."""
+        self._cancelado.set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado.is_set()
+
+    # ---------- lectura por bloques ----------
+    def _rellenar(self, archivo, decodificador) -> bool:
+        """Añade un bloque al búfer; False si ya no quedan datos."""
+        if self._fin:
+            return False
+        bloque = archivo.read(self.tamano_bloque)
+        self._leidos += len(bloque)
+        texto = decodificador.decode(bloque, final=not bloque)
+        if not bloque:
+            self._fin = True
+        self._buf = self._buf[self._pos:] + texto
+        self._pos = 0
+        return bool(bloque) or bool(texto)
+
+    def _saltar_espacios(self, archivo, decodificador):
+        while True:
+            self._pos = _ESPACIOS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return
+            if not self._rellenar(archivo, decodificador):
+                raise ValueError(f"JSON incompleto en {self.path}")
+
+    def _esperar(self, caracter: str, archivo, decodificador):
+        self._saltar_espacios(archivo, decodificador)
+        if self._buf[self._pos] != caracter:
+            raise ValueError(f"Se esperaba '{caracter}' en {self.path}")
+        self._pos += 1
+
+    def _leer_valor(self, archivo, decodificador):
+        """Decodifica el siguiente valor JSON, leyendo más bloques si está cortado."""
+        self._saltar_espacios(archivo, decodificador)
+        while True:
+            try:
+                valor, fin = self._decoder.raw_decode(self._buf, self._pos)
+                # Un número al borde del búfer podría seguir en el siguiente bloque
+                if fin < len(self._buf) or self._fin:
+                    self._pos = fin
+                    return valor
+            except json.JSONDecodeError:
+                if self._fin:
+                    raise
+            self._rellenar(archivo, decodificador)
+
+    def _siguiente_separador(self, cierre: str, archivo, decodificador) -> bool:
+        """Consume ',' o el cierre; True si hay otro elemento."""
+        self._saltar_espacios(archivo, decodificador)
+        caracter = self._buf[self._pos]
+        self._pos += 1
+        if caracter == ',':
+            return True
+        if caracter == cierre:
+            return False
+        raise ValueError(f"Separador inesperado '{caracter}' en {self.path}")
+
+    # ---------- progreso ----------
+    def progreso(self) -> dict:
+        """Estado actual de la carga."""
+        transcurrido = time.perf_counter() - self._inicio
+        return {
+            'entradas': self._entradas,
+            'bytes_leidos': self._leidos,
+            'bytes_totales': self._total,
+            'porcentaje': 100.0 * self._leidos / self._total if self._total else 100.0,
+            'entradas_por_segundo': self._entradas / transcurrido if transcurrido else 0.0,
+            'transcurrido_s': transcurrido,
+        }
+
+    def _notificar(self):
+        if self.al_progresar is not None:
+            self.al_progresar(self.progreso())
+
+    # ---------- carga ----------
+    def cargar(self, al_entrar: Callable[[str, dict], None] = None,
+            transformar: Optional[Callable[[dict], dict]] = None) -> dict:
+        """
+        Recorre el JSON y devuelve el objeto completo { "palabras": {...}, ... }.
+
+        :param al_entrar: se llama con (palabra, info) por cada entrada, antes
+        de transformarla (p. ej. para construir índices sobre la marcha)
+        :param transformar: se aplica a cada entrada antes de guardarla
+        :raises CargaCancelada: si se llamó a cancelar()
+        """
+        self._reiniciar()
+        data = {}
+        decodificador = codecs.getincrementaldecoder('utf-8-sig')()
+        with open(self.path, 'rb') as archivo:
+            self._esperar('{', archivo, decodificador)
+            self._saltar_espacios(archivo, decodificador)
+            if self._buf[self._pos] == '}':
+                self._pos += 1
+            else:
+                while True:
+                    clave = self._leer_valor(archivo, decodificador)
+                    self._esperar(':', archivo, decodificador)
+                    if clave == 'palabras':
+                        data['palabras'] = self._cargar_palabras(archivo, decodificador,
+                            al_entrar, transformar)
+                    else:
+                        data[clave] = self._leer_valor(archivo, decodificador)
+                    if not self._siguiente_separador('}', archivo, decodificador):
+                        break
+        comprobar_lexico(data)
+        self._notificar()
+        return data
+
+    def _cargar_palabras(self, archivo, decodificador, al_entrar, transformar) -> dict:
+        palabras = {}
+        self._esperar('{', archivo, decodificador)
+        self._saltar_espacios(archivo, decodificador)
+        if self._buf[self._pos] == '}':
+            self._pos += 1
+            return palabras
+        while True:
+            if self._cancelado.is_set():
+                raise CargaCancelada(f"Carga de {self.path} cancelada")
+            palabra = self._leer_valor(archivo, decodificador)
+            self._esperar(':', archivo, decodificador)
+            info = self._leer_valor(archivo, decodificador)
+            if al_entrar is not None:
+                al_entrar(palabra, info)
+            if transformar is not None:
+                info = transformar(info)
+            palabras[palabra] = info
+            self._entradas += 1
+            if self._entradas % self.intervalo == 0:
+                self._notificar()
+            if not self._siguiente_separador('}', archivo, decodificador):
+                return palabras
@@ -1,7 +1,9 @@
 """
 Clase referente al diccionario cn todoas las palabras (4800)
 """
-import json
+from .almacen_lexico import AlmacenLexico
+from .normalizacion import normalizar
+from .proyeccion import como_proyeccion
 
 class Diccionario:
     """
@@ -11,32 +13,40 @@ class Diccionario:
     No es una representación de un grafo
     """
 
-    def __init__(self, path_json:str=None, data_obj=None):
+    def __init__(self, path_json:str=None, data_obj=None, almacen:AlmacenLexico=None,
+                proyeccion=None):
         """
-        Inicializa el diccionario desde un archivo o desde objeto ya cargado.
+        Inicializa el diccionario desde un archivo, desde objeto ya cargado o
+        desde un AlmacenLexico compartido.
         Si se proporciona data_obj, se usa directamente (útil para tests).
 
         :param path_json: dirección del json
         :param data_obj: si se le dá información directamente la puede cargar sin el path
+        :param almacen: almacén léxico ya cargado (se comparte, no se copia)
+        :param proyeccion: campos a conservar al cargar desde path_json
+        (lista de rutas o ProyeccionCampos, ver lenguaje.proyeccion)
         """
         self.path = path_json
+        self.almacen = None
         self.data = {}
-        if data_obj is not None:
-            self.data = data_obj
+        if almacen is not None:
+            self.almacen = almacen
+            self.data = almacen.data
+        elif data_obj is not None:
+            self.almacen = AlmacenLexico(data_obj, path_json)
+            self.data = self.almacen.data
         elif path_json:
-            self.cargar(path_json)
+            self.cargar(path_json, proyeccion)
 
-    def cargar(self, path:str):
+    def cargar(self, path:str, proyeccion=None):
         """
-        Carga la información de json
+        Carga la información de json (una sola vez por ruta, ver AlmacenLexico)
         
         :param path: Dirección de json
+        :param proyeccion: campos a conservar de cada entrada (None = todos)
         """
-        with open(path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
-        # Asegura estructura mínima
-        if 'palabras' not in self.data:
-            raise ValueError("JSON de diccionario debe tener clave 'palabras'")
+        self.almacen = AlmacenLexico.compartido(path, proyeccion=como_proyeccion(proyeccion))
+        self.data = self.almacen.data
         return self.data
 
     def obtener_info(self, palabra:str):
@@ -49,6 +59,46 @@ class Diccionario:
             return None
         return self.data.get('palabras', {}).get(palabra.lower())
 
+    def lemas(self, palabra:str):
+        """
+        Lemas de una forma flexionada ('studies' -> ('study',)), O(1) con el
+        índice de formas del almacén.
+
+        :param palabra: Palabra en inglés
+        """
+        if self.almacen is None:
+            return ()
+        return self.almacen.lemas(palabra)
+
+    def obtener_info_lema(self, palabra:str):
+        """
+        Como obtener_info, pero si la palabra es una forma flexionada que no
+        está en el json ('teaches') devuelve la información de su lema.
+
+        :param palabra: Palabra en inglés
+        """
+        if self.almacen is None:
+            return self.obtener_info(palabra)
+        return self.almacen.obtener_lema(palabra)
+
+    def buscar_por_traduccion(self, traduccion, idioma='es'):
+        """
+        Devuelve las palabras en inglés que tienen esa traducción (sin
+        importar tildes ni mayúsculas). El español usa el índice inverso del
+        almacén (O(1)); otros idiomas recorren el léxico.
+
+        :param traduccion: palabra en el otro idioma
+        :param idioma: código del idioma
+        """
+        if self.almacen is None or not traduccion:
+            return ()
+        if idioma == 'es':
+            return self.almacen.palabras_por_traduccion(traduccion)
+        buscada = normalizar(traduccion)
+        return tuple(w for w, info in self.iterar_palabras()
+            if any(normalizar(t) == buscada
+                for t in (info.get('traducciones') or {}).get(idioma) or ()))
+
     def iterar_palabras(self):
         """
         Itera sobre todas las palabras, es un método de test por lo que no se
@@ -60,45 +110,48 @@ class Diccionario:
 
     def palabras_por_categoria(self, categoria):
         """
-        Devuelve lista de palabras cuya lista 'categorias' contiene la categoría.
+        Devuelve las palabras cuya lista 'categorias' contiene la categoría.
+        Usa el índice precalculado del almacén: tupla inmutable, O(1).
         """
-        res = []
-        for w, info in self.iterar_palabras():
-            cats = info.get('categorias') or []
-            if categoria in cats:
-                res.append(w)
-        return res
+        if self.almacen is None:
+            return ()
+        return self.almacen.indices['categoria'].get(categoria, ())
 
     def buscar_por_tema(self, tema):
         """
-        Devuelve lista de palabras cuya lista 'tema' contiene el tema.
+        Devuelve las palabras cuya lista 'tema' contiene el tema.
+        Usa el índice precalculado del almacén: tupla inmutable, O(1).
         """
-        res = []
-        for w, info in self.iterar_palabras():
-            temas = info.get('temas') or []
-            if tema in temas:
-                res.append(w)
-        return res
+        if self.almacen is None:
+            return ()
+        return self.almacen.indices['tema'].get(tema, ())
 
     def buscar_por_nivel(self, max_nivel):
         """
         Recibe un valor numérico o CEFR. Si CEFR (A1..C2) lo mapea a número.
-        Para tu sistema usamos niveles 0..100; si el diccionario tiene CEFR, quien
-        llama debe convertirlo o usar un mapa external.
+        Los niveles del diccionario (CEFR o 0..100) están unificados en la
+        escala 0..100 del índice de niveles (ver lenguaje.niveles).
 
         :param max_nivel: valor numérico o string referene al nivle de las palabras
         """
-        res = []
-        for w, info in self.iterar_palabras():
-            lvl = info.get('nivel')
-            if lvl is None:
-                continue
-            try:
-                # si el nivel está en formato entero (0-100)
-                lvl_num = int(lvl)
-            except Exception:
-                # mapear CEFR a número mínimo - por defecto ignorar
-                lvl_num = None
-            if lvl_num is not None and lvl_num <= max_nivel:
-                res.append(w)
-        return res
\ No newline at end of file
+        return self.buscar_por_rango_nivel(None, max_nivel)
+
+    def buscar_por_rango_nivel(self, min_nivel=None, max_nivel=None):
+        """
+        Palabras con min_nivel <= nivel <= max_nivel (bisect sobre el índice).
+        Ej.: buscar_por_rango_nivel(30, 45) o buscar_por_rango_nivel('B1', 'B2')
+
+        :param min_nivel: nivel mínimo (None = sin límite)
+        :param max_nivel: nivel máximo (None = sin límite)
+        """
+        if self.almacen is None:
+            return ()
+        return self.almacen.indices['nivel'].rango(min_nivel, max_nivel)
+
+    def muestrear_por_nivel(self, min_nivel, max_nivel, k:int):
+        """
+        Hasta k palabras al azar dentro del rango de niveles, en O(log n + k).
+        """
+        if self.almacen is None:
+            return []
+        return self.almacen.indices['nivel'].muestrear(min_nivel, max_nivel, k)
@@ -0,0 +1,280 @@
+"""
+Diccionario respaldado por un archivo SQLite.
+Misma API pública que Diccionario, pero las consultas por categoría, tema y
+nivel se resuelven con índices de la base sin cargar el léxico en memoria,
+y varios procesos pueden compartir el mismo archivo.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Iterator, Optional, Tuple
+
+from .inflexiones import formas_de_entrada
+from .niveles import nivel_a_numero
+from .normalizacion import normalizar
+from .snapshot_lexico import leer_json_lexico, ruta_derivada
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS palabras (
+    palabra TEXT PRIMARY KEY,
+    info TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS categorias (
+    palabra TEXT NOT NULL,
+    categoria TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS temas (
+    palabra TEXT NOT NULL,
+    tema TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS niveles (
+    palabra TEXT PRIMARY KEY,
+    nivel_texto TEXT,
+    nivel_num INTEGER
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dominios (
+    palabra TEXT PRIMARY KEY,
+    dominio TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS traducciones (
+    palabra TEXT NOT NULL,
+    idioma TEXT NOT NULL,
+    traduccion TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS formas (
+    forma TEXT NOT NULL,
+    lema TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadatos (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+) WITHOUT ROWID;
+"""
+
+INDICES = """
+CREATE INDEX IF NOT EXISTS idx_categorias ON categorias (categoria, palabra);
+CREATE INDEX IF NOT EXISTS idx_temas ON temas (tema, palabra);
+CREATE INDEX IF NOT EXISTS idx_niveles ON niveles (nivel_num);
+CREATE INDEX IF NOT EXISTS idx_dominios ON dominios (dominio);
+CREATE INDEX IF NOT EXISTS idx_traducciones ON traducciones (idioma, traduccion);
+CREATE INDEX IF NOT EXISTS idx_formas ON formas (forma);
+"""
+
+def ruta_db(path_json: str) -> str:
+    """
+    Ruta de la base asociada a un JSON (a_p.json -> a_p.db).
+
+    :param path_json: Dirección del json de origen
+    """
+    return ruta_derivada(path_json, '.db')
+
+def importar_json(path_json: str, path_db: str = None, lote: int = 5000) -> str:
+    """
+    Importa a_p.json a una base SQLite nueva (la reemplaza si existe).
+
+    :param path_json: Dirección del json de origen
+    :param path_db: archivo SQLite de destino (por defecto junto al JSON)
+    :param lote: filas por executemany
+    :return: ruta de la base generada
+    """
+    path_db = path_db or ruta_db(path_json)
+    data = leer_json_lexico(path_json)
+    palabras = data.pop('palabras')
+
+    temporal = path_db + '.tmp'
+    if os.path.exists(temporal):
+        os.remove(temporal)
+    con = sqlite3.connect(temporal)
+    try:
+        con.executescript(ESQUEMA)
+        con.executemany("INSERT INTO metadatos VALUES (?, ?)",
+            [(k, json.dumps(v, ensure_ascii=False)) for k, v in data.items()])
+        filas = {'palabras': [], 'categorias': [], 'temas': [], 'niveles': [],
+                'dominios': [], 'traducciones': [], 'formas': []}
+        for palabra, info in palabras.items():
+            _filas_de_entrada(palabra, info, filas)
+            if len(filas['palabras']) >= lote:
+                _volcar(con, filas)
+        _volcar(con, filas)
+        # Los índices se crean al final: insertar con ellos ya creados es más lento
+        con.executescript(INDICES)
+        con.commit()
+    finally:
+        con.close()
+    os.replace(temporal, path_db)
+    return path_db
+
+def _filas_de_entrada(palabra: str, info: dict, filas: dict):
+    """Reparte una entrada del JSON en las filas de cada tabla."""
+    filas['palabras'].append((palabra, json.dumps(info, ensure_ascii=False,
+        separators=(',', ':'))))
+    # Los null del JSON se quedan en la entrada, pero no se indexan
+    for cat in info.get('categorias') or []:
+        if cat is not None:
+            filas['categorias'].append((palabra, cat))
+    for tema in info.get('temas') or []:
+        if tema is not None:
+            filas['temas'].append((palabra, tema))
+    nivel = info.get('nivel')
+    if nivel is not None:
+        filas['niveles'].append((palabra, str(nivel), nivel_a_numero(nivel)))
+    # Igual que el grafo: sin semántica cuenta como dominio 'general'
+    dominio = (info.get('semantica') or {}).get('dominio', 'general')
+    if dominio is not None:
+        filas['dominios'].append((palabra, dominio))
+    for idioma, traducciones in (info.get('traducciones') or {}).items():
+        for traduccion in traducciones:
+            # Normalizada (sin tildes ni mayúsculas), igual que el índice en memoria
+            filas['traducciones'].append((palabra, idioma, normalizar(traduccion)))
+    for forma in formas_de_entrada(palabra, info):
+        filas['formas'].append((forma, palabra))
+
+def _volcar(con: sqlite3.Connection, filas: dict):
+    """Inserta las filas acumuladas y vacía los búferes."""
+    con.executemany("INSERT INTO palabras VALUES (?, ?)", filas['palabras'])
+    con.executemany("INSERT INTO categorias VALUES (?, ?)", filas['categorias'])
+    con.executemany("INSERT INTO temas VALUES (?, ?)", filas['temas'])
+    con.executemany("INSERT INTO niveles VALUES (?, ?, ?)", filas['niveles'])
+    con.executemany("INSERT INTO dominios VALUES (?, ?)", filas['dominios'])
+    con.executemany("INSERT INTO traducciones VALUES (?, ?, ?)", filas['traducciones'])
+    con.executemany("INSERT INTO formas VALUES (?, ?)", filas['formas'])
+    for lista in filas.values():
+        lista.clear()
+
+class DiccionarioSQLite:
+    """
+    Diccionario con la misma API que Diccionario, respaldado por SQLite.
+    La base se abre en solo lectura: varios procesos pueden compartirla.
+    """
+
+    # Sin AlmacenLexico en memoria: Analizador recurre entonces a obtener_info
+    almacen = None
+
+    def __init__(self, path_db: str):
+        """
+        :param path_db: archivo generado con importar_json
+        """
+        if not os.path.exists(path_db):
+            raise FileNotFoundError(f"No se encuentra la base: {path_db}")
+        self.path = path_db
+        uri = 'file:' + os.path.abspath(path_db).replace('?', '%3f') + '?mode=ro'
+        self.con = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    def obtener_info(self, palabra:str) -> Optional[dict]:
+        """
+        Devuelve la información de una palabra si se encuentra en la base
+
+        :param palabra: Palabra en inglés
+        """
+        if not palabra:
+            return None
+        fila = self.con.execute("SELECT info FROM palabras WHERE palabra = ?",
+            (palabra.lower(),)).fetchone()
+        return json.loads(fila[0]) if fila else None
+
+    def lemas(self, palabra:str) -> Tuple[str, ...]:
+        """
+        Lemas de una forma flexionada ('studies' -> ('study',)).
+
+        :param palabra: Palabra en inglés
+        """
+        if not palabra:
+            return ()
+        filas = self.con.execute("SELECT lema FROM formas WHERE forma = ?",
+            (palabra.lower(),))
+        return tuple(f[0] for f in filas)
+
+    def obtener_info_lema(self, palabra:str) -> Optional[dict]:
+        """
+        Como obtener_info, pero si la palabra es una forma flexionada que no
+        está en la base devuelve la información de su lema.
+
+        :param palabra: Palabra en inglés
+        """
+        info = self.obtener_info(palabra)
+        if info is None:
+            for lema in self.lemas(palabra):
+                info = self.obtener_info(lema)
+                if info is not None:
+                    break
+        return info
+
+    def iterar_palabras(self) -> Iterator[Tuple[str, dict]]:
+        """
+        Itera sobre todas las palabras (decodifica cada entrada al vuelo)
+        """
+        for palabra, info in self.con.execute("SELECT palabra, info FROM palabras"):
+            yield palabra, json.loads(info)
+
+    def palabras_por_categoria(self, categoria):
+        """
+        Devuelve lista de palabras cuya lista 'categorias' contiene la categoría.
+        """
+        filas = self.con.execute("SELECT palabra FROM categorias WHERE categoria = ?",
+            (categoria,))
+        return [f[0] for f in filas]
+
+    def buscar_por_tema(self, tema):
+        """
+        Devuelve lista de palabras cuya lista 'tema' contiene el tema.
+        """
+        filas = self.con.execute("SELECT palabra FROM temas WHERE tema = ?", (tema,))
+        return [f[0] for f in filas]
+
+    def buscar_por_nivel(self, max_nivel):
+        """
+        Palabras con nivel menor o igual a max_nivel (CEFR o 0..100, misma
+        escala unificada que Diccionario).
+
+        :param max_nivel: nivel máximo
+        """
+        return self.buscar_por_rango_nivel(None, max_nivel)
+
+    def buscar_por_rango_nivel(self, min_nivel=None, max_nivel=None):
+        """
+        Palabras con min_nivel <= nivel <= max_nivel (usa idx_niveles).
+        """
+        minimo = 0 if min_nivel is None else nivel_a_numero(min_nivel)
+        maximo = 100 if max_nivel is None else nivel_a_numero(max_nivel)
+        if minimo is None or maximo is None:
+            return []
+        filas = self.con.execute(
+            "SELECT palabra FROM niveles WHERE nivel_num BETWEEN ? AND ? ORDER BY nivel_num",
+            (minimo, maximo))
+        return [f[0] for f in filas]
+
+    def muestrear_por_nivel(self, min_nivel, max_nivel, k:int):
+        """
+        Hasta k palabras al azar dentro del rango de niveles.
+        """
+        minimo = 0 if min_nivel is None else nivel_a_numero(min_nivel)
+        maximo = 100 if max_nivel is None else nivel_a_numero(max_nivel)
+        if minimo is None or maximo is None:
+            return []
+        filas = self.con.execute(
+            "SELECT palabra FROM niveles WHERE nivel_num BETWEEN ? AND ? "
+            "ORDER BY RANDOM() LIMIT ?", (minimo, maximo, k))
+        return [f[0] for f in filas]
+
+    def buscar_por_dominio(self, dominio):
+        """
+        Devuelve lista de palabras cuyo 'semantica.dominio' es el indicado.
+        """
+        filas = self.con.execute("SELECT palabra FROM dominios WHERE dominio = ?",
+            (dominio,))
+        return [f[0] for f in filas]
+
+    def buscar_por_traduccion(self, traduccion, idioma='es'):
+        """
+        Devuelve las palabras en inglés que tienen esa traducción (sin
+        importar tildes ni mayúsculas).
+        """
+        filas = self.con.execute(
+            "SELECT DISTINCT palabra FROM traducciones WHERE idioma = ? AND traduccion = ?",
+            (idioma, normalizar(traduccion)))
+        return [f[0] for f in filas]
+
+    def cerrar(self):
+        """Cierra la conexión."""
+        self.con.close()
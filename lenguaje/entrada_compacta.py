@@ -0,0 +1,281 @@
+"""
+Registros compactos para las entradas del léxico.
+En lugar de un dict anidado por palabra, cada entrada es un objeto con
+__slots__: las categorías, los temas y el dominio se guardan como códigos de
+tablas de símbolos compartidas, y el resto de campos como tuplas inmutables
+con cadenas internadas. La entrada se sigue leyendo como un dict
+(info.get('categorias'), info['semantica']...), así que los consumidores de
+obtener_info no cambian.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Iterator, List, Optional
+
+class TablaSimbolos:
+    """
+    Tabla de símbolos: asigna a cada texto distinto un código entero estable
+    y guarda una única copia (internada) del texto.
+    """
+
+    __slots__ = ('nombre', 'textos', 'codigos')
+
+    def __init__(self, nombre: str):
+        """
+        :param nombre: nombre de la tabla (solo informativo)
+        """
+        self.nombre = nombre
+        self.textos: List[str] = []
+        self.codigos = {}
+
+    def codigo(self, texto: str) -> int:
+        """Código del texto, registrándolo si es nuevo."""
+        codigo = self.codigos.get(texto)
+        if codigo is None:
+            codigo = len(self.textos)
+            texto = sys.intern(texto)
+            self.textos.append(texto)
+            self.codigos[texto] = codigo
+        return codigo
+
+    def texto(self, codigo: int) -> str:
+        return self.textos[codigo]
+
+    def __len__(self) -> int:
+        return len(self.textos)
+
+    def adoptar(self, textos) -> Optional[List[int]]:
+        """
+        Incorpora los textos de una tabla guardada (p. ej. en la instantánea).
+        Si esta tabla es un prefijo de la guardada, los códigos coinciden y
+        basta con añadir los que faltan; si no, devuelve la lista
+        código guardado -> código de esta tabla para traducir las entradas.
+        """
+        n = len(self.textos)
+        if self.textos == list(textos[:n]):
+            for texto in textos[n:]:
+                self.codigo(texto)
+            return None
+        return [self.codigo(t) for t in textos]
+
+# Tablas compartidas por todos los almacenes del proceso
+CATEGORIAS = TablaSimbolos('categorias')
+DOMINIOS = TablaSimbolos('dominios')
+TEMAS = TablaSimbolos('temas')
+
+class _Pares(tuple):
+    """Dict congelado como tupla de pares (clave, valor); ocupa menos que un dict."""
+    __slots__ = ()
+
+# Texto libre que casi nunca se repite: internarlo solo engordaría la tabla de sys.intern
+_SIN_INTERNAR = frozenset(('definiciones', 'ejemplos'))
+
+def _congelar(valor, internar=sys.intern):
+    """Listas -> tuplas, dicts -> _Pares, cadenas internadas."""
+    tipo = type(valor)
+    if tipo is str:
+        return internar(valor)
+    if tipo is list:
+        return tuple([_congelar(v, internar) for v in valor])
+    if tipo is dict:
+        return _Pares([(sys.intern(k), _congelar(v, internar)) for k, v in valor.items()])
+    return valor
+
+def _identidad(valor):
+    return valor
+
+def _codigos(tabla: TablaSimbolos, valores) -> Optional[tuple]:
+    """
+    Códigos de una lista de textos (categorías, temas); None si no es una
+    lista de cadenas (falta, es null o tiene otros valores) y entonces el
+    campo se guarda tal cual, sin codificar.
+    """
+    if type(valores) is not list or not all(type(v) is str for v in valores):
+        return None
+    return tuple([tabla.codigo(v) for v in valores])
+
+def _descongelar(valor):
+    """Inverso de _congelar: devuelve listas y dicts nuevos."""
+    tipo = type(valor)
+    if tipo is tuple:
+        return [_descongelar(v) for v in valor]
+    if tipo is _Pares:
+        return {k: _descongelar(v) for k, v in valor}
+    return valor
+
+class EntradaCompacta(Mapping):
+    """
+    Entrada del léxico en forma compacta, de solo lectura.
+    - categorías y temas: tuplas de códigos de CATEGORIAS / TEMAS
+    - semantica.dominio: código de DOMINIOS
+    - resto de campos: tupla de pares (clave, valor congelado)
+    Los valores que no son texto (null en el JSON, números) no se codifican:
+    se guardan congelados en el resto, igual que cualquier otro campo.
+    Se accede como a un dict; cada acceso devuelve listas/dicts nuevos, igual
+    que si la entrada viniera del JSON.
+    """
+
+    __slots__ = ('_categorias', '_temas', '_dominio', '_resto')
+
+    def __init__(self, info: dict):
+        """
+        :param info: entrada del JSON { "categorias": [...], "semantica": {...}, ... }
+        """
+        self._categorias = _codigos(CATEGORIAS, info.get('categorias'))
+        self._temas = _codigos(TEMAS, info.get('temas'))
+        self._dominio = None
+        resto = []
+        for clave, valor in info.items():
+            if ((clave == 'categorias' and self._categorias is not None)
+                    or (clave == 'temas' and self._temas is not None)):
+                continue
+            if (clave == 'semantica' and isinstance(valor, dict)
+                    and type(valor.get('dominio')) is str):
+                self._dominio = DOMINIOS.codigo(valor['dominio'])
+                valor = {k: v for k, v in valor.items() if k != 'dominio'}
+            resto.append((sys.intern(clave), _congelar(valor,
+                _identidad if clave in _SIN_INTERNAR else sys.intern)))
+        self._resto = _Pares(resto)
+
+    # ---------- accesores rápidos (sin construir listas) ----------
+    @property
+    def categorias(self) -> tuple:
+        """Categorías como tupla de cadenas internadas (vacía si no hay)."""
+        if self._categorias is None:
+            return tuple(self.get('categorias') or ())
+        return tuple(CATEGORIAS.textos[c] for c in self._categorias)
+
+    @property
+    def temas(self) -> tuple:
+        """Temas como tupla de cadenas internadas (vacía si no hay)."""
+        if self._temas is None:
+            return tuple(self.get('temas') or ())
+        return tuple(TEMAS.textos[t] for t in self._temas)
+
+    @property
+    def dominio(self):
+        """
+        semantica.dominio (el valor del JSON si no es texto, p. ej. None), o
+        'general' si la entrada no lo tiene.
+        """
+        if self._dominio is not None:
+            return DOMINIOS.textos[self._dominio]
+        for k, valor in self._resto:
+            if k == 'semantica' and type(valor) is _Pares:
+                for k2, dominio in valor:
+                    if k2 == 'dominio':
+                        return dominio
+        return 'general'
+
+    # ---------- interfaz de dict ----------
+    def __getitem__(self, clave):
+        if clave == 'categorias' and self._categorias is not None:
+            return [CATEGORIAS.textos[c] for c in self._categorias]
+        if clave == 'temas' and self._temas is not None:
+            return [TEMAS.textos[t] for t in self._temas]
+        for k, valor in self._resto:
+            if k == clave:
+                valor = _descongelar(valor)
+                if clave == 'semantica' and self._dominio is not None:
+                    valor['dominio'] = DOMINIOS.textos[self._dominio]
+                return valor
+        raise KeyError(clave)
+
+    def __contains__(self, clave) -> bool:
+        if clave == 'categorias' and self._categorias is not None:
+            return True
+        if clave == 'temas' and self._temas is not None:
+            return True
+        return any(k == clave for k, _ in self._resto)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._categorias is not None:
+            yield 'categorias'
+        if self._temas is not None:
+            yield 'temas'
+        for k, _ in self._resto:
+            yield k
+
+    def __len__(self) -> int:
+        return ((self._categorias is not None) + (self._temas is not None)
+            + len(self._resto))
+
+    def a_dict(self) -> dict:
+        """Entrada completa como dict, igual que en el JSON."""
+        return {clave: self[clave] for clave in self}
+
+    def __repr__(self) -> str:
+        return f"EntradaCompacta({self.a_dict()!r})"
+
+def compactar(info):
+    """Convierte una entrada del JSON en EntradaCompacta (deja igual las que ya lo son)."""
+    if isinstance(info, EntradaCompacta) or not isinstance(info, dict):
+        return info
+    return EntradaCompacta(info)
+
+def estado_simbolos() -> tuple:
+    """Textos de las tablas de símbolos, para guardarlos junto a las entradas."""
+    return tuple(tuple(tabla.textos) for tabla in (CATEGORIAS, DOMINIOS, TEMAS))
+
+def adoptar_simbolos(estado: tuple, entradas):
+    """
+    Hace válidos en este proceso los códigos de unas entradas guardadas con
+    estado_simbolos(). Si las tablas ya tenían otros símbolos (otro léxico
+    cargado antes), se traducen los códigos de cada entrada.
+
+    :param estado: resultado de estado_simbolos() al guardar
+    :param entradas: EntradaCompacta guardadas con ese estado
+    """
+    cat, dom, tem = (tabla.adoptar(textos) for tabla, textos
+        in zip((CATEGORIAS, DOMINIOS, TEMAS), estado))
+    if cat is None and dom is None and tem is None:
+        return
+    for entrada in entradas:
+        if not isinstance(entrada, EntradaCompacta):
+            continue
+        if cat is not None and entrada._categorias is not None:
+            entrada._categorias = tuple(cat[c] for c in entrada._categorias)
+        if tem is not None and entrada._temas is not None:
+            entrada._temas = tuple(tem[t] for t in entrada._temas)
+        if dom is not None and entrada._dominio is not None:
+            entrada._dominio = dom[entrada._dominio]
+
+def tamano_profundo(obj, vistos: set = None) -> int:
+    """
+    Bytes ocupados por obj y todo lo que referencia; los objetos compartidos
+    (cadenas internadas, códigos) se cuentan una sola vez.
+    """
+    vistos = set() if vistos is None else vistos
+    pendientes = [obj]
+    total = 0
+    while pendientes:
+        actual = pendientes.pop()
+        if id(actual) in vistos:
+            continue
+        vistos.add(id(actual))
+        total += sys.getsizeof(actual)
+        if isinstance(actual, (dict, Mapping)) and not isinstance(actual, EntradaCompacta):
+            pendientes.extend(actual.keys())
+            pendientes.extend(actual.values())
+        elif isinstance(actual, (list, tuple, set, frozenset)):
+            pendientes.extend(actual)
+        elif isinstance(actual, EntradaCompacta):
+            pendientes.extend((actual._categorias, actual._temas, actual._dominio,
+                actual._resto))
+    return total
+
+def reporte_memoria(palabras: Mapping) -> dict:
+    """
+    Memoria ocupada por las entradas del léxico (sin contar las claves).
+
+    :param palabras: objeto { "word": entrada }
+    :return: palabras, bytes totales y bytes por palabra
+    """
+    vistos = {id(t) for tabla in (CATEGORIAS, DOMINIOS, TEMAS) for t in tabla.textos}
+    total = sum(tamano_profundo(info, vistos) for info in palabras.values())
+    n = len(palabras)
+    return {
+        'palabras': n,
+        'bytes_totales': total,
+        'bytes_por_palabra': total / n if n else 0.0,
+    }
@@ -6,6 +6,7 @@ import random
 from typing import Dict, List
 
 from .grafo_palabras import Grafo
+from .inflexiones import flexionar
 
 class GeneradorGramatical:
     """
@@ -106,51 +107,33 @@ class GeneradorGramatical:
         'plural': ['We', 'They', 'You']
     }
     
+    # Formas de las plantillas -> claves de la tabla de flexiones
+    CLAVES_FORMA = {"base": "base", "3ra": "third", "pasado": "past",
+                    "participio": "participle", "ing": "ing"}
+    
     ADVERBIOS = ["quickly", "slowly", "carefully", "happily", "easily", 
                 "well", "badly", "quietly", "clearly", "regularly"]
     
     def __init__(self, grafo:Grafo):
         self.grafo = grafo
+        self.almacen = grafo.almacen
         if not self.grafo.construido:
             self.grafo.construir()
     
     def _adaptar_verbo(self, verbo_base: str, forma: str) -> str:
         """
-        Adapta un verbo a la forma gramatical correcta.
+        Adapta un verbo a la forma gramatical correcta, con la tabla de
+        flexiones del almacén (irregulares incluidos: go -> went).
         """
         # Si ya está en la forma correcta del vocabulario base
         if forma == "3ra" and verbo_base in self._obtener_todos_verbos_3ra():
             return verbo_base
-        if forma == "base":
+        clave = self.CLAVES_FORMA.get(forma)
+        if clave is None:
             return verbo_base
-        elif forma == "3ra":
-            # Reglas para 3ra persona singular
-            if verbo_base.endswith(('s', 'x', 'z', 'ch', 'sh')):
-                return verbo_base + 'es'
-            elif verbo_base.endswith('y') and len(verbo_base) > 1 and verbo_base[-2] not in 'aeiou':
-                return verbo_base[:-1] + 'ies'
-            else:
-                return verbo_base + 's'
-        elif forma == "ing":
-            # Gerundio
-            if verbo_base.endswith('e'):
-                return verbo_base[:-1] + 'ing'
-            elif verbo_base.endswith('ie'):
-                return verbo_base[:-2] + 'ying'
-            else:
-                return verbo_base + 'ing'
-        elif forma == "pasado":
-            # Pasado simple
-            if verbo_base.endswith('e'):
-                return verbo_base + 'd'
-            elif verbo_base.endswith('y') and len(verbo_base) > 1 and verbo_base[-2] not in 'aeiou':
-                return verbo_base[:-1] + 'ied'
-            else:
-                return verbo_base + 'ed'
-        elif forma == "participio":
-            # Participio pasado (simplificado: igual que pasado)
-            return self._adaptar_verbo(verbo_base, "pasado")
-        return verbo_base
+        if self.almacen is not None:
+            return self.almacen.flexion(verbo_base, clave)
+        return flexionar(verbo_base, clave)
     
     def _obtener_todos_verbos_3ra(self) -> List[str]:
         """Obtiene todos los verbos en 3ra persona de los vocabularios base."""
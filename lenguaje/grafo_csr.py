@@ -0,0 +1,307 @@
+"""
+Adyacencia del grafo en formato CSR (compressed sparse row) sobre ids enteros:
+los vecinos del nodo i son indices[indptr[i]:indptr[i + 1]], sin repetir.
+Dos arrays planos en lugar de un set de cadenas por palabra.
+Cada arista lleva además su tipo de relación (un byte, ver TIPOS) y su peso
+(float32) en arrays paralelos a indices; dentro del tramo de un nodo los
+vecinos van ordenados por (tipo, id), así que los de un tipo son un subtramo
+contiguo. El muestreo ponderado usa tablas alias (Vose) por subtramo.
+El grafo construido se guarda junto al léxico (a_p.grafo), firmado con su
+hash, y se vuelve a leer mientras el léxico no cambie.
+"""
+
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from collections.abc import Mapping
+from itertools import repeat
+from operator import mul
+from typing import Iterator, List, Sequence, Tuple
+
+from .cache_lru import CacheLRU
+from .snapshot_lexico import ruta_derivada
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: sin él se ordena por nodo en Python
+    np = None
+
+EXTENSION = '.grafo'
+# Se sube cuando cambia lo que se guarda del grafo (los .grafo anteriores
+# se ignoran y se reconstruyen)
+FORMATO = 2
+
+# Tipos de relación, de la más fuerte a la más débil (el código es la posición)
+TIPOS = ('sinonimo', 'hiperonimo', 'dominio')
+CODIGO_TIPO = {tipo: i for i, tipo in enumerate(TIPOS)}
+# Peso de cada tipo; si dos palabras se unen por varias relaciones la arista
+# toma el tipo más fuerte y la suma de los pesos
+PESOS = (1.0, 0.5, 0.1)
+
+def ruta_grafo(path_origen: str, variante: str = None) -> str:
+    """
+    Ruta del grafo guardado para un léxico (a_p.json -> a_p.grafo,
+    a_p.lexico -> a_p.lexico.grafo).
+
+    :param path_origen: Dirección del json (o del léxico mapeado)
+    :param variante: firma de la proyección de campos, si la hay
+    """
+    return ruta_derivada(path_origen, EXTENSION, variante)
+
+class AdyacenciaCSR:
+    """
+    Aristas no dirigidas en CSR.
+    - indptr: array('Q') de n + 1 posiciones
+    - indices: array('I') con los ids de los vecinos
+    - tipos: array('B') con el código de TIPOS de cada arista
+    - pesos: array('f') con el peso de cada arista
+    """
+
+    __slots__ = ('indptr', 'indices', 'tipos', 'pesos', '_alias')
+
+    def __init__(self, indptr: array, indices: array, tipos: array = None,
+                pesos: array = None):
+        """
+        Sin tipos ni pesos todas las aristas son del tipo más fuerte.
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.tipos = tipos if tipos is not None else array('B', bytes(len(indices)))
+        self.pesos = pesos if pesos is not None else array('f', [PESOS[0]]) * len(indices)
+        # Tablas alias por subtramo (inicio, fin), calculadas al primer uso
+        self._alias = CacheLRU(4096)
+
+    @classmethod
+    def desde_aristas(cls, n: int, origenes: array, destinos: array,
+                    tipos: array = None) -> 'AdyacenciaCSR':
+        """
+        Construye la adyacencia simétrica de n nodos a partir de una lista de
+        aristas (origenes[k], destinos[k], tipos[k]); quita bucles y une las
+        repetidas (tipo más fuerte, pesos sumados).
+
+        :param n: número de nodos (ids 0..n-1)
+        :param origenes: array('I') de ids
+        :param destinos: array('I') de ids, misma longitud
+        :param tipos: array('B') de códigos de TIPOS (None: todas sinónimo)
+        """
+        if tipos is None:
+            tipos = array('B', bytes(len(origenes)))
+        if np is not None:
+            return cls._desde_aristas_numpy(n, origenes, destinos, tipos)
+        # Una lista de vecinos por (tipo, nodo), en ambos sentidos, como el
+        # antiguo dict de sets; después cada nodo se ordena y se une en C
+        # (set, sorted) y solo las repetidas pasan por Python
+        listas = [[[] for _ in range(n)] for _ in PESOS]
+        for o, d, t in zip(origenes, destinos, tipos):
+            if o != d:
+                por_nodo = listas[t]
+                por_nodo[o].append(d)
+                por_nodo[d].append(o)
+        indptr = array('Q', [0])
+        indices, tipos_csr, pesos = array('I'), array('B'), array('f')
+        unidades = [(array('B', [t]), array('f', [peso]), peso) for t, peso in enumerate(PESOS)]
+        for por_tipo in zip(*listas):
+            vistos = None  # vecinos ya puestos, con un tipo más fuerte
+            for (tipo, unidad, peso), lista in zip(unidades, por_tipo):
+                if not lista:
+                    continue
+                distintos = set(lista)
+                veces = Counter(lista) if len(distintos) < len(lista) else None
+                if vistos is None:
+                    vistos, tramos = distintos, []
+                else:
+                    comunes = vistos & distintos
+                    # Ya puestos con un tipo más fuerte: su peso se suma allí
+                    for d in comunes:
+                        for inicio, fin in tramos:
+                            p = bisect_left(indices, d, inicio, fin)
+                            if p < fin and indices[p] == d:
+                                break
+                        pesos[p] += (veces[d] if veces else 1) * peso
+                    distintos -= comunes
+                    vistos |= distintos
+                orden = sorted(distintos)
+                tramos.append((len(indices), len(indices) + len(orden)))
+                indices.extend(orden)
+                tipos_csr.extend(tipo * len(orden))
+                if veces is None:
+                    pesos.extend(unidad * len(orden))
+                else:
+                    pesos.extend(map(mul, map(veces.__getitem__, orden), repeat(peso)))
+            indptr.append(len(indices))
+        return cls(indptr, indices, tipos_csr, pesos)
+
+    @classmethod
+    def _desde_aristas_numpy(cls, n: int, origenes: array, destinos: array,
+                            tipos: array) -> 'AdyacenciaCSR':
+        o = np.frombuffer(origenes, dtype=np.uint32).astype(np.uint64)
+        d = np.frombuffer(destinos, dtype=np.uint32).astype(np.uint64)
+        t = np.frombuffer(tipos, dtype=np.uint8).astype(np.uint64)
+        distintos = o != d
+        o, d, t = o[distintos], d[distintos], t[distintos]
+        if not len(o):
+            return cls(array('Q', bytes(8 * (n + 1))), array('I'))
+        # Cada arista en los dos sentidos como una clave (origen | destino |
+        # tipo, ids < 2**30): al ordenarlas quedan agrupadas por origen, las
+        # repetidas contiguas y con el tipo más fuerte delante
+        claves = np.concatenate([o << 34 | d << 2 | t, d << 34 | o << 2 | t])
+        claves.sort()
+        pares = claves >> 2
+        grupos = np.flatnonzero(np.concatenate(([True], pares[1:] != pares[:-1])))
+        pesos = np.add.reduceat(np.asarray(PESOS, dtype=np.float32)[claves & 3], grupos)
+        t, pares = claves[grupos] & 3, pares[grupos]
+        origen = pares >> 32
+        # Dentro de cada nodo, por (tipo, destino)
+        claves = origen << 34 | t << 32 | (pares & 0xFFFFFFFF)
+        orden = np.argsort(claves)
+        claves, t, pesos = claves[orden], t[orden].astype(np.uint8), pesos[orden]
+        vecinos = (claves & 0xFFFFFFFF).astype(np.uint32)
+        grado = np.bincount(origen.astype(np.int64), minlength=n)
+        indptr = np.zeros(n + 1, dtype=np.uint64)
+        np.cumsum(grado, out=indptr[1:])
+        return cls(array('Q', indptr.tobytes()), array('I', vecinos.tobytes()),
+                   array('B', t.tobytes()), array('f', pesos.tobytes()))
+
+    def vecinos(self, i: int) -> array:
+        """Ids de los vecinos del nodo i (copia pequeña de su tramo)."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def tramo(self, i: int, tipo: str = None) -> Tuple[int, int]:
+        """
+        Posiciones [inicio, fin) de los vecinos del nodo i en indices; con
+        tipo, solo las de ese tipo de relación (búsqueda binaria en su tramo).
+
+        :raises ValueError: si el tipo no está en TIPOS
+        """
+        inicio, fin = self.indptr[i], self.indptr[i + 1]
+        if tipo is None:
+            return inicio, fin
+        codigo = CODIGO_TIPO.get(tipo)
+        if codigo is None:
+            raise ValueError(f"Tipo de relación desconocido: {tipo}")
+        inicio = bisect_left(self.tipos, codigo, inicio, fin)
+        return inicio, bisect_right(self.tipos, codigo, inicio, fin)
+
+    def muestrear(self, i: int, k: int, rng=random, tipo: str = None) -> List[int]:
+        """
+        Hasta k vecinos del nodo i al azar, sin repetir y en orden aleatorio.
+        Se eligen k posiciones de su tramo (O(k)): el tramo no se copia ni se
+        baraja entero, aunque el nodo tenga miles de vecinos.
+
+        :param rng: generador (random.Random) o el módulo random
+        :param tipo: solo vecinos con ese tipo de relación
+        """
+        inicio, fin = self.tramo(i, tipo)
+        k = min(k, fin - inicio)
+        if k <= 0:
+            return []
+        indices = self.indices
+        return [indices[p] for p in rng.sample(range(inicio, fin), k)]
+
+    def muestrear_ponderado(self, i: int, k: int, rng=random, tipo: str = None) -> List[int]:
+        """
+        Hasta k vecinos del nodo i sin repetir, con probabilidad proporcional
+        al peso de la arista. Cada extracción es O(1) con la tabla alias del
+        tramo (se calcula una vez, O(grado), y se guarda en caché); las
+        repetidas se descartan.
+
+        :param rng: generador (random.Random) o el módulo random
+        :param tipo: solo vecinos con ese tipo de relación
+        """
+        inicio, fin = self.tramo(i, tipo)
+        total = fin - inicio
+        if k <= 0 or total <= 0:
+            return []
+        indices, pesos = self.indices, self.pesos
+        if k >= total:
+            # Todos: en orden aleatorio ponderado (Efraimidis-Spirakis)
+            orden = sorted(range(inicio, fin), key=lambda p: rng.random() ** (1.0 / pesos[p]),
+                           reverse=True)
+            return [indices[p] for p in orden]
+        probabilidad, alias = self._alias.obtener(
+            (inicio, fin), lambda: tabla_alias(pesos[inicio:fin]))
+        elegidas = {}
+        intentos = 4 * k + 16
+        while len(elegidas) < k and intentos:
+            j = int(rng.random() * total)
+            elegidas[j if rng.random() < probabilidad[j] else alias[j]] = None
+            intentos -= 1
+        if len(elegidas) < k:
+            # Pesos muy concentrados: el resto se completa al azar
+            resto = [j for j in range(total) if j not in elegidas]
+            elegidas.update(dict.fromkeys(rng.sample(resto, k - len(elegidas))))
+        return [indices[inicio + j] for j in elegidas]
+
+    def grado(self, i: int) -> int:
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def num_aristas(self) -> int:
+        """Aristas no dirigidas (cada una aparece dos veces en indices)."""
+        return len(self.indices) // 2
+
+    def bytes(self) -> int:
+        """Memoria de los arrays."""
+        return sum(len(a) * a.itemsize for a in (self.indptr, self.indices, self.tipos, self.pesos))
+
+def tabla_alias(pesos: Sequence[float]) -> Tuple[array, array]:
+    """
+    Tabla alias de Vose para elegir una posición con probabilidad
+    proporcional a su peso en O(1): se toma j uniforme y se devuelve j con
+    probabilidad[j] o alias[j] en otro caso.
+
+    :param pesos: pesos positivos
+    :return: (probabilidad array('f'), alias array('I'))
+    """
+    total = len(pesos)
+    suma = sum(pesos)
+    escalados = [p * total / suma for p in pesos]
+    probabilidad = array('f', [1.0]) * total
+    alias = array('I', range(total))
+    pequenos = [j for j, e in enumerate(escalados) if e < 1.0]
+    grandes = [j for j, e in enumerate(escalados) if e >= 1.0]
+    while pequenos and grandes:
+        menor, mayor = pequenos.pop(), grandes.pop()
+        probabilidad[menor] = escalados[menor]
+        alias[menor] = mayor
+        escalados[mayor] -= 1.0 - escalados[menor]
+        (pequenos if escalados[mayor] < 1.0 else grandes).append(mayor)
+    # Los que quedan (por redondeo) se eligen siempre a sí mismos
+    return probabilidad, alias
+
+class VistaAdyacencia(Mapping):
+    """
+    Vista { palabra: frozenset(vecinos) } sobre la adyacencia CSR, para el
+    código que usaba Grafo.grafo como dict de sets. Cada acceso traduce los
+    ids del tramo del nodo; no se guarda nada por palabra.
+    """
+
+    def __init__(self, nodos: Sequence[str], ids: dict, adyacencia: AdyacenciaCSR):
+        self._nodos = nodos
+        self._ids = ids
+        self._adyacencia = adyacencia
+
+    def __getitem__(self, palabra: str) -> frozenset:
+        i = self._ids[palabra]
+        return frozenset(self._nodos[j] for j in self._adyacencia.vecinos(i))
+
+    def __contains__(self, palabra) -> bool:
+        return palabra in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._nodos)
+
+    def __len__(self) -> int:
+        return len(self._nodos)
+
+def tabla_nodos(palabras) -> Tuple[Tuple[str, ...], dict]:
+    """
+    Tabla de nodos: tupla id -> palabra y dict palabra -> id.
+
+    :param palabras: palabras del léxico, en el orden en que reciben id
+    """
+    nodos = tuple(palabras)
+    return nodos, dict(zip(nodos, range(len(nodos))))
@@ -2,20 +2,42 @@
 Grafo que se construye DIRECTAMENTE desde el JSON, sin intermediarios.
 """
 
-import json
 import random
+from array import array
 from typing import Dict, List, Set, Optional
 
+from .almacen_lexico import AlmacenLexico
+from .grafo_csr import (AdyacenciaCSR, VistaAdyacencia, CODIGO_TIPO, FORMATO,
+    ruta_grafo, tabla_nodos)
+from .snapshot_lexico import escribir_snapshot, leer_snapshot
+from .proyeccion import como_proyeccion
+
 class Grafo:
     """
     Grafo semántico construido DIRECTAMENTE desde el archivo JSON.
     Control total sobre los datos y estructura.
     """
     
-    def __init__(self, json_path: str):
-        self.json_path = json_path
+    def __init__(self, json_path: str = None, almacen: AlmacenLexico = None,
+                proyeccion=None):
+        """
+        :param json_path: ruta del JSON (se reutiliza el almacén si ya se cargó)
+        :param almacen: almacén léxico ya cargado, compartido con Diccionario
+        :param proyeccion: campos a conservar al cargar desde json_path
+        (lista de rutas o ProyeccionCampos, ver lenguaje.proyeccion)
+        """
+        if json_path is None and almacen is None:
+            raise ValueError("Se necesita json_path o almacen")
+        self.json_path = json_path if json_path is not None else almacen.path
+        self.almacen = almacen
+        self.proyeccion = como_proyeccion(proyeccion)
         self.data = {}
-        self.grafo = {}  # palabra -> {palabras relacionadas}
+        self.grafo = {}  # palabra -> {palabras relacionadas} (vista sobre la CSR)
+        self.nodos = ()  # id -> palabra
+        self.ids = {}  # palabra -> id
+        self.adyacencia = AdyacenciaCSR(array('Q', [0]), array('I'))
+        self._origenes = self._destinos = self._tipos = None  # aristas pendientes al construir
+        self._reservas = {}  # (categoría | None, dominio | None) -> tupla de palabras
         self.palabras_por_categoria = {}
         self.palabras_por_dominio = {}
         self.construido = False
@@ -24,23 +46,58 @@ class Grafo:
         self._cargar_json()
     
     def _cargar_json(self):
-        """Carga el JSON directamente desde el archivo."""
-        print(f"Cargando JSON desde {self.json_path}...")
-        with open(self.json_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
-        
-        if 'palabras' not in self.data:
-            raise ValueError("JSON debe tener clave 'palabras'")
+        """Carga el JSON (o toma el almacén ya cargado)."""
+        if self.almacen is None:
+            print(f"Cargando JSON desde {self.json_path}...")
+            self.almacen = AlmacenLexico.compartido(self.json_path, proyeccion=self.proyeccion)
+        self.data = self.almacen.data
         
         total = len(self.data['palabras'])
         print(f"✓ JSON cargado: {total} palabras")
     
-    def construir(self):
-        """Construye el grafo directamente desde los datos del JSON."""
-        print("Construyendo grafo desde JSON...")
+    def construir(self, usar_guardado: bool = True):
+        """
+        Construye el grafo directamente desde los datos del JSON.
+        Si junto al léxico hay un grafo guardado para el mismo contenido
+        (a_p.grafo, ver grafo_csr.ruta_grafo) se lee en lugar de construirlo;
+        el que se construye se guarda para el siguiente arranque.
+
+        :param usar_guardado: False fuerza la construcción desde el JSON
+        """
+        ruta, firma = self._ruta_guardado()
+        if usar_guardado and ruta and self._cargar_guardado(ruta, firma):
+            print(f"✓ Grafo cargado de {ruta}: {len(self.nodos)} nodos, "
+                  f"{self.adyacencia.num_aristas()} conexiones")
+        else:
+            print("Construyendo grafo desde JSON...")
+            self._construir_desde_datos()
+            print(f"✓ Grafo construido desde JSON: {len(self.nodos)} nodos, "
+                  f"{self.adyacencia.num_aristas()} conexiones")
+            if ruta:
+                try:
+                    self._guardar(ruta, firma)
+                except OSError as e:
+                    print(f"No se pudo escribir el grafo: {e}")
+        self.grafo = VistaAdyacencia(self.nodos, self.ids, self.adyacencia)
+        self._preparar_reservas()
+        self.construido = True
         
+        # Mostrar estadísticas
+        print("\n ESTADÍSTICAS DEL GRAFO:")
+        print(f"  Sustantivos: {len(self.palabras_por_categoria['sustantivo'])}")
+        print(f"  Verbos: {len(self.palabras_por_categoria['verbo'])}")
+        print(f"  Adjetivos: {len(self.palabras_por_categoria['adjetivo'])}")
+        print(f"  Adverbios: {len(self.palabras_por_categoria['adverbio'])}")
+        
+        for dominio in self.palabras_por_dominio:
+            sust = len(self.palabras_por_dominio[dominio]['sustantivo'])
+            verb = len(self.palabras_por_dominio[dominio]['verbo'])
+            adj = len(self.palabras_por_dominio[dominio]['adjetivo'])
+            print(f"  {dominio.capitalize()}: {sust}sust, {verb}verb, {adj}adj")
+    
+    def _construir_desde_datos(self):
+        """Nodos, índices por categoría y dominio y aristas a partir del léxico."""
         # Inicializar estructuras
-        self.grafo = {}
         self.palabras_por_categoria = {
             'sustantivo': [],
             'verbo': [],
@@ -55,32 +112,25 @@ class Grafo:
             'general': {'sustantivo': [], 'verbo': [], 'adjetivo': []}
         }
         
-        # PRIMERO: Indexar todas las palabras
+        # PRIMERO: Indexar todas las palabras (índices precalculados del almacén)
         palabras_list = list(self.data['palabras'].keys())
+        self.nodos, self.ids = tabla_nodos(palabras_list)
+        self._origenes, self._destinos, self._tipos = array('I'), array('I'), array('B')
+        indices = self.almacen.indices
+        for cat in self.palabras_por_categoria:
+            self.palabras_por_categoria[cat] = list(indices['categoria'].get(cat, ()))
+        for dominio, por_categoria in self.palabras_por_dominio.items():
+            for cat in por_categoria:
+                por_categoria[cat] = list(indices['dominio_categoria'].get((dominio, cat), ()))
+        # Ids de las primeras palabras de cada (dominio, categoría): a ellas
+        # se conecta el resto de palabras del dominio
+        primeras_dominio = {(dominio, cat): array('I', map(self.ids.__getitem__, palabras[:10]))
+                            for dominio, por_categoria in self.palabras_por_dominio.items()
+                            for cat, palabras in por_categoria.items()}
         
-        for palabra in palabras_list:
-            info = self.data['palabras'][palabra]
-            
-            # 1. Inicializar nodo en el grafo
-            if palabra not in self.grafo:
-                self.grafo[palabra] = set()
-            
-            # 2. Indexar por categoría gramatical
-            categorias = info.get('categorias', [])
-            for cat in categorias:
-                if cat in self.palabras_por_categoria:
-                    self.palabras_por_categoria[cat].append(palabra)
-            
-            # 3. Indexar por dominio semántico
-            dominio = info.get('semantica', {}).get('dominio', 'general')
-            if dominio in self.palabras_por_dominio:
-                for cat in categorias:
-                    if cat in ['sustantivo', 'verbo', 'adjetivo']:
-                        self.palabras_por_dominio[dominio][cat].append(palabra)
-        
-        # SEGUNDO: Construir conexiones semánticas
-        conexiones_totales = 0
-        
+        # SEGUNDO: Construir conexiones semánticas (solo entre nodos del grafo:
+        # con un léxico fragmentado, las relaciones pueden apuntar a palabras
+        # de fragmentos sin cargar)
         for palabra in palabras_list:
             info = self.data['palabras'][palabra]
             
@@ -91,23 +141,17 @@ class Grafo:
             semantica = info['semantica']
             relaciones = semantica.get('relaciones', {})
             
-            # Asegurar entrada en el grafo
-            if palabra not in self.grafo:
-                self.grafo[palabra] = set()
-            
             # 1. Conexiones por sinónimos (las más fuertes)
             sinonimos = relaciones.get('sinonimos', [])
             for sinonimo in sinonimos[:5]:  # Limitar a 5
-                if sinonimo in self.data['palabras']:
-                    self._agregar_conexion(palabra, sinonimo)
-                    conexiones_totales += 1
+                if sinonimo in self.ids:
+                    self._agregar_conexion(palabra, sinonimo, 'sinonimo')
             
             # 2. Conexiones por hiperónimos (relaciones jerárquicas)
             hiperonimos = relaciones.get('hypernyms', [])
             for hiperonimo in hiperonimos[:3]:  # Limitar a 3
-                if hiperonimo in self.data['palabras']:
-                    self._agregar_conexion(palabra, hiperonimo)
-                    conexiones_totales += 1
+                if hiperonimo in self.ids:
+                    self._agregar_conexion(palabra, hiperonimo, 'hiperonimo')
             
             # 3. Conexiones por dominio compartido (mismo tema)
             dominio = semantica.get('dominio', 'general')
@@ -115,38 +159,112 @@ class Grafo:
                 # Tomar algunas palabras del mismo dominio (misma categoría)
                 categorias_palabra = info.get('categorias', [])
                 for cat in categorias_palabra:
-                    if cat in ['sustantivo', 'verbo', 'adjetivo']:
-                        palabras_mismo_dominio = self.palabras_por_dominio[dominio][cat]
-                        for otra in palabras_mismo_dominio[:10]:  # Limitar
-                            if otra != palabra:
-                                self._agregar_conexion(palabra, otra)
-                                conexiones_totales += 1
+                    primeras = primeras_dominio.get((dominio, cat))
+                    if primeras:
+                        # La propia palabra, si está entre ellas, la descarta desde_aristas
+                        self._agregar_conexiones(palabra, primeras, 'dominio')
         
-        self.construido = True
-        print(f"✓ Grafo construido desde JSON: {len(self.grafo)} nodos, {conexiones_totales} conexiones")
+        # Las aristas (repetidas y en ambos sentidos) pasan a CSR de una vez
+        self.adyacencia = AdyacenciaCSR.desde_aristas(len(self.nodos), self._origenes,
+                                                     self._destinos, self._tipos)
+        self._origenes = self._destinos = self._tipos = None
+    
+    def _preparar_reservas(self):
+        """
+        Tuplas inmutables de las que obtener_palabra_aleatoria elige sin
+        construir listas: todas las palabras, cada categoría, cada dominio
+        (sus tres categorías sin repetir) y cada par (categoría, dominio) con
+        el mismo criterio que obtener_palabras_categoria.
+        """
+        reservas = {(None, None): self.nodos}
+        for cat in self.palabras_por_categoria:
+            reservas[(cat, None)] = tuple(self.palabras_por_categoria[cat])
+        for dominio, por_categoria in self.palabras_por_dominio.items():
+            reservas[(None, dominio)] = tuple(dict.fromkeys(
+                palabra for cat in ['sustantivo', 'verbo', 'adjetivo']
+                for palabra in por_categoria.get(cat, ())))
+            for cat, palabras in self.palabras_por_categoria.items():
+                lista = self.obtener_palabras_categoria(cat, dominio)
+                # Sin lista propia del dominio (adverbios) se comparte la de la categoría
+                reservas[(cat, dominio)] = (reservas[(cat, None)] if lista is palabras
+                                            else tuple(lista))
+        self._reservas = reservas
+    
+    # ---------- persistencia ----------
+    def _ruta_guardado(self):
+        """
+        Ruta del grafo guardado y firma del léxico de origen, la que el
+        almacén registró al cargarlo ((None, None) si no viene de un archivo
+        o si el almacén no persiste sus derivados: el grafo guardado es el
+        del léxico completo y no el de los fragmentos cargados).
+        """
+        path = self.almacen.path
+        if not path or not self.almacen.persistir_indices:
+            return None, None
+        try:
+            firma = self.almacen.firma_origen
+        except OSError:
+            return None, None
+        proyeccion = self.almacen.proyeccion
+        return ruta_grafo(path, proyeccion.firma() if proyeccion is not None else None), firma
+    
+    def _guardar(self, ruta: str, firma: tuple):
+        """
+        Guarda nodos, aristas (con tipos y pesos) y palabras por categoría y
+        dominio (como ids) firmados con el léxico de origen.
+        """
+        ids = self.ids
+        contenido = {
+            'formato': FORMATO,
+            'nodos': self.nodos,
+            'indptr': self.adyacencia.indptr,
+            'indices': self.adyacencia.indices,
+            'tipos': self.adyacencia.tipos,
+            'pesos': self.adyacencia.pesos,
+            'categorias': {cat: array('I', map(ids.__getitem__, palabras))
+                           for cat, palabras in self.palabras_por_categoria.items()},
+            'dominios': {dominio: {cat: array('I', map(ids.__getitem__, palabras))
+                                   for cat, palabras in por_categoria.items()}
+                         for dominio, por_categoria in self.palabras_por_dominio.items()},
+        }
+        escribir_snapshot(ruta, firma, contenido)
+    
+    def _cargar_guardado(self, ruta: str, firma: tuple) -> bool:
+        """
+        Lee el grafo guardado si sigue siendo válido para el léxico.
         
-        # Mostrar estadísticas
-        print("\n ESTADÍSTICAS DEL GRAFO:")
-        print(f"  Sustantivos: {len(self.palabras_por_categoria['sustantivo'])}")
-        print(f"  Verbos: {len(self.palabras_por_categoria['verbo'])}")
-        print(f"  Adjetivos: {len(self.palabras_por_categoria['adjetivo'])}")
-        print(f"  Adverbios: {len(self.palabras_por_categoria['adverbio'])}")
+        :return: False si no existe, está desactualizado o es de otro formato
+        """
+        contenido = leer_snapshot(ruta, self.almacen.path, firma)
+        if not contenido or contenido.get('formato') != FORMATO:
+            return False
+        self.nodos, self.ids = tabla_nodos(contenido['nodos'])
+        self.adyacencia = AdyacenciaCSR(contenido['indptr'], contenido['indices'],
+                                        contenido['tipos'], contenido['pesos'])
+        nodos = self.nodos
+        self.palabras_por_categoria = {cat: list(map(nodos.__getitem__, ids))
+                                       for cat, ids in contenido['categorias'].items()}
+        self.palabras_por_dominio = {dominio: {cat: list(map(nodos.__getitem__, ids))
+                                               for cat, ids in por_categoria.items()}
+                                     for dominio, por_categoria in contenido['dominios'].items()}
+        return True
+    
+    def _agregar_conexion(self, palabra1: str, palabra2: str, tipo: str = 'dominio'):
+        """
+        Agrega conexión bidireccional entre dos palabras del léxico (solo
+        durante construir(): se anota la arista y la CSR se arma al final).
         
-        for dominio in self.palabras_por_dominio:
-            sust = len(self.palabras_por_dominio[dominio]['sustantivo'])
-            verb = len(self.palabras_por_dominio[dominio]['verbo'])
-            adj = len(self.palabras_por_dominio[dominio]['adjetivo'])
-            print(f"  {dominio.capitalize()}: {sust}sust, {verb}verb, {adj}adj")
+        :param tipo: tipo de relación (ver grafo_csr.TIPOS); fija su peso
+        """
+        self._origenes.append(self.ids[palabra1])
+        self._destinos.append(self.ids[palabra2])
+        self._tipos.append(CODIGO_TIPO[tipo])
     
-    def _agregar_conexion(self, palabra1: str, palabra2: str):
-        """Agrega conexión bidireccional entre dos palabras."""
-        if palabra1 not in self.grafo:
-            self.grafo[palabra1] = set()
-        if palabra2 not in self.grafo:
-            self.grafo[palabra2] = set()
-        
-        self.grafo[palabra1].add(palabra2)
-        self.grafo[palabra2].add(palabra1)
+    def _agregar_conexiones(self, palabra: str, otras: array, tipo: str):
+        """Como _agregar_conexion, con varias palabras (por id) de una vez."""
+        self._origenes.extend(array('I', [self.ids[palabra]]) * len(otras))
+        self._destinos.extend(otras)
+        self._tipos.extend(array('B', [CODIGO_TIPO[tipo]]) * len(otras))
     
     def obtener_palabras_categoria(self, categoria: str, dominio: str = None) -> List[str]:
         """
@@ -162,38 +280,41 @@ class Grafo:
         
         return self.palabras_por_categoria[categoria]
     
-    def obtener_vecinos(self, palabra: str, max_vecinos: int = 10) -> List[str]:
-        """Obtiene palabras relacionadas con la dada."""
+    def obtener_vecinos(self, palabra: str, max_vecinos: int = 10,
+                        semilla: int = None, tipo: str = None,
+                        ponderado: bool = False) -> List[str]:
+        """
+        Obtiene palabras relacionadas con la dada (hasta max_vecinos, al azar).
+        El coste es O(max_vecinos) aunque la palabra tenga miles de vecinos.
+        
+        :param semilla: semilla para repetir la misma selección (None usa
+        el generador global de random)
+        :param tipo: solo vecinos por esa relación ('sinonimo', 'hiperonimo'
+        o 'dominio')
+        :param ponderado: elegir según el peso de la arista (los sinónimos
+        antes que los vecinos genéricos del dominio)
+        :raises ValueError: si el tipo de relación no existe
+        """
         if not self.construido:
             self.construir()
         
-        if palabra not in self.grafo:
+        i = self.ids.get(palabra)
+        if i is None:
             return []
         
-        vecinos = list(self.grafo[palabra])
-        random.shuffle(vecinos)
-        return vecinos[:max_vecinos]
+        rng = random.Random(semilla) if semilla is not None else random
+        muestrear = self.adyacencia.muestrear_ponderado if ponderado else self.adyacencia.muestrear
+        return list(map(self.nodos.__getitem__, muestrear(i, max_vecinos, rng, tipo)))
     
     def obtener_palabra_aleatoria(self, categoria: str = None, dominio: str = None) -> Optional[str]:
         """
         Obtiene una palabra aleatoria, filtrada por categoría y/o dominio.
+        Elige en O(1) de las tuplas preparadas al construir el grafo.
         """
-        if categoria and dominio:
-            palabras = self.obtener_palabras_categoria(categoria, dominio)
-        elif categoria:
-            palabras = self.obtener_palabras_categoria(categoria)
-        elif dominio:
-            # Obtener todas las palabras del dominio
-            if dominio in self.palabras_por_dominio:
-                todas = []
-                for cat in ['sustantivo', 'verbo', 'adjetivo']:
-                    todas.extend(self.palabras_por_dominio[dominio][cat])
-                palabras = list(set(todas))
-            else:
-                palabras = []
-        else:
-            # Todas las palabras
-            palabras = list(self.grafo.keys())
+        palabras = self._reservas.get((categoria or None, dominio or None))
+        if palabras is None and categoria and dominio:
+            # Dominio desconocido: como en obtener_palabras_categoria, solo la categoría
+            palabras = self._reservas.get((categoria, None))
         
         if not palabras:
             return None
@@ -202,10 +323,10 @@ class Grafo:
     
     def verificar_categoria(self, palabra: str, categoria: str) -> bool:
         """Verifica si una palabra pertenece a cierta categoría."""
-        if palabra not in self.data['palabras']:
+        info = self.data['palabras'].get(palabra)
+        if info is None:
             return False
         
-        info = self.data['palabras'][palabra]
         categorias = info.get('categorias', [])
         return categoria in categorias
     
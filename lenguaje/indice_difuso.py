@@ -0,0 +1,150 @@
+"""
+Índice difuso sobre las claves del léxico para sugerencias tipo
+"¿quisiste decir...?" (recieve -> receive) sin recorrer todas las palabras.
+
+Sigue la idea de SymSpell: al construir, de cada palabra se generan los
+borrados de hasta `distancia_maxima` caracteres de su prefijo; al buscar se
+generan los borrados de la consulta y se cruzan. Los candidatos se confirman
+con la distancia de Levenshtein acotada. Para que ocupe poco, cada borrado se
+guarda como un entero de 64 bits (crc32 del borrado << 32 | id de palabra) en
+un array ordenado, sin cadenas ni dicts por borrado.
+"""
+
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Sequence, Set, Tuple
+
+from .analizador import Analizador
+from .snapshot_lexico import escribir_snapshot, leer_snapshot, firma_archivo, ruta_derivada
+
+EXTENSION = '.difuso'
+_CUBETAS = 256
+
+def ruta_indice_difuso(path_origen: str) -> str:
+    """
+    Ruta del índice difuso asociado al léxico (a_p.json -> a_p.difuso,
+    a_p.lexico -> a_p.lexico.difuso).
+
+    :param path_origen: Dirección del json (o del léxico mapeado)
+    """
+    return ruta_derivada(path_origen, EXTENSION)
+
+def _borrados(texto: str, distancia: int) -> Set[str]:
+    """El texto y todas las variantes con hasta `distancia` caracteres borrados."""
+    resultado = {texto}
+    frontera = {texto}
+    for _ in range(distancia):
+        siguiente = set()
+        for t in frontera:
+            for i in range(len(t)):
+                siguiente.add(t[:i] + t[i + 1:])
+        siguiente -= resultado
+        resultado |= siguiente
+        frontera = siguiente
+    return resultado
+
+def _hash(texto: str) -> int:
+    return zlib.crc32(texto.encode('utf-8'))
+
+class IndiceDifuso:
+    """
+    Búsqueda de las palabras del léxico a distancia de edición <= k.
+    """
+
+    def __init__(self, palabras: Sequence[str], claves: array,
+                distancia_maxima: int = 2, longitud_prefijo: int = 7):
+        """
+        :param palabras: palabras indexadas (el id es la posición)
+        :param claves: array('Q') ordenado de (hash del borrado << 32 | id)
+        :param distancia_maxima: k máximo admitido en buscar()
+        :param longitud_prefijo: caracteres iniciales de los que se generan borrados
+        """
+        self.palabras = palabras
+        self.claves = claves
+        self.distancia_maxima = distancia_maxima
+        self.longitud_prefijo = longitud_prefijo
+
+    @classmethod
+    def construir(cls, palabras: Iterable[str], distancia_maxima: int = 2,
+                longitud_prefijo: int = 7) -> 'IndiceDifuso':
+        """
+        :param palabras: claves del léxico (en minúsculas)
+        :param distancia_maxima: k máximo admitido en buscar()
+        :param longitud_prefijo: caracteres iniciales de los que se generan borrados
+        """
+        palabras = tuple(palabras)
+        # Cubetas por los 8 bits altos del hash: se ordenan por separado y
+        # concatenadas quedan ordenadas (no hace falta una lista enorme)
+        cubetas = [array('Q') for _ in range(_CUBETAS)]
+        for id_palabra, palabra in enumerate(palabras):
+            for borrado in _borrados(palabra[:longitud_prefijo], distancia_maxima):
+                h = _hash(borrado)
+                cubetas[h >> 24].append(h << 32 | id_palabra)
+        claves = array('Q')
+        for cubeta in cubetas:
+            claves.extend(sorted(cubeta))
+            del cubeta[:]
+        return cls(palabras, claves, distancia_maxima, longitud_prefijo)
+
+    def buscar(self, palabra: str, k: int = None, limite: int = 5) -> List[Tuple[str, int]]:
+        """
+        Palabras a distancia de Levenshtein <= k, de la más cercana a la más lejana.
+
+        :param palabra: texto escrito por el usuario
+        :param k: distancia máxima (por defecto, la del índice; no puede superarla)
+        :param limite: número máximo de resultados
+        :return: lista de (palabra, distancia)
+        """
+        k = self.distancia_maxima if k is None else min(k, self.distancia_maxima)
+        palabra = palabra.strip().lower()
+        if not palabra:
+            return []
+        vistos = set()
+        resultados = []
+        claves = self.claves
+        for borrado in _borrados(palabra[:self.longitud_prefijo], k):
+            h = _hash(borrado)
+            i = bisect_left(claves, h << 32)
+            while i < len(claves) and claves[i] >> 32 == h:
+                id_palabra = claves[i] & 0xFFFFFFFF
+                i += 1
+                if id_palabra in vistos:
+                    continue
+                vistos.add(id_palabra)
+                candidata = self.palabras[id_palabra]
+                if abs(len(candidata) - len(palabra)) > k:
+                    continue
+                d = Analizador.distancia_levenshtein_acotada(palabra, candidata, k)
+                if d <= k:
+                    resultados.append((candidata, d))
+        resultados.sort(key=lambda r: (r[1], r[0]))
+        return resultados[:limite]
+
+    def __len__(self) -> int:
+        return len(self.palabras)
+
+    # ---------- persistencia ----------
+    def guardar(self, path: str, path_origen: str, firma: tuple = None):
+        """
+        Guarda el índice firmado con el léxico de origen.
+
+        :param path: archivo de destino (ver ruta_indice_difuso)
+        :param path_origen: léxico del que salen las palabras
+        :param firma: firma_archivo(path_origen) si ya se calculó
+        """
+        escribir_snapshot(path, firma or firma_archivo(path_origen), (self.palabras,
+            self.claves, self.distancia_maxima, self.longitud_prefijo))
+
+    @classmethod
+    def cargar(cls, path: str, path_origen: str, firma: tuple = None):
+        """
+        Lee el índice si sigue siendo válido para el léxico de origen.
+
+        :param firma: firma_archivo(path_origen) si ya se calculó
+        :return: IndiceDifuso o None si no existe o está desactualizado
+        """
+        contenido = leer_snapshot(path, path_origen, firma)
+        if contenido is None:
+            return None
+        return cls(*contenido)
@@ -0,0 +1,182 @@
+"""
+Claves fonéticas (estilo Metaphone) de las palabras del léxico e índice
+clave -> palabras, para reconocer faltas "que suenan igual" ("nolege" ->
+"knowledge", "fone" -> "phone") con una sola búsqueda en un dict, sin
+comparar distancias contra muchas candidatas.
+
+Las reglas siguen el Metaphone original de L. Philips simplificado: se
+conserva la vocal inicial, las demás vocales se omiten y los grupos de
+consonantes con la misma pronunciación dan el mismo código
+(PH -> F, CK -> K, DGE -> J, TH -> 0, KN- -> N...).
+"""
+
+from itertools import groupby
+from typing import Dict, Iterable, Tuple
+
+from .snapshot_lexico import escribir_snapshot, leer_snapshot, firma_archivo, ruta_derivada
+
+EXTENSION = '.fonetico'
+VOCALES = frozenset('aeiou')
+_FRONTALES = frozenset('eiy')
+# Inicios con la primera letra muda
+_INICIOS_MUDOS = ('ae', 'gn', 'kn', 'pn', 'wr')
+
+def ruta_indice_fonetico(path_origen: str) -> str:
+    """
+    Ruta del índice fonético asociado al léxico (a_p.json -> a_p.fonetico,
+    a_p.lexico -> a_p.lexico.fonetico).
+
+    :param path_origen: Dirección del json (o del léxico mapeado)
+    """
+    return ruta_derivada(path_origen, EXTENSION)
+
+def clave_fonetica(palabra: str) -> str:
+    """
+    Código fonético de una palabra inglesa ('' si no tiene letras).
+
+    :param palabra: palabra o respuesta del usuario
+    """
+    letras = [c for c in palabra.lower() if 'a' <= c <= 'z']
+    if not letras:
+        return ''
+    texto = ''.join(letras)
+    if texto.startswith(_INICIOS_MUDOS):
+        texto = texto[1:]
+    elif texto[0] == 'x':
+        texto = 's' + texto[1:]
+    elif texto.startswith('wh'):
+        texto = 'w' + texto[2:]
+    # Letras dobles cuentan una vez (salvo cc: "accept" -> AKSPT)
+    texto = ''.join(c for i, c in enumerate(texto)
+                    if i == 0 or c != texto[i - 1] or c == 'c')
+
+    codigo = []
+    n = len(texto)
+    for i, c in enumerate(texto):
+        anterior = texto[i - 1] if i > 0 else ''
+        siguiente = texto[i + 1] if i + 1 < n else ''
+        despues = texto[i + 2] if i + 2 < n else ''
+        if c in VOCALES:
+            if i == 0:
+                codigo.append(c.upper())
+        elif c == 'b':
+            if not (anterior == 'm' and i == n - 1):
+                codigo.append('B')
+        elif c == 'c':
+            if siguiente == 'i' and despues == 'a':
+                codigo.append('X')
+            elif siguiente == 'h':
+                codigo.append('K' if anterior == 's' else 'X')
+            elif siguiente in _FRONTALES:
+                if anterior != 's':
+                    codigo.append('S')
+            else:
+                codigo.append('K')
+        elif c == 'd':
+            codigo.append('J' if siguiente == 'g' and despues in _FRONTALES else 'T')
+        elif c == 'g':
+            # gh mudo salvo ante vocal ("night", "through"; no "ghost")
+            if siguiente == 'h' and despues not in VOCALES:
+                continue
+            if siguiente == 'n' and (i + 2 == n or texto[i + 2:] == 'ed'):
+                continue
+            if anterior == 'd' and siguiente in _FRONTALES:
+                continue
+            codigo.append('J' if siguiente in _FRONTALES else 'K')
+        elif c == 'h':
+            if anterior in 'csptg' and anterior:
+                continue
+            if anterior in VOCALES and siguiente not in VOCALES:
+                continue
+            codigo.append('H')
+        elif c == 'k':
+            if anterior != 'c':
+                codigo.append('K')
+        elif c == 'p':
+            codigo.append('F' if siguiente == 'h' else 'P')
+        elif c == 'q':
+            codigo.append('K')
+        elif c == 's':
+            if siguiente == 'h' or (siguiente == 'i' and despues in ('o', 'a')):
+                codigo.append('X')
+            else:
+                codigo.append('S')
+        elif c == 't':
+            if siguiente == 'i' and despues in ('o', 'a'):
+                codigo.append('X')
+            elif siguiente == 'h':
+                codigo.append('0')
+            elif not (siguiente == 'c' and despues == 'h'):
+                codigo.append('T')
+        elif c == 'v':
+            codigo.append('F')
+        elif c in 'wy':
+            if siguiente in VOCALES:
+                codigo.append(c.upper())
+        elif c == 'x':
+            codigo.append('KS')
+        elif c == 'z':
+            codigo.append('S')
+        else:
+            # f, j, l, m, n, r
+            codigo.append(c.upper())
+    return ''.join(codigo)
+
+class IndiceFonetico:
+    """
+    Código fonético -> palabras del léxico con ese código.
+    """
+
+    def __init__(self, grupos: Dict[str, Tuple[str, ...]]):
+        """
+        :param grupos: { código: (palabras...) }
+        """
+        self.grupos = grupos
+
+    @classmethod
+    def construir(cls, palabras: Iterable[str]) -> 'IndiceFonetico':
+        """
+        Calcula los códigos en una sola pasada y agrupa ordenando por código
+        (sin listas por código que crezcan palabra a palabra).
+
+        :param palabras: claves del léxico
+        """
+        palabras = tuple(palabras)
+        codigos = list(map(clave_fonetica, palabras))
+        orden = sorted(range(len(palabras)), key=codigos.__getitem__)
+        grupos = {}
+        for codigo, ids in groupby(orden, key=codigos.__getitem__):
+            if codigo:
+                grupos[codigo] = tuple(palabras[i] for i in ids)
+        return cls(grupos)
+
+    def buscar(self, palabra: str) -> Tuple[str, ...]:
+        """Palabras del léxico que suenan como la dada (mismo código)."""
+        return self.grupos.get(clave_fonetica(palabra), ())
+
+    def __len__(self) -> int:
+        return sum(len(g) for g in self.grupos.values())
+
+    # ---------- persistencia ----------
+    def guardar(self, path: str, path_origen: str, firma: tuple = None):
+        """
+        Guarda el índice firmado con el léxico de origen.
+
+        :param path: archivo de destino (ver ruta_indice_fonetico)
+        :param path_origen: léxico del que salen las palabras
+        :param firma: firma_archivo(path_origen) si ya se calculó
+        """
+        escribir_snapshot(path, firma or firma_archivo(path_origen), self.grupos)
+
+    @classmethod
+    def cargar(cls, path: str, path_origen: str, firma: tuple = None):
+        """
+        Lee el índice si sigue siendo válido para el léxico de origen.
+
+        :param firma: firma_archivo(path_origen) si ya se calculó
+        :return: IndiceFonetico o None si no existe o está desactualizado
+        """
+        contenido = leer_snapshot(path, path_origen, firma)
+        if contenido is None:
+            return None
+        return cls(contenido)
@@ -0,0 +1,188 @@
+"""
+Formas flexionadas de las palabras del léxico (plural, 3ª persona, pasado,
+participio, -ing). Las formas de la entrada (`formas`) tienen prioridad;
+después van las irregulares conocidas y las que falten se generan con
+reglas regulares.
+Con ellas ConstructorIndices construye una vez, para todo el léxico:
+- 'flexiones': palabra -> tupla con sus formas en el orden de CLAVES
+- 'lema': índice inverso forma -> lemas ('studies' -> 'study')
+Analizador y GeneradorGramatical consultan la misma tabla (flexion()), así
+que no pueden discrepar.
+"""
+
+from typing import Iterator, Optional, Tuple
+
+VOCALES = 'aeiou'
+
+# Orden de las formas en cada tupla de la tabla (la base es la propia palabra)
+CLAVES = ('third', 'past', 'participle', 'ing', 'plural')
+POSICION = {clave: i for i, clave in enumerate(CLAVES)}
+
+# Verbos irregulares frecuentes: base -> (pasado, participio)
+VERBOS_IRREGULARES = {
+    'be': ('was', 'been'), 'become': ('became', 'become'), 'begin': ('began', 'begun'),
+    'break': ('broke', 'broken'), 'bring': ('brought', 'brought'),
+    'build': ('built', 'built'), 'buy': ('bought', 'bought'), 'catch': ('caught', 'caught'),
+    'choose': ('chose', 'chosen'), 'come': ('came', 'come'), 'cost': ('cost', 'cost'),
+    'cut': ('cut', 'cut'), 'do': ('did', 'done'), 'draw': ('drew', 'drawn'),
+    'drink': ('drank', 'drunk'), 'drive': ('drove', 'driven'), 'eat': ('ate', 'eaten'),
+    'fall': ('fell', 'fallen'), 'feel': ('felt', 'felt'), 'fight': ('fought', 'fought'),
+    'find': ('found', 'found'), 'fly': ('flew', 'flown'), 'forget': ('forgot', 'forgotten'),
+    'get': ('got', 'got'), 'give': ('gave', 'given'), 'go': ('went', 'gone'),
+    'grow': ('grew', 'grown'), 'have': ('had', 'had'), 'hear': ('heard', 'heard'),
+    'hold': ('held', 'held'), 'keep': ('kept', 'kept'), 'know': ('knew', 'known'),
+    'lead': ('led', 'led'), 'leave': ('left', 'left'),
+    'lend': ('lent', 'lent'), 'let': ('let', 'let'), 'lose': ('lost', 'lost'),
+    'make': ('made', 'made'), 'mean': ('meant', 'meant'), 'meet': ('met', 'met'),
+    'pay': ('paid', 'paid'), 'put': ('put', 'put'), 'read': ('read', 'read'),
+    'ride': ('rode', 'ridden'), 'ring': ('rang', 'rung'), 'rise': ('rose', 'risen'),
+    'run': ('ran', 'run'), 'say': ('said', 'said'), 'see': ('saw', 'seen'),
+    'sell': ('sold', 'sold'), 'send': ('sent', 'sent'), 'set': ('set', 'set'),
+    'show': ('showed', 'shown'), 'sing': ('sang', 'sung'), 'sit': ('sat', 'sat'),
+    'sleep': ('slept', 'slept'), 'speak': ('spoke', 'spoken'), 'spend': ('spent', 'spent'),
+    'stand': ('stood', 'stood'), 'swim': ('swam', 'swum'), 'take': ('took', 'taken'),
+    'teach': ('taught', 'taught'), 'tell': ('told', 'told'), 'think': ('thought', 'thought'),
+    'throw': ('threw', 'thrown'), 'understand': ('understood', 'understood'),
+    'wake': ('woke', 'woken'), 'wear': ('wore', 'worn'), 'win': ('won', 'won'),
+    'write': ('wrote', 'written'),
+}
+
+# Terceras personas irregulares
+TERCERAS_IRREGULARES = {'be': 'is', 'have': 'has', 'do': 'does', 'go': 'goes'}
+
+# Plurales irregulares frecuentes
+PLURALES_IRREGULARES = {
+    'man': 'men', 'woman': 'women', 'child': 'children', 'person': 'people',
+    'foot': 'feet', 'tooth': 'teeth', 'mouse': 'mice', 'goose': 'geese',
+    'life': 'lives', 'knife': 'knives', 'wife': 'wives', 'leaf': 'leaves',
+    'half': 'halves', 'shelf': 'shelves', 'sheep': 'sheep', 'fish': 'fish',
+    'analysis': 'analyses', 'crisis': 'crises', 'thesis': 'theses',
+    'phenomenon': 'phenomena', 'criterion': 'criteria',
+}
+
+def _sibilante(palabra: str) -> bool:
+    return palabra.endswith(('s', 'x', 'z', 'ch', 'sh'))
+
+def _consonante_y(palabra: str) -> bool:
+    return len(palabra) > 1 and palabra.endswith('y') and palabra[-2] not in VOCALES
+
+def _duplica_final(verbo: str) -> bool:
+    """Monosílabos consonante-vocal-consonante: stop -> stopped, run -> running."""
+    return (len(verbo) >= 3 and verbo[-1] not in VOCALES + 'wxy'
+            and verbo[-2] in VOCALES and verbo[-3] not in VOCALES
+            and sum(c in VOCALES for c in verbo) == 1)
+
+def plural_regular(sustantivo: str) -> str:
+    """city -> cities, box -> boxes, book -> books"""
+    if _consonante_y(sustantivo):
+        return sustantivo[:-1] + 'ies'
+    if _sibilante(sustantivo):
+        return sustantivo + 'es'
+    return sustantivo + 's'
+
+def tercera_regular(verbo: str) -> str:
+    """study -> studies, teach -> teaches, read -> reads"""
+    return plural_regular(verbo)
+
+def pasado_regular(verbo: str) -> str:
+    """create -> created, study -> studied, stop -> stopped, work -> worked"""
+    if verbo.endswith('e'):
+        return verbo + 'd'
+    if _consonante_y(verbo):
+        return verbo[:-1] + 'ied'
+    if _duplica_final(verbo):
+        return verbo + verbo[-1] + 'ed'
+    return verbo + 'ed'
+
+def gerundio_regular(verbo: str) -> str:
+    """lie -> lying, write -> writing, see -> seeing, run -> running, read -> reading"""
+    if verbo.endswith('ie'):
+        return verbo[:-2] + 'ying'
+    if verbo.endswith('e') and not verbo.endswith(('ee', 'ye', 'oe')) and len(verbo) > 2:
+        return verbo[:-1] + 'ing'
+    if _duplica_final(verbo):
+        return verbo + verbo[-1] + 'ing'
+    return verbo + 'ing'
+
+# Claves que aplica cada categoría
+CLAVES_CATEGORIA = {
+    'sustantivo': ('plural',),
+    'verbo': ('third', 'past', 'participle', 'ing'),
+}
+
+def _primera(formas, clave: str) -> Optional[str]:
+    """Primera forma de la entrada para la clave (acepta lista o cadena)."""
+    valor = formas.get(clave)
+    if isinstance(valor, str):
+        return valor.lower() or None
+    return valor[0].lower() if valor else None
+
+def flexionar(palabra: str, clave: str, formas=None) -> str:
+    """
+    Forma de una palabra para una clave de CLAVES ('base' devuelve la
+    palabra): la de `formas`, la irregular conocida o la regular.
+    Sin participio en `formas` se usa su pasado (teach -> taught).
+
+    :param palabra: palabra base
+    :param clave: 'base', 'third', 'past', 'participle', 'ing' o 'plural'
+    :param formas: `formas` de la entrada del léxico, si la hay
+    """
+    if clave == 'base':
+        return palabra
+    if formas:
+        forma = _primera(formas, clave) or (clave == 'participle' and _primera(formas, 'past'))
+        if forma:
+            return forma
+    if clave == 'plural':
+        return PLURALES_IRREGULARES.get(palabra) or plural_regular(palabra)
+    if clave == 'third':
+        return TERCERAS_IRREGULARES.get(palabra) or tercera_regular(palabra)
+    if clave == 'ing':
+        return gerundio_regular(palabra)
+    irregular = VERBOS_IRREGULARES.get(palabra)
+    if irregular:
+        return irregular[0] if clave == 'past' else irregular[1]
+    if clave in ('past', 'participle'):
+        return pasado_regular(palabra)
+    raise ValueError(f"Forma desconocida: {clave}")
+
+def flexiones_de_entrada(palabra: str, info) -> Optional[Tuple[Optional[str], ...]]:
+    """
+    Tupla de formas (orden de CLAVES) para la tabla 'flexiones', con None en
+    las claves que no aplican a sus categorías. None si no aplica ninguna.
+
+    :param palabra: lema (clave del léxico)
+    :param info: su entrada
+    """
+    claves = set()
+    for categoria in info.get('categorias') or ():
+        claves.update(CLAVES_CATEGORIA.get(categoria, ()))
+    formas = info.get('formas') or {}
+    claves.update(c for c in CLAVES if formas.get(c))
+    if not claves:
+        return None
+    return tuple(flexionar(palabra, c, formas) if c in claves else None for c in CLAVES)
+
+def formas_de_entrada(palabra: str, info, flexiones=None) -> Iterator[str]:
+    """
+    Formas flexionadas de una palabra (sin repetir y distintas de ella):
+    todas las de su `formas` más las de su tupla de flexiones.
+
+    :param palabra: lema (clave del léxico)
+    :param info: su entrada
+    :param flexiones: flexiones_de_entrada(palabra, info) si ya se calculó
+    """
+    formas = info.get('formas') or {}
+    if flexiones is None:
+        flexiones = flexiones_de_entrada(palabra, info) or ()
+    vistas = {palabra}
+    for lista in list(formas.values()) + [flexiones]:
+        if isinstance(lista, str):
+            lista = [lista]
+        for forma in lista or ():
+            if not forma:
+                continue
+            forma = forma.lower()
+            if forma not in vistas:
+                vistas.add(forma)
+                yield forma
@@ -0,0 +1,302 @@
+"""
+Léxico partido en fragmentos por dominio (semantica.dominio) y, si se pide,
+también por letra inicial. Al arrancar solo se cargan los fragmentos de los
+dominios pedidos (p. ej. los temas favoritos del perfil); los demás se cargan
+solos la primera vez que se consulta una palabra que no está en memoria.
+
+Estructura en disco (a_p.fragmentos/):
+- indice.snapshot: metadatos del JSON y descripción de cada fragmento, con los
+  hashes (crc32) ordenados de sus palabras para saber a qué fragmento ir
+- NNN.snapshot: entradas (EntradaCompacta) de un fragmento
+Todas las instantáneas llevan la firma del JSON de origen.
+"""
+
+import os
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .almacen_lexico import (AlmacenLexico, ConstructorIndices, _compactar,
+    fusionar_indices)
+from .entrada_compacta import estado_simbolos, adoptar_simbolos
+from .indice_difuso import IndiceDifuso, ruta_indice_difuso
+from .indice_fonetico import IndiceFonetico, ruta_indice_fonetico
+from .snapshot_lexico import (EXTENSION as EXTENSION_SNAPSHOT, firma_archivo,
+    escribir_snapshot, leer_json_lexico, leer_snapshot, ruta_derivada, sin_recolector)
+
+EXTENSION = '.fragmentos'
+INDICE = 'indice' + EXTENSION_SNAPSHOT
+
+def ruta_fragmentos(path_json: str) -> str:
+    """
+    Directorio de fragmentos asociado a un JSON (a_p.json -> a_p.fragmentos/).
+
+    :param path_json: Dirección del json de origen
+    """
+    return ruta_derivada(path_json, EXTENSION)
+
+def _hash_palabra(palabra: str) -> int:
+    return zlib.crc32(palabra.encode('utf-8'))
+
+def _letra(palabra: str) -> str:
+    inicial = palabra[:1].lower()
+    return inicial if 'a' <= inicial <= 'z' else '_'
+
+def fragmentar_lexico(path_json: str, destino: str = None, por_letra: bool = False,
+                      indices: bool = True) -> str:
+    """
+    Parte el léxico en fragmentos por dominio (y letra inicial si por_letra).
+
+    :param path_json: Dirección del json de origen
+    :param destino: directorio de salida (por defecto junto al JSON)
+    :param por_letra: subdividir cada dominio por la letra inicial de la palabra
+    :param indices: escribir también los índices difuso y fonético de todas
+    las palabras (el paso de compilación; al refragmentar al abrir no, porque
+    en léxicos grandes tardan decenas de segundos)
+    :return: directorio generado
+    """
+    destino = destino or ruta_fragmentos(path_json)
+    data = leer_json_lexico(path_json)
+    firma = firma_archivo(path_json)
+    os.makedirs(destino, exist_ok=True)
+    # Fragmentos de una partición anterior (puede tener otro número de fragmentos)
+    for nombre in os.listdir(destino):
+        if nombre.endswith(EXTENSION_SNAPSHOT):
+            os.remove(os.path.join(destino, nombre))
+
+    with sin_recolector(permanente=False):
+        data = _compactar(data)
+        grupos = {}
+        for palabra, info in data.pop('palabras').items():
+            dominio = info.dominio
+            # Un dominio null (o que no es texto) va con los generales
+            clave = (dominio if isinstance(dominio, str) else 'general',
+                     _letra(palabra) if por_letra else '')
+            grupos.setdefault(clave, {})[palabra] = info
+        simbolos = estado_simbolos()
+        fragmentos = []
+        for n, ((dominio, letra), palabras) in enumerate(sorted(grupos.items())):
+            archivo = f'{n:03d}{EXTENSION_SNAPSHOT}'
+            escribir_snapshot(os.path.join(destino, archivo), firma, (palabras, simbolos))
+            fragmentos.append({
+                'dominio': dominio,
+                'letra': letra or None,
+                'archivo': archivo,
+                'palabras': len(palabras),
+                'hashes': array('I', sorted(_hash_palabra(p) for p in palabras)),
+            })
+        # El índice se escribe al final: sin él los fragmentos no se usan
+        escribir_snapshot(os.path.join(destino, INDICE), firma, (data, fragmentos))
+        if indices:
+            # Índices difuso y fonético de todas las palabras, que aquí sí
+            # están todas en memoria
+            todas = [p for grupo in grupos.values() for p in grupo]
+            IndiceDifuso.construir(todas).guardar(ruta_indice_difuso(path_json), path_json, firma)
+            IndiceFonetico.construir(todas).guardar(ruta_indice_fonetico(path_json), path_json, firma)
+    return destino
+
+class PalabrasFragmentadas:
+    """
+    Vista { "word": entrada } sobre los fragmentos de un léxico. No es un
+    Mapping: consultar una palabra carga fragmentos, pero iterar no.
+    - `[]`, get() e `in` buscan en todo el léxico: si la palabra no está en
+    memoria se cargan los fragmentos que pueden contenerla (según los hashes
+    del índice) y se vuelve a buscar
+    - cargada() comprueba solo lo cargado, sin cargar nada (para recorrer
+    relaciones sin arrastrar los fragmentos de otros dominios)
+    - iterar, len(), keys(), values() e items() recorren solo lo cargado
+    """
+
+    def __init__(self, directorio: str, fragmentos: List[dict], path_json: str,
+                firma_json: tuple):
+        """
+        :param directorio: carpeta con los fragmentos
+        :param fragmentos: descripción de cada fragmento (leída del índice)
+        :param path_json: JSON de origen
+        :param firma_json: firma del JSON, para validar cada fragmento
+        """
+        self.directorio = directorio
+        self.fragmentos = fragmentos
+        self.path_json = path_json
+        self.firma_json = firma_json
+        self.al_cargar: Callable[[dict], None] = None
+        self._cargadas = {}
+        self._pendientes = set(range(len(fragmentos)))
+
+    def cargar_fragmento(self, n: int):
+        """Carga el fragmento n si aún no está en memoria."""
+        if n not in self._pendientes:
+            return
+        fragmento = self.fragmentos[n]
+        ruta = os.path.join(self.directorio, fragmento['archivo'])
+        contenido = leer_snapshot(ruta, self.path_json, self.firma_json)
+        if contenido is None:
+            raise ValueError(f"Fragmento no válido: {ruta} (vuelva a fragmentar el léxico)")
+        palabras, simbolos = contenido
+        adoptar_simbolos(simbolos, palabras.values())
+        self._cargadas.update(palabras)
+        self._pendientes.discard(n)
+        if self.al_cargar is not None:
+            self.al_cargar(palabras)
+
+    def cargar_dominios(self, dominios: Iterable[str]):
+        """Carga todos los fragmentos de los dominios indicados."""
+        dominios = set(dominios)
+        for n, fragmento in enumerate(self.fragmentos):
+            if fragmento['dominio'] in dominios:
+                self.cargar_fragmento(n)
+
+    def cargar_todo(self):
+        """Carga los fragmentos que falten."""
+        for n in sorted(self._pendientes):
+            self.cargar_fragmento(n)
+
+    def _candidatos(self, palabra: str) -> List[int]:
+        """Fragmentos pendientes cuyo índice de hashes contiene la palabra."""
+        h = _hash_palabra(palabra)
+        letra = _letra(palabra)
+        candidatos = []
+        for n in sorted(self._pendientes):
+            fragmento = self.fragmentos[n]
+            if fragmento['letra'] is not None and fragmento['letra'] != letra:
+                continue
+            hashes = fragmento['hashes']
+            i = bisect_left(hashes, h)
+            if i < len(hashes) and hashes[i] == h:
+                candidatos.append(n)
+        return candidatos
+
+    def __getitem__(self, palabra):
+        try:
+            return self._cargadas[palabra]
+        except KeyError:
+            if not isinstance(palabra, str) or not self._pendientes:
+                raise
+        for n in self._candidatos(palabra):
+            self.cargar_fragmento(n)
+        return self._cargadas[palabra]
+
+    def get(self, palabra, defecto=None) -> Optional[dict]:
+        try:
+            return self[palabra]
+        except KeyError:
+            return defecto
+
+    def __contains__(self, palabra) -> bool:
+        return self.get(palabra) is not None
+
+    def cargada(self, palabra) -> bool:
+        """Si la palabra está en un fragmento ya cargado (no carga ninguno)."""
+        return palabra in self._cargadas
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._cargadas)
+
+    def __len__(self) -> int:
+        return len(self._cargadas)
+
+    def keys(self):
+        return self._cargadas.keys()
+
+    def values(self):
+        return self._cargadas.values()
+
+    def items(self):
+        return self._cargadas.items()
+
+    def estadisticas(self) -> dict:
+        """Fragmentos y palabras cargados frente al total."""
+        cargados = len(self.fragmentos) - len(self._pendientes)
+        return {
+            'fragmentos': len(self.fragmentos),
+            'fragmentos_cargados': cargados,
+            'palabras': sum(f['palabras'] for f in self.fragmentos),
+            'palabras_cargadas': len(self._cargadas),
+        }
+
+class AlmacenFragmentado(AlmacenLexico):
+    """
+    AlmacenLexico sobre un léxico fragmentado. `palabras` es una
+    PalabrasFragmentadas y los índices (categoría, tema, nivel...) cubren los
+    fragmentos cargados: al cargar uno nuevo se le calculan solo a él y se
+    fusionan con los que ya había.
+    """
+
+    # Si hay que construir un índice (o el grafo) solo se ven los fragmentos
+    # cargados: no se guarda, para no dejar en disco un derivado incompleto,
+    # y el grafo guardado del léxico completo tampoco se lee
+    persistir_indices = False
+
+    def __init__(self, data: dict, path_json: str, palabras: PalabrasFragmentadas):
+        """
+        :param data: metadatos del JSON (claves distintas de 'palabras')
+        :param path_json: JSON de origen
+        :param palabras: vista sobre los fragmentos
+        """
+        super().__init__({**data, 'palabras': palabras}, path_json)
+        palabras.al_cargar = self._agregar_fragmento
+
+    def _agregar_fragmento(self, palabras: dict):
+        """
+        Actualiza los índices con las entradas del fragmento recién cargado
+        (si aún no se han pedido, se calcularán al primer uso con todo).
+
+        :param palabras: entradas del fragmento
+        """
+        if self._indices is not None:
+            constructor = ConstructorIndices()
+            for palabra, info in palabras.items():
+                constructor.agregar(palabra, info)
+            self._indices = fusionar_indices(self._indices, constructor.resultado())
+        # Las claves de palabras (o lemas) que aún no estaban cargadas
+        self._claves_respuesta = {}
+
+    @classmethod
+    def abrir(cls, path: str, dominios: Iterable[str] = None,
+            por_letra: bool = False) -> 'AlmacenFragmentado':
+        """
+        Abre los fragmentos del JSON (fragmentándolo antes si no existen o
+        están desactualizados) y carga los de los dominios indicados.
+
+        :param path: Dirección de json
+        :param dominios: dominios que se cargan al inicio (None = todos)
+        :param por_letra: subdividir por letra si hay que (re)fragmentar
+        """
+        directorio = ruta_fragmentos(path)
+        # Sin firma: con el mismo tamaño y mtime no se lee el JSON y su hash
+        # queda registrado para firma_archivo
+        contenido = leer_snapshot(os.path.join(directorio, INDICE), path)
+        firma = firma_archivo(path)
+        if contenido is None:
+            fragmentar_lexico(path, directorio, por_letra, indices=False)
+            contenido = leer_snapshot(os.path.join(directorio, INDICE), path, firma)
+        data, fragmentos = contenido
+        palabras = PalabrasFragmentadas(directorio, fragmentos, path, firma)
+        if dominios is None:
+            palabras.cargar_todo()
+        else:
+            palabras.cargar_dominios(dominios)
+        almacen = cls(data, path, palabras)
+        almacen._firma = firma
+        return almacen
+
+    @classmethod
+    def abrir_compartido(cls, path: str, dominios: Iterable[str] = None) -> 'AlmacenFragmentado':
+        """
+        Como abrir(), pero registrado por ruta: si ya estaba abierto solo se
+        cargan los dominios que falten.
+        """
+        clave = (os.path.abspath(path), EXTENSION)
+        almacen = cls._compartidos.get(clave)
+        if almacen is None:
+            almacen = cls.abrir(path, dominios)
+            cls._compartidos[clave] = almacen
+        elif dominios is None:
+            almacen.palabras.cargar_todo()
+        else:
+            almacen.palabras.cargar_dominios(dominios)
+        return almacen
+
+    def guardar_snapshot(self) -> str:
+        raise ValueError("Un almacén fragmentado se guarda con fragmentar_lexico")
@@ -0,0 +1,162 @@
+"""
+Léxico en disco mapeado en memoria (mmap) con decodificación perezosa por entrada.
+Solo se decodifican las palabras consultadas; la memoria residente crece con
+las palabras usadas y no con el tamaño del léxico. Las consultas por índice
+(palabras_por_categoria, niveles, lemas...) y el grafo sí recorren el léxico
+entero la primera vez: AlmacenLexico guarda los índices en a_p.lexico.indices
+y el grafo en a_p.lexico.grafo, y a partir de ahí solo se leen, pero esas
+estructuras completas sí quedan en memoria y no entran en la cifra anterior.
+
+Formato del archivo (.lexico), todo little-endian:
+- cabecera: magia, versión, número de palabras y posiciones de cada bloque
+- metadatos: JSON con las claves de primer nivel distintas de 'palabras'
+- tabla: un registro por palabra, ordenado por clave (bytes UTF-8):
+    (offset de clave, longitud de clave, offset de entrada, longitud de entrada)
+- claves: palabras en UTF-8, concatenadas
+- entradas: JSON compacto de cada entrada, concatenado
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Iterator
+
+from .snapshot_lexico import leer_json_lexico, ruta_derivada
+
+MAGIA = b'LEXMMAP\x00'
+VERSION = 1
+EXTENSION = '.lexico'
+CABECERA = struct.Struct('<8sIQQQQQQ')
+REGISTRO = struct.Struct('<QIQI')
+
+def ruta_lexico_mmap(path_json: str) -> str:
+    """
+    Ruta del léxico mapeado asociado a un JSON (a_p.json -> a_p.lexico).
+
+    :param path_json: Dirección del json de origen
+    """
+    return ruta_derivada(path_json, EXTENSION)
+
+def compilar_lexico_mmap(path_json: str, destino: str = None) -> str:
+    """
+    Convierte el JSON del diccionario al formato mapeable.
+
+    :param path_json: Dirección del json de origen
+    :param destino: archivo de salida (por defecto junto al JSON)
+    :return: ruta del archivo generado
+    """
+    destino = destino or ruta_lexico_mmap(path_json)
+    data = leer_json_lexico(path_json)
+    palabras = data.pop('palabras')
+    meta = json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    claves = sorted(k.encode('utf-8') for k in palabras)
+    tabla = bytearray()
+    bloque_claves = bytearray()
+    bloque_entradas = bytearray()
+    for clave in claves:
+        entrada = json.dumps(palabras[clave.decode('utf-8')], ensure_ascii=False,
+            separators=(',', ':')).encode('utf-8')
+        tabla += REGISTRO.pack(len(bloque_claves), len(clave),
+            len(bloque_entradas), len(entrada))
+        bloque_claves += clave
+        bloque_entradas += entrada
+
+    pos_meta = CABECERA.size
+    pos_tabla = pos_meta + len(meta)
+    pos_claves = pos_tabla + len(tabla)
+    pos_entradas = pos_claves + len(bloque_claves)
+    temporal = destino + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(CABECERA.pack(MAGIA, VERSION, len(claves), pos_meta, len(meta),
+            pos_tabla, pos_claves, pos_entradas))
+        f.write(meta)
+        f.write(tabla)
+        f.write(bloque_claves)
+        f.write(bloque_entradas)
+    os.replace(temporal, destino)
+    return destino
+
+class LexicoMmap(Mapping):
+    """
+    Mapping palabra -> entrada respaldado por un archivo .lexico mapeado.
+    - la búsqueda es binaria sobre la tabla ordenada (sin cargar las claves)
+    - cada entrada se decodifica al pedirla, con una LRU pequeña de entradas
+    decodificadas para que consultas repetidas devuelvan el mismo objeto
+    """
+
+    def __init__(self, path: str, tamano_cache: int = 1024):
+        """
+        :param path: archivo .lexico generado por compilar_lexico_mmap
+        :param tamano_cache: número de entradas decodificadas que se conservan
+        """
+        self.path = path
+        self._archivo = open(path, 'rb')
+        self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        (magia, version, self._n, pos_meta, len_meta, self._pos_tabla,
+            self._pos_claves, self._pos_entradas) = CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA or version != VERSION:
+            self.cerrar()
+            raise ValueError(f"{path} no es un léxico mapeado válido")
+        self.metadatos = json.loads(self._mm[pos_meta:pos_meta + len_meta])
+        self._decodificar = lru_cache(maxsize=tamano_cache)(self._decodificar_entrada)
+
+    def _registro(self, i: int):
+        return REGISTRO.unpack_from(self._mm, self._pos_tabla + i * REGISTRO.size)
+
+    def _clave(self, i: int) -> bytes:
+        off, largo, _, _ = self._registro(i)
+        inicio = self._pos_claves + off
+        return self._mm[inicio:inicio + largo]
+
+    def _buscar(self, palabra: str) -> int:
+        """Índice de la palabra en la tabla o -1 (búsqueda binaria)."""
+        objetivo = palabra.encode('utf-8')
+        lo, hi = 0, self._n
+        while lo < hi:
+            medio = (lo + hi) // 2
+            clave = self._clave(medio)
+            if clave < objetivo:
+                lo = medio + 1
+            elif clave > objetivo:
+                hi = medio
+            else:
+                return medio
+        return -1
+
+    def _decodificar_entrada(self, i: int) -> dict:
+        _, _, off, largo = self._registro(i)
+        inicio = self._pos_entradas + off
+        return json.loads(self._mm[inicio:inicio + largo])
+
+    def __getitem__(self, palabra: str) -> dict:
+        if not isinstance(palabra, str):
+            raise KeyError(palabra)
+        i = self._buscar(palabra)
+        if i < 0:
+            raise KeyError(palabra)
+        return self._decodificar(i)
+
+    def __contains__(self, palabra) -> bool:
+        return isinstance(palabra, str) and self._buscar(palabra) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._n):
+            yield self._clave(i).decode('utf-8')
+
+    def __len__(self) -> int:
+        return self._n
+
+    def estadisticas_cache(self) -> dict:
+        """Aciertos/fallos de la LRU de entradas decodificadas."""
+        info = self._decodificar.cache_info()
+        return {'aciertos': info.hits, 'fallos': info.misses,
+                'tamano': info.currsize, 'maximo': info.maxsize}
+
+    def cerrar(self):
+        """Libera el mapeo y el archivo."""
+        self._mm.close()
+        self._archivo.close()
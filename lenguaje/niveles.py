@@ -0,0 +1,93 @@
+"""
+Escala única de niveles: los CEFR (A1..C2) y los numéricos (0..100) del
+léxico se proyectan sobre la misma escala 0..100 que usa PerfilUsuario.
+"""
+
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from typing import Iterable, List, Optional, Tuple
+
+# Límite inferior de cada banda CEFR (mismos cortes que PerfilUsuario._actualizar_nivel_cefr)
+MAPA_CEFR = {'A1': 0, 'A2': 15, 'B1': 30, 'B2': 50, 'C1': 70, 'C2': 85}
+
+def nivel_a_numero(nivel) -> Optional[int]:
+    """
+    Convierte un nivel CEFR o numérico a la escala 0..100.
+
+    :param nivel: 'B1', 'b1', 40, '40'...
+    :return: entero 0..100 o None si no se reconoce
+    """
+    if nivel is None:
+        return None
+    if isinstance(nivel, str):
+        cefr = MAPA_CEFR.get(nivel.strip().upper())
+        if cefr is not None:
+            return cefr
+    try:
+        return max(0, min(100, int(nivel)))
+    except (TypeError, ValueError):
+        return None
+
+class IndiceNiveles:
+    """
+    Palabras ordenadas por nivel en dos arreglos paralelos:
+    - `niveles`: array de bytes con el nivel (0..100) de cada posición
+    - `palabras`: tupla con la palabra de cada posición
+    Las consultas por rango son dos bisect: O(log n) más el tamaño del resultado.
+    """
+
+    __slots__ = ('niveles', 'palabras')
+
+    def __init__(self, niveles: array, palabras: tuple):
+        self.niveles = niveles
+        self.palabras = palabras
+
+    @classmethod
+    def construir(cls, pares: Iterable[Tuple[int, str]]) -> 'IndiceNiveles':
+        """
+        :param pares: (nivel 0..100, palabra); se ordenan de forma estable por nivel
+        """
+        ordenados = sorted(pares, key=lambda p: p[0])
+        return cls(array('B', (n for n, _ in ordenados)), tuple(p for _, p in ordenados))
+
+    def fusionar(self, otro: 'IndiceNiveles') -> 'IndiceNiveles':
+        """
+        Índice con las palabras de ambos, en O(n) sin reordenar: a igual
+        nivel las de este índice van primero (como en construir()).
+        """
+        pares = list(merge(zip(self.niveles, self.palabras),
+            zip(otro.niveles, otro.palabras), key=lambda p: p[0]))
+        return type(self)(array('B', (n for n, _ in pares)), tuple(p for _, p in pares))
+
+    def _limites(self, minimo, maximo) -> Tuple[int, int]:
+        minimo = 0 if minimo is None else nivel_a_numero(minimo)
+        maximo = 100 if maximo is None else nivel_a_numero(maximo)
+        if minimo is None or maximo is None or minimo > maximo:
+            return 0, 0
+        return bisect_left(self.niveles, minimo), bisect_right(self.niveles, maximo)
+
+    def rango(self, minimo=None, maximo=None) -> tuple:
+        """
+        Palabras con minimo <= nivel <= maximo (acepta CEFR o números).
+        """
+        lo, hi = self._limites(minimo, maximo)
+        return self.palabras[lo:hi]
+
+    def contar(self, minimo=None, maximo=None) -> int:
+        """Número de palabras en el rango, sin construir el resultado."""
+        lo, hi = self._limites(minimo, maximo)
+        return hi - lo
+
+    def muestrear(self, minimo, maximo, k: int) -> List[str]:
+        """
+        Hasta k palabras al azar del rango, sin copiarlo: O(log n + k).
+        """
+        lo, hi = self._limites(minimo, maximo)
+        if hi <= lo:
+            return []
+        return [self.palabras[i] for i in random.sample(range(lo, hi), min(k, hi - lo))]
+
+    def __len__(self) -> int:
+        return len(self.palabras)
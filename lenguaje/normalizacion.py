@@ -0,0 +1,54 @@
+"""
+Normalización de respuestas para compararlas sin que importen mayúsculas,
+tildes ni signos: "¡Árbol!" y "arbol" quedan iguales.
+También construye, por palabra, el conjunto de claves normalizadas que se
+aceptan como respuesta (la palabra, sus sinónimos y sus traducciones).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, FrozenSet
+
+_APOSTROFOS = re.compile(r"['’`´]")
+_SIGNOS = re.compile(r"[^\w\s]")
+_ESPACIOS = re.compile(r"\s+")
+
+@lru_cache(maxsize=65536)
+def normalizar(texto: str) -> str:
+    """
+    Minúsculas, sin diacríticos (á -> a, ñ -> n), sin apóstrofos (don't -> dont),
+    el resto de signos como espacios y espacios colapsados.
+
+    :param texto: respuesta o palabra del léxico
+    """
+    descompuesto = unicodedata.normalize('NFKD', texto.lower())
+    sin_marcas = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    sin_signos = _SIGNOS.sub(' ', _APOSTROFOS.sub('', sin_marcas))
+    return _ESPACIOS.sub(' ', sin_signos).strip()
+
+class ClavesRespuesta:
+    """
+    Respuestas aceptadas para una palabra, ya normalizadas:
+    - `ingles`: la palabra y sus sinónimos
+    - `traducciones`: idioma -> traducciones
+    """
+
+    __slots__ = ('ingles', 'traducciones')
+
+    def __init__(self, ingles: FrozenSet[str], traducciones: Dict[str, FrozenSet[str]]):
+        self.ingles = ingles
+        self.traducciones = traducciones
+
+    @classmethod
+    def de_entrada(cls, palabra: str, info) -> 'ClavesRespuesta':
+        """
+        :param palabra: palabra del léxico
+        :param info: su entrada (None si no está en el léxico)
+        """
+        info = info or {}
+        ingles = {normalizar(palabra)}
+        ingles.update(normalizar(s) for s in info.get('sinonimos') or [])
+        traducciones = {idioma: frozenset(normalizar(t) for t in lista) - {''}
+            for idioma, lista in (info.get('traducciones') or {}).items()}
+        return cls(frozenset(ingles - {''}), traducciones)
@@ -0,0 +1,102 @@
+"""
+Proyección de campos del léxico: conserva solo los campos elegidos de cada
+entrada al cargarla y descarta el resto (definiciones, ejemplos, otros
+idiomas...). Pensado para equipos con poca memoria (kioscos).
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, Optional, Union
+
+_RUTA = re.compile(r'^([\w.]+?)(?:\[:(\d+)\])?$')
+
+class ProyeccionCampos:
+    """
+    Especificación de los campos que se conservan de cada entrada.
+    Cada campo es una ruta con puntos; un sufijo [:n] conserva solo los n
+    primeros elementos de una lista:
+        ProyeccionCampos(['categorias', 'semantica.dominio',
+                        'semantica.relaciones', 'traducciones.es[:1]'])
+    Al aplicarla se acumulan los bytes (JSON UTF-8) descartados por campo.
+    """
+
+    def __init__(self, campos: Union[Iterable[str], Dict[str, Optional[int]]],
+                medir: bool = True):
+        """
+        :param campos: rutas a conservar, o dict ruta -> límite de elementos (None = todo)
+        :param medir: acumular los bytes ahorrados por campo (cuesta algo de CPU)
+        """
+        if isinstance(campos, dict):
+            rutas = dict(campos)
+        else:
+            rutas = {}
+            for campo in campos:
+                m = _RUTA.match(campo.strip())
+                if not m:
+                    raise ValueError(f"Ruta de proyección no válida: {campo}")
+                rutas[m.group(1)] = int(m.group(2)) if m.group(2) else None
+        self.rutas = rutas
+        self.medir = medir
+        self.ahorro = {}
+        self._arbol = {}
+        for ruta, limite in rutas.items():
+            nodo = self._arbol
+            partes = ruta.split('.')
+            for parte in partes[:-1]:
+                nodo = nodo.setdefault(parte, {})
+                if not isinstance(nodo, dict):
+                    break
+            else:
+                nodo[partes[-1]] = True if limite is None else limite
+
+    def firma(self) -> str:
+        """Identificador corto y estable de la especificación."""
+        texto = json.dumps(sorted(self.rutas.items()))
+        return hashlib.blake2b(texto.encode('utf-8'), digest_size=4).hexdigest()
+
+    def aplicar(self, info: dict) -> dict:
+        """Devuelve una copia de la entrada con solo los campos proyectados."""
+        return self._proyectar(info, self._arbol, '')
+
+    def _proyectar(self, valor: dict, arbol: dict, prefijo: str) -> dict:
+        res = {}
+        for clave, sub in valor.items():
+            ruta = prefijo + clave
+            regla = arbol.get(clave)
+            if regla is None:
+                self._contar(ruta, sub)
+            elif regla is True:
+                res[clave] = sub
+            elif isinstance(regla, int):
+                if isinstance(sub, list) and len(sub) > regla:
+                    res[clave] = sub[:regla]
+                    self._contar(ruta, sub[regla:])
+                else:
+                    res[clave] = sub
+            elif isinstance(sub, dict):
+                res[clave] = self._proyectar(sub, regla, ruta + '.')
+            else:
+                res[clave] = sub
+        return res
+
+    def _contar(self, ruta: str, valor):
+        if self.medir:
+            tamano = len(json.dumps(valor, ensure_ascii=False).encode('utf-8'))
+            self.ahorro[ruta] = self.ahorro.get(ruta, 0) + tamano
+
+    def reporte(self) -> Dict[str, int]:
+        """Bytes descartados por campo, de mayor a menor."""
+        return dict(sorted(self.ahorro.items(), key=lambda kv: kv[1], reverse=True))
+
+def como_proyeccion(spec) -> Optional[ProyeccionCampos]:
+    """
+    Acepta None, una ProyeccionCampos o su especificación (lista/dict de rutas).
+    """
+    if spec is None or isinstance(spec, ProyeccionCampos):
+        return spec
+    return ProyeccionCampos(spec)
+
+# Campos que usan los kioscos: categorías, dominio, relaciones y primera traducción
+PROYECCION_KIOSCO = ['categorias', 'semantica.dominio', 'semantica.relaciones',
+                    'traducciones.es[:1]']
@@ -0,0 +1,171 @@
+"""
+Instantánea binaria (snapshot) del léxico, guardada junto al JSON de origen.
+Evita volver a parsear a_p.json en cada arranque.
+"""
+
+import gc
+import hashlib
+import json
+import os
+import pickle
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+MAGIA = 'LEXICO_SNAPSHOT'
+VERSION = 7
+EXTENSION = '.snapshot'
+
+@contextmanager
+def sin_recolector(permanente: bool = True):
+    """
+    Desactiva el recolector cíclico mientras se crean de golpe millones de
+    objetos (no forman ciclos: las pasadas solo ralentizan la carga).
+    Con permanente=True, al terminar bien se pasan a la generación permanente
+    (gc.freeze): el léxico vive lo que el proceso y las EntradaCompacta, al
+    tener __slots__, harían que cada pasada completa tardara segundos.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+        if permanente:
+            gc.freeze()
+    finally:
+        if activo:
+            gc.enable()
+
+def ruta_derivada(path: str, extension: str, variante: str = None) -> str:
+    """
+    Ruta de un archivo derivado del léxico, junto a él: la extensión .json se
+    sustituye (a_p.json -> a_p.snapshot) y las demás se conservan
+    (a_p.lexico -> a_p.lexico.difuso).
+
+    :param path: Dirección del json (o del léxico mapeado)
+    :param extension: extensión del derivado, con el punto
+    :param variante: firma de la proyección de campos, si la hay
+    (a_p.<variante>.snapshot)
+    """
+    base, actual = os.path.splitext(path)
+    if actual != '.json':
+        base += actual
+    if variante:
+        base += '.' + variante
+    return base + extension
+
+def comprobar_lexico(data) -> dict:
+    """
+    Comprueba que un JSON ya leído es un léxico (tiene la clave 'palabras').
+
+    :raises ValueError: si no la tiene
+    """
+    if 'palabras' not in data:
+        raise ValueError("JSON de diccionario debe tener clave 'palabras'")
+    return data
+
+def leer_json_lexico(path: str) -> dict:
+    """
+    Lee el JSON del léxico de una vez y comprueba que tiene 'palabras'.
+
+    :param path: Dirección de json
+    :raises ValueError: si no tiene la clave 'palabras'
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return comprobar_lexico(json.load(f))
+
+def ruta_snapshot(path_json: str, variante: str = None) -> str:
+    """
+    Devuelve la ruta de la instantánea asociada a un JSON (a_p.json -> a_p.snapshot).
+    Las cargas proyectadas usan su propia instantánea (a_p.<variante>.snapshot).
+
+    :param path_json: Dirección del json de origen
+    :param variante: firma de la proyección de campos, si la hay
+    """
+    return ruta_derivada(path_json, EXTENSION, variante)
+
+def hash_archivo(path: str, bloque: int = 1 << 20) -> str:
+    """
+    Hash del contenido del archivo (blake2b, leído por bloques).
+
+    :param path: Dirección del archivo
+    :param bloque: tamaño de lectura en bytes
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while True:
+            trozo = f.read(bloque)
+            if not trozo:
+                break
+            h.update(trozo)
+    return h.hexdigest()
+
+# Hash del contenido ya conocido por (ruta, tamaño, mtime): se calcula (o se
+# toma de una instantánea válida) una sola vez por proceso
+_hashes_conocidos: Dict[Tuple[str, int, int], str] = {}
+
+def firma_archivo(path: str) -> Tuple[int, int, str]:
+    """
+    Firma del JSON de origen: (tamaño, mtime en ns, hash del contenido).
+    Mientras no cambien tamaño ni mtime el hash no se vuelve a calcular.
+
+    :param path: Dirección del json
+    """
+    st = os.stat(path)
+    clave = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    hash_contenido = _hashes_conocidos.get(clave)
+    if hash_contenido is None:
+        hash_contenido = _hashes_conocidos[clave] = hash_archivo(path)
+    return (st.st_size, st.st_mtime_ns, hash_contenido)
+
+def escribir_snapshot(path_snapshot: str, firma: tuple, contenido: Any):
+    """
+    Escribe la instantánea de forma atómica (archivo temporal + replace).
+    La cabecera va en un pickle propio para poder validarla sin leer el resto.
+
+    :param path_snapshot: destino
+    :param firma: firma del JSON de origen
+    :param contenido: objeto a serializar (datos, índices, tablas de símbolos)
+    """
+    temporal = path_snapshot + '.tmp'
+    with open(temporal, 'wb') as f:
+        pickle.dump((MAGIA, VERSION, firma), f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(contenido, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, path_snapshot)
+
+def leer_snapshot(path_snapshot: str, path_json: str,
+                firma_json: Tuple[int, int, str] = None) -> Optional[Any]:
+    """
+    Lee la instantánea si sigue siendo válida para el JSON indicado.
+    Es válida cuando coinciden versión, tamaño y mtime del JSON; solo si el
+    mtime cambió se compara el hash del contenido (un mtime distinto con el
+    mismo contenido no obliga a recompilar).
+
+    :param firma_json: firma_archivo(path_json) ya calculada, para no volver a
+    leer el JSON cuando se validan varias instantáneas del mismo origen
+    :return: contenido guardado o None si no existe o está desactualizada
+    """
+    if not os.path.exists(path_snapshot):
+        return None
+    try:
+        with open(path_snapshot, 'rb') as f:
+            magia, version, firma = pickle.load(f)
+            if magia != MAGIA or version != VERSION:
+                return None
+            tamano, mtime, hash_guardado = firma
+            if firma_json is None:
+                st = os.stat(path_json)
+                firma_json = (st.st_size, st.st_mtime_ns, None)
+            if firma_json[0] != tamano:
+                return None
+            if firma_json[1] == mtime:
+                # Mismo archivo que al firmar: su hash es el guardado
+                _hashes_conocidos.setdefault(
+                    (os.path.abspath(path_json), tamano, mtime), hash_guardado)
+            elif (firma_json[2] or firma_archivo(path_json)[2]) != hash_guardado:
+                return None
+            # Sin congelar: quien lee el léxico principal lo congela (gc.freeze)
+            # una vez; el resto de artefactos y las relecturas no
+            with sin_recolector(permanente=False):
+                return pickle.load(f)
+    except Exception:
+        # Instantánea corrupta o de otro formato: se recompila
+        return None
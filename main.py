@@ -17,13 +17,78 @@ def run_gui():
     sys.exit(gui_main())
 
 
+def compilar_lexico(ruta_json):
+    """Compila la instantánea del léxico (y el grafo) e imprime el informe de tiempos."""
+    from lenguaje.almacen_lexico import AlmacenLexico, comparar_tiempos_carga
+    from lenguaje.grafo_palabras import Grafo
+    destino = AlmacenLexico.compilar(ruta_json)
+    print(f"Instantánea escrita en {destino}")
+    Grafo(almacen=AlmacenLexico.compartido(ruta_json)).construir(usar_guardado=False)
+    informe = comparar_tiempos_carga(ruta_json)
+    print(f"  JSON:        {informe['json_s']:.2f} s ({informe['bytes_json'] / 1e6:.1f} MB)")
+    print(f"  Instantánea: {informe['snapshot_s']:.2f} s ({informe['bytes_snapshot'] / 1e6:.1f} MB)")
+    print(f"  Aceleración: x{informe['aceleracion']:.1f}")
+
+
+def reporte_memoria(ruta_json):
+    """Imprime los bytes por palabra del léxico como dicts y como entradas compactas."""
+    from lenguaje.almacen_lexico import comparar_memoria
+    informe = comparar_memoria(ruta_json)
+    print(f"Palabras: {informe['palabras']}")
+    print(f"  dicts del JSON:   {informe['bytes_por_palabra_dict']:.0f} bytes/palabra")
+    print(f"  EntradaCompacta:  {informe['bytes_por_palabra_compacta']:.0f} bytes/palabra")
+    print(f"  Reducción: x{informe['reduccion']:.2f}")
+
+
 def main():
     """Función principal."""
     parser = argparse.ArgumentParser(description='LINGUALEARN - Sistema de aprendizaje de inglés')
     parser.add_argument('--gui', action='store_true', help='Usar interfaz gráfica (PyQt6)')
+    parser.add_argument('--compilar-lexico', metavar='JSON', nargs='?',
+                        const=os.path.join('data', 'a_p.json'),
+                        help='Compila la instantánea binaria del léxico y muestra los tiempos de carga')
+    
+    parser.add_argument('--compilar-mmap', metavar='JSON', nargs='?',
+                        const=os.path.join('data', 'a_p.json'),
+                        help='Genera el léxico mapeado en memoria (.lexico) y sus índices junto al JSON')
+    parser.add_argument('--importar-sqlite', metavar='JSON', nargs='?',
+                        const=os.path.join('data', 'a_p.json'),
+                        help='Importa el léxico a una base SQLite (.db) junto al JSON')
+    parser.add_argument('--fragmentar-lexico', metavar='JSON', nargs='?',
+                        const=os.path.join('data', 'a_p.json'),
+                        help='Parte el léxico en fragmentos por dominio (carga bajo demanda)')
+    parser.add_argument('--por-letra', action='store_true',
+                        help='Con --fragmentar-lexico, subdivide cada dominio por letra inicial')
+    parser.add_argument('--reporte-memoria', metavar='JSON', nargs='?',
+                        const=os.path.join('data', 'a_p.json'),
+                        help='Muestra los bytes por palabra del léxico en memoria')
     
     args = parser.parse_args()
     
+    if args.compilar_lexico:
+        compilar_lexico(args.compilar_lexico)
+        return
+    if args.compilar_mmap:
+        from lenguaje.almacen_lexico import AlmacenLexico
+        from lenguaje.lexico_mmap import compilar_lexico_mmap
+        destino = compilar_lexico_mmap(args.compilar_mmap)
+        # Los índices (categoría, tema, nivel...) se guardan ya junto al .lexico
+        AlmacenLexico.desde_mmap(destino).indices
+        print(f"Léxico mapeado escrito en {destino}")
+        return
+    if args.importar_sqlite:
+        from lenguaje.diccionario_sqlite import importar_json
+        print(f"Base SQLite escrita en {importar_json(args.importar_sqlite)}")
+        return
+    if args.fragmentar_lexico:
+        from lenguaje.lexico_fragmentado import fragmentar_lexico
+        destino = fragmentar_lexico(args.fragmentar_lexico, por_letra=args.por_letra)
+        print(f"Fragmentos escritos en {destino}")
+        return
+    if args.reporte_memoria:
+        reporte_memoria(args.reporte_memoria)
+        return
+    
     print("Iniciando interfaz gráfica...")
     run_gui()
 
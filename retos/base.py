@@ -2,9 +2,10 @@
 Clase base abstracta para todos los retos del sistema.
 """
 
+import random
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Sequence
 
 class RetoBase(ABC):
     """
@@ -47,6 +48,43 @@ class RetoBase(ABC):
         """
         pass
     
+    @staticmethod
+    def muestrear_palabras(palabras: Sequence[str], k: int, excluir=None) -> List[str]:
+        """
+        Toma hasta k palabras al azar de una secuencia sin copiarla entera
+        (O(k) en lugar de filtrar y barajar toda la categoría).
+        
+        :param palabras: secuencia de candidatas (p. ej. índice del diccionario)
+        :param k: número de palabras deseadas
+        :param excluir: palabra (la objetivo) o conjunto de palabras que no deben aparecer
+        """
+        excluidas = {excluir} if excluir is None or isinstance(excluir, str) else set(excluir)
+        n = min(len(palabras), k + len(excluidas))
+        muestra = [p for p in random.sample(palabras, n) if p not in excluidas]
+        return muestra[:k]
+    
+    @staticmethod
+    def mensaje_sugerencia(analizador, respuesta: str, solucion: str) -> str:
+        """
+        Texto "¿quisiste decir...?" para una respuesta mal escrita, usando los
+        índices difuso y fonético del léxico (ver Analizador.sugerir). Si la
+        solución suena igual o está entre las sugerencias no se revela: solo
+        se avisa de que está cerca.
+        
+        :param analizador: Instancia de Analizador
+        :param respuesta: respuesta del usuario
+        :param solucion: respuesta esperada
+        :return: mensaje o cadena vacía si no hay sugerencias
+        """
+        if analizador.suena_como(respuesta, solucion):
+            return "Suena bien: revisa la ortografía."
+        sugerencias = analizador.sugerir(respuesta)
+        if not sugerencias:
+            return ""
+        if solucion.lower() in sugerencias:
+            return "Muy cerca: revisa la ortografía."
+        return f"¿Quisiste decir '{sugerencias[0]}'?"
+    
     def iniciar(self):
         """Marca el inicio del reto."""
         self.tiempo_inicio = datetime.now()
@@ -148,6 +148,10 @@ class RetoFormarPalabras(RetoBase):
                 else:
                     mensaje = "Incorrecto. "
                 mensaje += f"Intento {self.intentos}/{self.max_intentos}"
+                sugerencia = self.mensaje_sugerencia(self.analizador, respuesta,
+                    self.palabra_objetivo)
+                if sugerencia:
+                    mensaje += f"\n{sugerencia}"
                 # Mostrar pista en segundo intento si no la había - ESTRUCTURA REAL DEL JSON
                 if self.intentos == 2 and not self.con_pista:
                     info = self.diccionario.obtener_info(self.palabra_objetivo)
@@ -220,16 +224,16 @@ class RetoFormarPalabrasMultiple(RetoBase):
         respuesta = respuesta.strip().lower()
         correcto = False
         mensaje = ""
-        # Verificar si es una de las palabras objetivo
-        for palabra in self.palabras_objetivo:
-            if self.analizador.verificar_respuesta_exacta(respuesta, palabra, umbral=0.9):
-                if palabra not in self.palabras_encontradas:
-                    self.palabras_encontradas.add(palabra)
-                    correcto = True
-                    mensaje = f"¡Correcto! Has encontrado '{palabra}'"
-                else:
-                    mensaje = f"Ya habías encontrado '{palabra}'"
-                break
+        # Verificar si es una de las palabras objetivo (todas en un solo lote)
+        palabra = self.analizador.mejor_coincidencia(respuesta, self.palabras_objetivo,
+            umbral=0.9)
+        if palabra is not None:
+            if palabra not in self.palabras_encontradas:
+                self.palabras_encontradas.add(palabra)
+                correcto = True
+                mensaje = f"¡Correcto! Has encontrado '{palabra}'"
+            else:
+                mensaje = f"Ya habías encontrado '{palabra}'"
         if not correcto and respuesta not in [p for p in self.palabras_objetivo]:
             mensaje = f"'{respuesta}' no es una de las palabras objetivo"
         # Verificar si completó todas
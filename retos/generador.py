@@ -4,6 +4,7 @@ VERSIÓN CON DEBUG MEJORADO
 """
 
 import random
+from itertools import islice
 from typing import List, Dict, Any, Optional
 from .tarjetas import RetoTarjetas, RetoTarjetasInverso
 from .formar_palabras import RetoFormarPalabras, RetoFormarPalabrasMultiple
@@ -38,6 +39,10 @@ class GeneradorRetos:
         'formar_palabras_multiple': 5
     }
     
+    # Rango de niveles de palabra alrededor del nivel del usuario
+    MARGEN_NIVEL_INFERIOR = 15
+    MARGEN_NIVEL_SUPERIOR = 10
+    
     def __init__(self, diccionario, analizador, grafo, generador_oraciones, motor_srs):
         """
         :param diccionario: Instancia de Diccionario
@@ -74,11 +79,12 @@ class GeneradorRetos:
         print(f"DEBUG: Palabras pendientes del SRS: {len(palabras_pendientes)}")
         # Si no hay suficientes palabras pendientes, obtener del grafo
         if len(palabras_pendientes) < num_retos:
-            print(f"DEBUG: Pocas palabras en SRS, obteniendo del grafo...")
-            # Obtener palabras del grafo según nivel
-            palabras_grafo = []
-            # Intentar obtener palabras de diferentes categorías
-            categorias = ['sustantivo', 'verbo', 'adjetivo']
+            print(f"DEBUG: Pocas palabras en SRS, obteniendo del índice de niveles...")
+            # Palabras alrededor del nivel del usuario (bisect sobre el índice)
+            palabras_grafo = self._palabras_de_nivel(nivel_usuario,
+                2 * (num_retos - len(palabras_pendientes)))
+            # Si el léxico no tiene niveles, obtener palabras de diferentes categorías
+            categorias = [] if palabras_grafo else ['sustantivo', 'verbo', 'adjetivo']
             for categoria in categorias:
                 try:
                     palabras_cat = self.grafo.obtener_palabras_categoria(categoria)
@@ -90,7 +96,7 @@ class GeneradorRetos:
             if not palabras_grafo:
                 print("DEBUG: No se pudieron obtener palabras del grafo, usando lista básica")
                 # Fallback: usar palabras directamente del diccionario
-                palabras_grafo = list(self.diccionario.data.get('palabras', {}).keys())[:50]
+                palabras_grafo = [w for w, _ in islice(self.diccionario.iterar_palabras(), 50)]
             print(f"DEBUG: Palabras disponibles del grafo: {len(palabras_grafo)}")
             # Mezclar y tomar las necesarias
             random.shuffle(palabras_grafo)
@@ -133,6 +139,16 @@ class GeneradorRetos:
         print(f"\nDEBUG: Total de retos generados: {len(retos)}")
         return retos
     
+    def _palabras_de_nivel(self, nivel_usuario: int, cantidad: int) -> List[str]:
+        """
+        Palabras al azar cuyo nivel (CEFR o 0..100) está cerca del del usuario:
+        desde MARGEN_NIVEL_INFERIOR por debajo hasta MARGEN_NIVEL_SUPERIOR por encima.
+        O(log n + cantidad) con el índice de niveles del diccionario.
+        """
+        return self.diccionario.muestrear_por_nivel(
+            max(0, nivel_usuario - self.MARGEN_NIVEL_INFERIOR),
+            min(100, nivel_usuario + self.MARGEN_NIVEL_SUPERIOR), cantidad)
+    
     def _seleccionar_tipo_reto(self, nivel_usuario: int, posicion_sesion: int,
         total_sesion: int, tipos_permitidos: List[str] = None) -> str:
         """
@@ -194,9 +210,9 @@ class GeneradorRetos:
         if not info_palabra:
             print(f" Palabra '{palabra}' no encontrada en diccionario, intentando con otra...")
             # Obtener una palabra aleatoria del diccionario
-            todas_palabras = list(self.diccionario.data.get('palabras', {}).keys())
+            todas_palabras = [w for w, _ in islice(self.diccionario.iterar_palabras(), 100)]
             if todas_palabras:
-                palabra = random.choice(todas_palabras[:100])
+                palabra = random.choice(todas_palabras)
                 print(f"Usando palabra alternativa: '{palabra}'")
             else:
                 print(f"No hay palabras disponibles en el diccionario")
@@ -235,8 +251,8 @@ class GeneradorRetos:
                     diccionario=self.diccionario, analizador=self.analizador,
                     nivel_dificultad=nivel_str, ingles_a_espanol=kwargs.get('ingles_a_espanol', True))
             elif tipo == 'formar_palabras_multiple':
-                # Obtener palabras relacionadas
-                vecinos = self.grafo.obtener_vecinos(palabra, max_vecinos=3)
+                # Obtener palabras relacionadas (mejor sinónimos que vecinos del dominio)
+                vecinos = self.grafo.obtener_vecinos(palabra, max_vecinos=3, ponderado=True)
                 palabras_objetivo = [palabra] + vecinos[:2]
                 return RetoFormarPalabrasMultiple(palabras_objetivo=palabras_objetivo, diccionario=self.diccionario,
                     analizador=self.analizador, nivel_dificultad="avanzado")
@@ -266,11 +282,11 @@ class GeneradorRetos:
         # Obtener palabra del tema
         palabras_tema = self.diccionario.buscar_por_tema(tema)
         if not palabras_tema:
-            # Fallback a palabras del nivel
-            palabras_tema = self.diccionario.buscar_por_nivel(nivel)
+            # Fallback a palabras del nivel del usuario
+            palabras_tema = self._palabras_de_nivel(nivel, 1)
         if not palabras_tema:
             # Último fallback: palabras aleatorias del diccionario
-            palabras_tema = list(self.diccionario.data.get('palabras', {}).keys())[:50]
+            palabras_tema = [w for w, _ in islice(self.diccionario.iterar_palabras(), 50)]
         if not palabras_tema:
             return None
         palabra = random.choice(palabras_tema)
@@ -3,6 +3,8 @@ PARCHES PARA oraciones.py
 """
 import random
 from typing import Dict, Any, List
+from lenguaje.inflexiones import CLAVES as CLAVES_FLEXION
+from lenguaje.normalizacion import normalizar
 from .base import RetoBase
 
 def _generar_traduccion_base(self) -> str:
@@ -67,6 +69,7 @@ class RetoCompletarOracion(RetoBase):
         self.con_opciones = con_opciones
         self.oracion_completa = ""
         self.oracion_con_blanco = ""
+        self.forma_en_blanco = None
         self.opciones = []
         self.indice_correcto = None
         
@@ -101,12 +104,17 @@ class RetoCompletarOracion(RetoBase):
         # Buscar la palabra en la oración (case insensitive)
         palabras = oracion.split()
         oracion_modificada = []
+        self.forma_en_blanco = None
         
         for palabra in palabras:
             # Limpiar puntuación para comparar
             palabra_limpia = palabra.strip('.,!?;:"').lower()
             
-            if palabra_limpia == self.palabra_objetivo.lower():
+            # También las formas flexionadas ("studies" para "study")
+            if (palabra_limpia == self.palabra_objetivo.lower()
+                    or self.palabra_objetivo.lower() in self.diccionario.lemas(palabra_limpia)):
+                if self.forma_en_blanco is None:
+                    self.forma_en_blanco = palabra_limpia
                 # Mantener puntuación pero reemplazar palabra
                 puntuacion = ''.join(c for c in palabra if c in '.,!?;:"')
                 oracion_modificada.append('_____' + puntuacion)
@@ -124,10 +132,8 @@ class RetoCompletarOracion(RetoBase):
         categoria = info.get('categorias', ['general'])[0]
         palabras_categoria = self.diccionario.palabras_por_categoria(categoria)
         
-        # Filtrar y tomar opciones incorrectas
-        distractores = [p for p in palabras_categoria if p != self.palabra_objetivo]
-        random.shuffle(distractores)
-        opciones = distractores[:3]
+        # Tomar opciones incorrectas al azar (sin copiar toda la categoría)
+        opciones = self.muestrear_palabras(palabras_categoria, 3, excluir=self.palabra_objetivo)
         
         # Insertar respuesta correcta
         self.indice_correcto = random.randint(0, len(opciones))
@@ -159,6 +165,13 @@ class RetoCompletarOracion(RetoBase):
                 solucion=self.palabra_objetivo,
                 umbral=0.85
             )
+            # Si el hueco es una forma flexionada, también vale escribirla tal cual
+            if not correcto and self.forma_en_blanco not in (None, self.palabra_objetivo.lower()):
+                correcto = self.analizador.verificar_respuesta_exacta(
+                    respuesta=str(respuesta),
+                    solucion=self.forma_en_blanco,
+                    umbral=0.85
+                )
         
         if correcto:
             self.puntaje = 100
@@ -172,6 +185,11 @@ class RetoCompletarOracion(RetoBase):
                 self.finalizar()
             else:
                 mensaje = f"Incorrecto. Intento {self.intentos}/{self.max_intentos}"
+                if not self.con_opciones:
+                    sugerencia = self.mensaje_sugerencia(self.analizador, str(respuesta),
+                        self.palabra_objetivo)
+                    if sugerencia:
+                        mensaje += f"\n{sugerencia}"
         
         quality = self.calcular_quality(correcto, self.obtener_tiempo_respuesta())
         
@@ -266,8 +284,9 @@ class RetoOrdenarOracion(RetoBase):
         # Capitalizar primera letra
         respuesta = respuesta[0].upper() + respuesta[1:]
         
-        # Usar similitud para verificar (permite pequeñas variaciones)
-        similitud = self.analizador.similitud(respuesta.lower(), self.oracion_correcta.lower())
+        # Alinear por palabras (permite pequeñas variaciones y marca las descolocadas)
+        alineacion = self.analizador.alinear_tokens(respuesta, self.oracion_correcta)
+        similitud = alineacion['similitud']
         correcto = similitud >= 0.9
         
         mensaje = ""
@@ -293,6 +312,7 @@ class RetoOrdenarOracion(RetoBase):
             'respuesta_usuario': respuesta,
             'respuesta_correcta': self.oracion_correcta if self.completado else None,
             'similitud': similitud,
+            'tokens': alineacion['tokens'],
             'intentos_usados': self.intentos,
             'intentos_restantes': max(0, self.max_intentos - self.intentos),
             'puntaje': self.puntaje,
@@ -323,6 +343,9 @@ class RetoTraducirOracion(RetoBase):
         self.ingles_a_espanol = ingles_a_espanol
         self.oracion_inglés = ""
         self.traduccion_sugerida = ""
+        # Palabra de la oración en inglés -> respuestas en inglés que también
+        # valen (mismas traducción y forma), normalizadas
+        self.equivalentes = {}
         
     def generar(self) -> Dict[str, Any]:
         """Genera una oración para traducir."""
@@ -356,16 +379,19 @@ class RetoTraducirOracion(RetoBase):
         """Genera una traducción básica palabra por palabra."""
         palabras = self.oracion_inglés.split()
         traduccion = []
+        self.equivalentes = {}
         
         for palabra in palabras:
             palabra_limpia = palabra.strip('.,!?;:"').lower()
-            info = self.diccionario.obtener_info(palabra_limpia)
+            # Las formas flexionadas ("studies") se traducen con su lema
+            info = self.diccionario.obtener_info_lema(palabra_limpia)
             
             if info:
                 # ESTRUCTURA REAL DEL JSON: traducciones.es[0]
                 traducciones_es = info.get('traducciones', {}).get('es', [])
                 if traducciones_es:
                     traduccion.append(traducciones_es[0])
+                    self._agregar_equivalentes(palabra_limpia, traducciones_es[0])
                 else:
                     traduccion.append(f"[{palabra}]")
             else:
@@ -373,6 +399,22 @@ class RetoTraducirOracion(RetoBase):
         
         return ' '.join(traduccion)
     
+    def _agregar_equivalentes(self, palabra: str, traduccion: str):
+        """
+        Guarda las palabras en inglés que también se traducen por `traduccion`
+        (índice inverso del diccionario), puestas en la misma forma que
+        `palabra` ("learns" vale por "studies" si ambas son "estudiar").
+        """
+        alternativas = self.diccionario.buscar_por_traduccion(traduccion)
+        if palabra not in alternativas:
+            # Forma flexionada: se busca qué forma es de su lema
+            clave = next((c for lema in self.diccionario.lemas(palabra)
+                for c in CLAVES_FLEXION if self.analizador.flexion(lema, c) == palabra), None)
+            if clave is None:
+                return
+            alternativas = [self.analizador.flexion(a, clave) for a in alternativas]
+        self.equivalentes[normalizar(palabra)] = frozenset(normalizar(a) for a in alternativas)
+    
     def verificar(self, respuesta: Any) -> Dict[str, Any]:
         """
         Verifica la traducción (verificación flexible).
@@ -385,8 +427,12 @@ class RetoTraducirOracion(RetoBase):
         else:
             objetivo = self.oracion_inglés
         
-        # Similitud flexible (la traducción puede variar)
-        similitud = self.analizador.similitud(respuesta.lower(), objetivo.lower())
+        # Similitud flexible por palabras (la traducción puede variar); sin tildes
+        # ni signos. Hacia el inglés vale cualquier palabra con la misma traducción
+        equivalentes = None if self.ingles_a_espanol else self.equivalentes
+        alineacion = self.analizador.alinear_tokens(respuesta, objetivo,
+                                                    equivalentes=equivalentes)
+        similitud = alineacion['similitud']
         
         # Más leniente para traducciones (umbral 0.7)
         correcto = similitud >= 0.7
@@ -417,6 +463,7 @@ class RetoTraducirOracion(RetoBase):
             'respuesta_usuario': respuesta,
             'traduccion_sugerida': objetivo if self.completado else None,
             'similitud': similitud,
+            'tokens': alineacion['tokens'],
             'intentos_usados': self.intentos,
             'intentos_restantes': max(0, self.max_intentos - self.intentos),
             'puntaje': self.puntaje,
@@ -5,6 +5,7 @@ VERSIÓN CORREGIDA para estructura JSON real
 
 import random
 from typing import Dict, Any, List
+from lenguaje.normalizacion import normalizar
 from .base import RetoBase
 
 class RetoTarjetas(RetoBase):
@@ -18,6 +19,9 @@ class RetoTarjetas(RetoBase):
     - Palabra → Sinónimo
     """
     
+    # Candidatas que se revisan como máximo al buscar distractores
+    MAX_CANDIDATOS_DISTRACTORES = 50
+    
     def __init__(self, palabra_objetivo: str, diccionario, 
                 nivel_dificultad: str = "intermedio",
                 tipo: str = "traduccion",
@@ -36,6 +40,9 @@ class RetoTarjetas(RetoBase):
         self.opciones = []
         self.respuesta_correcta = None
         self.indice_correcto = None
+        # Otras respuestas igual de válidas (normalizadas), p. ej. todas las
+        # palabras en inglés con la traducción mostrada en el reto inverso
+        self.respuestas_validas = frozenset()
         
     def generar(self) -> Dict[str, Any]:
         """
@@ -93,11 +100,10 @@ class RetoTarjetas(RetoBase):
         distractores = []
         info_objetivo = self.diccionario.obtener_info(self.palabra_objetivo)
         categoria = info_objetivo.get('categorias', ['general'])[0] if info_objetivo else 'general'
-        # Obtener palabras de la misma categoría
+        # Obtener palabras de la misma categoría (muestra aleatoria, sin la objetivo)
         palabras_categoria = self.diccionario.palabras_por_categoria(categoria)
-        # Filtrar la palabra objetivo
-        palabras_candidatas = [p for p in palabras_categoria if p != self.palabra_objetivo]
-        random.shuffle(palabras_candidatas)
+        palabras_candidatas = self.muestrear_palabras(palabras_categoria,
+            self.MAX_CANDIDATOS_DISTRACTORES, excluir=self.palabra_objetivo)
         # Generar distractores
         for palabra in palabras_candidatas:
             if len(distractores) >= self.num_opciones - 1:
@@ -153,6 +159,8 @@ class RetoTarjetas(RetoBase):
                 # Si es el texto de la opción
                 if respuesta in self.opciones:
                     respuesta = self.opciones.index(respuesta)
+                elif normalizar(respuesta) in self.respuestas_validas:
+                    respuesta = self.indice_correcto
                 else:
                     return {
                         'correcto': False,
@@ -160,8 +168,10 @@ class RetoTarjetas(RetoBase):
                         'quality': 0,
                         'completado': False
                     }
-        # Verificar si es correcto
-        if respuesta == self.indice_correcto:
+        # Verificar si es correcto (o una opción igual de válida)
+        if respuesta == self.indice_correcto or (
+                isinstance(respuesta, int) and 0 <= respuesta < len(self.opciones)
+                and normalizar(self.opciones[respuesta]) in self.respuestas_validas):
             correcto = True
             self.puntaje = 100
             mensaje = "¡Correcto!"
@@ -212,14 +222,19 @@ class RetoTarjetasInverso(RetoTarjetas):
         else:
             traducciones_es = info.get('traducciones', {}).get('es', [])
             pregunta_texto = traducciones_es[0] if traducciones_es else 'Sin información'
-        # La respuesta correcta es la palabra en inglés
+        # La respuesta correcta es la palabra en inglés; con una traducción
+        # valen todas las palabras que la tienen (índice inverso, O(1))
         self.respuesta_correcta = self.palabra_objetivo
-        # Generar distractores (otras palabras en inglés)
+        validas = {self.palabra_objetivo}
+        traducciones_es = info.get('traducciones', {}).get('es') or []
+        if traducciones_es and pregunta_texto == traducciones_es[0]:
+            validas.update(self.diccionario.buscar_por_traduccion(pregunta_texto))
+        self.respuestas_validas = frozenset(normalizar(p) for p in validas)
+        # Generar distractores (otras palabras en inglés que no sean válidas)
         categoria = info.get('categorias', ['general'])[0]
         palabras_categoria = self.diccionario.palabras_por_categoria(categoria)
-        palabras_candidatas = [p for p in palabras_categoria if p != self.palabra_objetivo]
-        random.shuffle(palabras_candidatas)
-        self.opciones = palabras_candidatas[:self.num_opciones - 1]
+        self.opciones = self.muestrear_palabras(palabras_categoria, self.num_opciones - 1,
+            excluir=validas)
         # Insertar respuesta correcta
         self.indice_correcto = random.randint(0, len(self.opciones))
         self.opciones.insert(self.indice_correcto, self.respuesta_correcta)